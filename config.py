@@ -1,7 +1,10 @@
+import logging
 import os
+from typing import Iterable
+
 from dotenv import load_dotenv
 
-from fast_app.defaults.common_enums import Env
+from fast_app.defaults.common_enums import Env, SlowConsumerPolicy
 
 load_dotenv()
 
@@ -15,6 +18,19 @@ ENV_PREFIX = ENV.upper()  # e.g., 'LOC', 'DEV', 'PROD', 'TEST', 'UAT'
 def get_env_var(key: str, default=None):
     return os.getenv(f"{ENV_PREFIX}_{key}", default)
 
+# Helper for settings limited to a set of values: a typo falls back to the
+# default instead of failing at import
+def get_env_choice(key: str, choices: Iterable[str], default: str) -> str:
+    value = os.getenv(key, default).lower()
+    choices = list(choices)
+    if value not in choices:
+        # config is loaded before the app logger exists
+        logging.getLogger(__name__).warning(
+            f"Invalid {key}={value!r}, expected one of {choices}; using {default!r}"
+        )
+        return default
+    return value
+
 # common variables
 APP_NAME: str = os.getenv("APP_NAME", 'APP')
 APP_VERSION: str = os.getenv("APP_VERSION", "1.0.0")
@@ -28,7 +44,74 @@ ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES: int = 24 * 60 # int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 2))
 
+# paginated list total-count cache (0 disables)
+COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("COUNT_CACHE_TTL_SECONDS", 30))
+COUNT_CACHE_MAX_ENTRIES: int = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", 256))
+
+# decoded access token / authenticated user cache (0 disables)
+AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", 60))
+AUTH_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", 10000))
+
+# direct-room id / block relation cache of the chat send path (0 disables)
+CHAT_CACHE_TTL_SECONDS: int = int(os.getenv("CHAT_CACHE_TTL_SECONDS", 300))
+CHAT_CACHE_MAX_ENTRIES: int = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", 50000))
+
+# per-user unread notification counters, recounted from the db every
+# NOTIFICATION_UNREAD_RECONCILE_SECONDS (0 disables)
+NOTIFICATION_UNREAD_RECONCILE_SECONDS: int = int(os.getenv("NOTIFICATION_UNREAD_RECONCILE_SECONDS", 300))
+NOTIFICATION_CACHE_MAX_ENTRIES: int = int(os.getenv("NOTIFICATION_CACHE_MAX_ENTRIES", 50000))
+
+# chat message group-commit: max messages per insert_many / max wait (ms) / queued messages
+CHAT_WRITE_BATCH_SIZE: int = int(os.getenv("CHAT_WRITE_BATCH_SIZE", 500))
+CHAT_WRITE_FLUSH_MS: int = int(os.getenv("CHAT_WRITE_FLUSH_MS", 10))
+CHAT_WRITE_QUEUE_SIZE: int = int(os.getenv("CHAT_WRITE_QUEUE_SIZE", 10000))
+
+# newest messages kept in memory per room (first history page) / max rooms kept
+CHAT_RECENT_MESSAGES: int = int(os.getenv("CHAT_RECENT_MESSAGES", 50))
+CHAT_RECENT_ROOMS: int = int(os.getenv("CHAT_RECENT_ROOMS", 5000))
+
+# websocket fan-out between workers: memory (single worker) | mongo
+WS_PUBSUB_BACKEND: str = os.getenv("WS_PUBSUB_BACKEND", "memory").lower()
+
+# per-socket outgoing queue; policy when it is full: drop | disconnect
+WS_SEND_QUEUE_SIZE: int = int(os.getenv("WS_SEND_QUEUE_SIZE", 256))
+WS_SLOW_CONSUMER_POLICY: str = get_env_choice(
+    "WS_SLOW_CONSUMER_POLICY",
+    [policy.value for policy in SlowConsumerPolicy],
+    SlowConsumerPolicy.DROP.value,
+)
+
+# Presence: how often buffered device statuses are written to the db
+PRESENCE_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("PRESENCE_FLUSH_INTERVAL_SECONDS", 5))
+
+# processes building export files (xlsx/csv/ndjson) off the event loop
+EXPORT_PROCESS_WORKERS: int = int(os.getenv("EXPORT_PROCESS_WORKERS", 2))
+# a running job whose worker stopped renewing its lease this long is run again
+EXPORT_JOB_LEASE_SECONDS: float = float(os.getenv("EXPORT_JOB_LEASE_SECONDS", 60))
+
+# resized webp variants of uploaded product / category images
+IMAGE_VARIANTS_ENABLED: bool = os.getenv("IMAGE_VARIANTS_ENABLED", "true").lower() in ("true", "1", "yes")
+IMAGE_PROCESS_WORKERS: int = int(os.getenv("IMAGE_PROCESS_WORKERS", 2))
+IMAGE_WEBP_QUALITY: int = int(os.getenv("IMAGE_WEBP_QUALITY", 80))
+
 BUCKET: str = os.getenv("BUCKET", "local")
+
+# store public uploads by content hash, identical files are written once
+UPLOAD_DEDUP: bool = os.getenv("UPLOAD_DEDUP", "false").lower() in ("true", "1", "yes")
+# unreferenced deduplicated files are kept this long before being purged,
+# purge runs every UPLOAD_DEDUP_PURGE_INTERVAL_SECONDS (0 disables)
+UPLOAD_DEDUP_PURGE_GRACE_SECONDS: int = int(os.getenv("UPLOAD_DEDUP_PURGE_GRACE_SECONDS", 3600))
+UPLOAD_DEDUP_PURGE_INTERVAL_SECONDS: int = int(os.getenv("UPLOAD_DEDUP_PURGE_INTERVAL_SECONDS", 3600))
+
+# static files: max-age of css/js/img assets and of (immutable) uploads
+STATIC_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("STATIC_CACHE_MAX_AGE_SECONDS", 3600))
+STATIC_IMMUTABLE_MAX_AGE_SECONDS: int = int(os.getenv("STATIC_IMMUTABLE_MAX_AGE_SECONDS", 31536000))
+# write .gz / .br siblings of css/js at startup
+STATIC_PRECOMPRESS: bool = os.getenv("STATIC_PRECOMPRESS", "true").lower() in ("true", "1", "yes")
+
+# local bucket: threads doing filesystem I/O, fsync written files before rename
+LOCAL_STORAGE_THREADS: int = int(os.getenv("LOCAL_STORAGE_THREADS", 8))
+LOCAL_STORAGE_FSYNC: bool = os.getenv("LOCAL_STORAGE_FSYNC", "false").lower() in ("true", "1", "yes")
 AWS_S3_BUCKET_NAME: str = os.getenv("AWS_S3_BUCKET_NAME", "")
 AWS_S3_BUCKET_USER: str = os.getenv("AWS_S3_BUCKET_USER", "")
 AWS_S3_BUCKET_REGION: str = os.getenv("AWS_S3_BUCKET_REGION", "")
@@ -36,9 +119,35 @@ AWS_S3_BUCKET_ACCESS_KEY: str = os.getenv("AWS_S3_BUCKET_ACCESS_KEY", "")
 AWS_S3_BUCKET_SECRET_KEY: str = os.getenv("AWS_S3_BUCKET_SECRET_KEY", "")
 AWS_S3_BUCKET_HOST: str = os.getenv("AWS_S3_BUCKET_HOST", "")
 
+# shared S3 client: max pooled connections and timeouts
+S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", 32))
+S3_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("S3_CONNECT_TIMEOUT_SECONDS", 5))
+S3_READ_TIMEOUT_SECONDS: float = float(os.getenv("S3_READ_TIMEOUT_SECONDS", 60))
+
+# uploads larger than one part go through S3 multipart upload (min 5 MB)
+S3_MULTIPART_PART_SIZE: int = max(int(os.getenv("S3_MULTIPART_PART_SIZE", 8 * 1024 * 1024)), 5 * 1024 * 1024)
+
 # Use environment-specific variables
 MONGO_URI: str = get_env_var("MONGO_URI") or ""
 DB_NAME: str = get_env_var("DB_NAME") or ""
 FIREBASE_PROJECT_ID: str = get_env_var("FIREBASE_PROJECT_ID") or ""
 FIREBASE_CLIENT_EMAIL: str = get_env_var("FIREBASE_CLIENT_EMAIL") or ""
 FIREBASE_PRIVATE_KEY: str = get_env_var("FIREBASE_PRIVATE_KEY") or ""
+
+# threads running the (blocking) FCM SDK sends
+FCM_SEND_THREADS: int = int(os.getenv("FCM_SEND_THREADS", 4))
+
+# recipients per insert_many / push step of a notification broadcast
+NOTIFICATION_BROADCAST_BATCH_SIZE: int = int(os.getenv("NOTIFICATION_BROADCAST_BATCH_SIZE", 1000))
+# a running broadcast whose worker stopped renewing its lease this long is resumed
+NOTIFICATION_BROADCAST_LEASE_SECONDS: float = float(os.getenv("NOTIFICATION_BROADCAST_LEASE_SECONDS", 60))
+
+# scheduled notifications: how often the db is polled, how far ahead due
+# ones are queued in memory, claims per dispatch step, queue cap
+NOTIFICATION_SCHEDULER_POLL_SECONDS: float = float(os.getenv("NOTIFICATION_SCHEDULER_POLL_SECONDS", 30))
+NOTIFICATION_SCHEDULER_LOOKAHEAD_SECONDS: float = float(os.getenv("NOTIFICATION_SCHEDULER_LOOKAHEAD_SECONDS", 300))
+NOTIFICATION_SCHEDULER_BATCH_SIZE: int = int(os.getenv("NOTIFICATION_SCHEDULER_BATCH_SIZE", 500))
+NOTIFICATION_SCHEDULER_MAX_QUEUED: int = int(os.getenv("NOTIFICATION_SCHEDULER_MAX_QUEUED", 10000))
+# notifications overdue by more than this are marked handled without a push
+# (e.g. rows from before the scheduler existed), 0 pushes any backlog
+NOTIFICATION_SCHEDULER_MAX_LATENESS_SECONDS: float = float(os.getenv("NOTIFICATION_SCHEDULER_MAX_LATENESS_SECONDS", 3600))
@@ -0,0 +1,77 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from config import AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS
+from fast_app.core.cache import CacheBackend, InMemoryCacheBackend
+
+
+# ----------------------------------
+# BACKEND
+# ----------------------------------
+
+_backend: CacheBackend = InMemoryCacheBackend(max_entries=AUTH_CACHE_MAX_ENTRIES)
+
+
+def get_auth_cache() -> CacheBackend:
+    return _backend
+
+
+def set_auth_cache_backend(backend: CacheBackend):
+    """Swap the in-process cache for a shared one (e.g. from lifespan)"""
+    global _backend
+    _backend = backend
+
+
+# ----------------------------------
+# KEYS
+# ----------------------------------
+
+def user_key(user_id: Any) -> str:
+    return f"auth:user:{user_id}"
+
+
+def token_key(token: str) -> str:
+    # never keep raw tokens as cache keys
+    return f"auth:token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+# ----------------------------------
+# TOKENS
+# ----------------------------------
+
+async def get_cached_token_payload(token: str) -> Optional[Dict[str, Any]]:
+    payload: Optional[Dict[str, Any]] = await _backend.get(token_key(token))
+    return payload
+
+
+async def cache_token_payload(token: str, payload: Dict[str, Any], expires_in: float):
+    await _backend.set(
+        token_key(token),
+        payload,
+        ttl=min(AUTH_CACHE_TTL_SECONDS, expires_in),
+    )
+
+
+# ----------------------------------
+# USERS
+# ----------------------------------
+
+async def get_cached_user(user_id: Any) -> Optional[Dict[str, Any]]:
+    user: Optional[Dict[str, Any]] = await _backend.get(user_key(user_id))
+    return user
+
+
+async def cache_user(user_id: Any, data: Dict[str, Any]):
+    await _backend.set(user_key(user_id), data, ttl=AUTH_CACHE_TTL_SECONDS)
+
+
+# ----------------------------------
+# INVALIDATION
+# ----------------------------------
+
+async def invalidate_user(user_id: Any):
+    await _backend.delete(user_key(user_id))
+
+
+async def invalidate_token(token: str):
+    await _backend.delete(token_key(token))
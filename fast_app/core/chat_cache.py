@@ -0,0 +1,73 @@
+from typing import Any, Optional
+
+from config import CHAT_CACHE_MAX_ENTRIES, CHAT_CACHE_TTL_SECONDS
+from fast_app.core.cache import CacheBackend, InMemoryCacheBackend
+
+
+# ----------------------------------
+# BACKEND
+# ----------------------------------
+
+_backend: CacheBackend = InMemoryCacheBackend(max_entries=CHAT_CACHE_MAX_ENTRIES)
+
+
+def get_chat_cache() -> CacheBackend:
+    return _backend
+
+
+def set_chat_cache_backend(backend: CacheBackend):
+    """Swap the in-process cache for a shared one (e.g. from lifespan)"""
+    global _backend
+    _backend = backend
+
+
+# ----------------------------------
+# KEYS
+# ----------------------------------
+
+def member_pair_key(user_id: Any, other_user_id: Any) -> str:
+    """Canonical key of a direct room, independent of who sends first"""
+    return ":".join(sorted((str(user_id), str(other_user_id))))
+
+
+def direct_room_key(pair_key: str) -> str:
+    return f"chat:room:{pair_key}"
+
+
+def block_key(blocker_id: Any, blocked_id: Any) -> str:
+    return f"chat:block:{blocker_id}:{blocked_id}"
+
+
+# ----------------------------------
+# DIRECT ROOMS
+# ----------------------------------
+
+async def get_cached_direct_room_id(pair_key: str) -> Optional[str]:
+    room_id: Optional[str] = await _backend.get(direct_room_key(pair_key))
+    return room_id
+
+
+async def cache_direct_room_id(pair_key: str, room_id: Any):
+    await _backend.set(direct_room_key(pair_key), str(room_id), ttl=CHAT_CACHE_TTL_SECONDS)
+
+
+async def invalidate_direct_room(pair_key: str):
+    await _backend.delete(direct_room_key(pair_key))
+
+
+# ----------------------------------
+# BLOCKS
+# ----------------------------------
+
+async def get_cached_block(blocker_id: Any, blocked_id: Any) -> Optional[bool]:
+    blocked: Optional[bool] = await _backend.get(block_key(blocker_id, blocked_id))
+    return blocked
+
+
+async def cache_block(blocker_id: Any, blocked_id: Any, is_blocked: bool):
+    # negative answers are cached too: most pairs are never blocked
+    await _backend.set(block_key(blocker_id, blocked_id), is_blocked, ttl=CHAT_CACHE_TTL_SECONDS)
+
+
+async def invalidate_block(blocker_id: Any, blocked_id: Any):
+    await _backend.delete(block_key(blocker_id, blocked_id))
@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from bson import json_util
+
+from config import COUNT_CACHE_MAX_ENTRIES, COUNT_CACHE_TTL_SECONDS
+
+# stages that never change how many documents come out by themselves; a
+# later $match / $group may still depend on the fields they produce, so
+# they are only left out of the key after the last count affecting stage
+COUNT_NEUTRAL_STAGES = {"$project", "$addFields", "$set", "$unset", "$sort", "$lookup"}
+
+
+class CountCache:
+    """
+    Process-local cache of total document counts for paginated listings.
+
+    Entries are keyed by collection name + the normalized filter of the
+    pipeline (its $match and other row count affecting stages) and expire
+    after `ttl` seconds. Every write on a collection (see the BaseDocument
+    event hook) drops all counts cached for it.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # collection -> (pipeline key -> (expires_at, total_docs))
+        self._entries: Dict[str, OrderedDict[str, tuple[float, int]]] = {}
+
+    @staticmethod
+    def is_count_neutral(stage: Dict[str, Any]) -> bool:
+        name = next(iter(stage), None)
+        if name in COUNT_NEUTRAL_STAGES:
+            return True
+        return name == "$unwind" and isinstance(stage[name], dict) and bool(stage[name].get("preserveNullAndEmptyArrays"))
+
+    @classmethod
+    def normalize(cls, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The stages that decide the count: trailing lookups / projections are dropped"""
+        end = len(pipeline)
+        while end and cls.is_count_neutral(pipeline[end - 1]):
+            end -= 1
+        return list(pipeline[:end])
+
+    @classmethod
+    def make_key(cls, pipeline: List[Dict[str, Any]]) -> str:
+        return json_util.dumps(cls.normalize(pipeline), sort_keys=True)
+
+    def get(self, collection: str, pipeline: List[Dict[str, Any]]) -> Optional[int]:
+        if self.ttl <= 0:
+            return None
+
+        entries = self._entries.get(collection)
+        if not entries:
+            return None
+
+        key = self.make_key(pipeline)
+        entry = entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, total_docs = entry
+        if expires_at < time.monotonic():
+            del entries[key]
+            return None
+
+        entries.move_to_end(key)
+        return total_docs
+
+    def set(self, collection: str, pipeline: List[Dict[str, Any]], total_docs: int):
+        if self.ttl <= 0:
+            return
+
+        entries = self._entries.setdefault(collection, OrderedDict())
+        key = self.make_key(pipeline)
+
+        entries[key] = (time.monotonic() + self.ttl, total_docs)
+        entries.move_to_end(key)
+
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def invalidate(self, collection: str):
+        """
+        Drop every count cached for `collection`.
+
+        Called automatically only from the BaseDocument after_event hook,
+        i.e. for writes made through Beanie documents. Raw pymongo writes
+        (`get_pymongo_collection().insert_many / update_many / ...`) bypass
+        it: code writing that way must call this itself, otherwise list
+        totals stay stale until the TTL expires.
+        """
+        self._entries.pop(collection, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+count_cache = CountCache(
+    ttl=COUNT_CACHE_TTL_SECONDS,
+    max_entries=COUNT_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from fast_app.utils.logger import logger
+
+# owner recorded on the jobs claimed by this process
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class JobLease:
+    """
+    Ownership of background job documents (exports, broadcasts) shared by
+    every API worker.
+
+    A worker claims a PENDING job by setting `lease_owner` and a
+    `lease_expires_at` in the future, and renews the lease while the job
+    runs. A RUNNING job is only taken over once its lease has expired
+    (the owner crashed or was killed), and every write made by the owner
+    is conditioned on still holding the lease, so a worker that lost its
+    job can't overwrite the new owner's progress.
+    """
+
+    def __init__(self, collection: Any, pending: str, running: str, duration: float):
+        self.collection = collection
+        self.pending = pending
+        self.running = running
+        self.duration = timedelta(seconds=duration)
+
+    def claimable(self, now: datetime) -> Dict[str, Any]:
+        return {"$or": [
+            {"status": self.pending},
+            {"status": self.running, "lease_expires_at": {"$lt": now}},
+            # claimed before leases were recorded
+            {"status": self.running, "lease_expires_at": None},
+        ]}
+
+    def owned(self, doc_id: Any) -> Dict[str, Any]:
+        return {"_id": doc_id, "lease_owner": WORKER_ID}
+
+    async def find_claimable(self, projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        docs: List[Dict[str, Any]] = await self.collection.find(
+            self.claimable(datetime.utcnow()),
+            projection or {"_id": 1},
+        ).to_list(None)
+        return docs
+
+    async def claim(self, doc_id: Any, fields: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Atomically take the job, returns it or None when another worker holds it"""
+        now = datetime.utcnow()
+        doc: Optional[Dict[str, Any]] = await self.collection.find_one_and_update(
+            {"_id": doc_id, **self.claimable(now)},
+            {"$set": {
+                "status": self.running,
+                "lease_owner": WORKER_ID,
+                "lease_expires_at": now + self.duration,
+                "updated_at": now,
+                **(fields or {}),
+            }},
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc
+
+    async def update(self, doc_id: Any, update: Dict[str, Any]) -> bool:
+        """Apply `update` if this worker still owns the job"""
+        result = await self.collection.update_one(self.owned(doc_id), update)
+        matched: int = result.matched_count
+        return matched > 0
+
+    async def release(self, doc_id: Any, fields: Dict[str, Any]) -> bool:
+        """Set the job's final (or PENDING again) state and drop the lease"""
+        return await self.update(doc_id, {"$set": {
+            **fields,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "updated_at": datetime.utcnow(),
+        }})
+
+    async def renew(self, doc_id: Any) -> bool:
+        now = datetime.utcnow()
+        return await self.update(doc_id, {"$set": {"lease_expires_at": now + self.duration}})
+
+    async def keep(self, doc_id: Any, owner_task: Optional["asyncio.Task[Any]"]):
+        """
+        Renew the lease until cancelled; cancel `owner_task` (the job)
+        when the lease was taken over by another worker
+        """
+        while True:
+            await asyncio.sleep(self.duration.total_seconds() / 3)
+            try:
+                if not await self.renew(doc_id):
+                    logger.warning(f"Lost the lease of job {doc_id}, stopping it")
+                    if owner_task is not None:
+                        owner_task.cancel()
+                    return
+            except Exception as e:
+                # transient db error, the lease is still valid for a while
+                logger.error(f"Lease renewal of job {doc_id} failed: {e}")
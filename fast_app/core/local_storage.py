@@ -0,0 +1,121 @@
+import asyncio
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Optional
+
+from config import LOCAL_STORAGE_FSYNC, LOCAL_STORAGE_THREADS
+
+
+class LocalStorage:
+    """
+    Filesystem I/O of the local bucket.
+
+    Every blocking call runs on a dedicated, bounded thread pool, so a burst
+    of uploads neither blocks the event loop nor starves the default pool
+    used by the rest of the app. Files are written to a temp file and
+    renamed into place, readers never see a partially written file.
+    """
+
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=LOCAL_STORAGE_THREADS,
+                thread_name_prefix="local-storage",
+            )
+        return cls._executor
+
+    @classmethod
+    async def run(cls, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.get_executor(), partial(fn, *args, **kwargs))
+
+    @classmethod
+    async def write(cls, path: str, chunks: AsyncIterator[bytes]) -> int:
+        """Atomically write chunks to `path`, return the size"""
+        directory = os.path.dirname(path)
+        tmp_path = os.path.join(directory, f".{uuid.uuid4().hex}.tmp")
+
+        await cls.run(os.makedirs, directory, exist_ok=True)
+        f = await cls.run(open, tmp_path, "wb")
+
+        size = 0
+        try:
+            try:
+                async for chunk in chunks:
+                    await cls.run(f.write, chunk)
+                    size += len(chunk)
+                await cls.run(_sync_file, f)
+            finally:
+                await cls.run(f.close)
+
+            await cls.run(os.replace, tmp_path, path)
+
+        except BaseException:
+            await cls.run(_remove_if_exists, tmp_path)
+            raise
+
+        if LOCAL_STORAGE_FSYNC:
+            await cls.run(_sync_dir, directory)
+
+        return size
+
+    @classmethod
+    async def read(cls, path: str, start: int = 0, end: Optional[int] = None, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Stream bytes start..end (inclusive) of `path`"""
+        remaining = None if end is None else end - start + 1
+
+        f = await cls.run(open, path, "rb")
+        try:
+            await cls.run(f.seek, start)
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await cls.run(f.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await cls.run(f.close)
+
+    @classmethod
+    async def move(cls, src: str, dst: str):
+        await cls.run(os.makedirs, os.path.dirname(dst), exist_ok=True)
+        await cls.run(os.replace, src, dst)
+
+    @classmethod
+    async def remove(cls, path: str):
+        await cls.run(_remove_if_exists, path)
+
+    @classmethod
+    def close(cls):
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
+
+
+def _sync_file(f):
+    f.flush()
+    if LOCAL_STORAGE_FSYNC:
+        os.fsync(f.fileno())
+
+
+def _sync_dir(directory: str):
+    # persist the rename itself
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _remove_if_exists(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,73 @@
+import time
+from typing import Any, Optional
+
+from config import NOTIFICATION_CACHE_MAX_ENTRIES, NOTIFICATION_UNREAD_RECONCILE_SECONDS
+from fast_app.core.cache import CacheBackend, InMemoryCacheBackend
+
+
+# ----------------------------------
+# BACKEND
+# ----------------------------------
+
+_backend: CacheBackend = InMemoryCacheBackend(max_entries=NOTIFICATION_CACHE_MAX_ENTRIES)
+
+
+def get_notification_cache() -> CacheBackend:
+    return _backend
+
+
+def set_notification_cache_backend(backend: CacheBackend):
+    """Swap the in-process cache for a shared one (e.g. from lifespan)"""
+    global _backend
+    _backend = backend
+
+
+# ----------------------------------
+# KEYS
+# ----------------------------------
+
+def unread_key(user_id: Any) -> str:
+    return f"notification:unread:{user_id}"
+
+
+# ----------------------------------
+# UNREAD COUNTERS
+# ----------------------------------
+# A counter is counted from MongoDB once, then kept up to date by the
+# write paths. It is recounted (reconciled) when its entry expires, so a
+# missed update only drifts the badge until then; adjusting a counter
+# never extends its life.
+
+async def get_cached_unread_count(user_id: Any) -> Optional[int]:
+    entry = await _backend.get(unread_key(user_id))
+    return entry["count"] if entry else None
+
+
+async def cache_unread_count(user_id: Any, count: int):
+    await _backend.set(
+        unread_key(user_id),
+        {"count": count, "reconcile_at": time.time() + NOTIFICATION_UNREAD_RECONCILE_SECONDS},
+        ttl=NOTIFICATION_UNREAD_RECONCILE_SECONDS,
+    )
+
+
+async def adjust_unread_count(user_id: Any, delta: int):
+    """Add `delta` to a cached counter, a user without one is left alone"""
+    key = unread_key(user_id)
+    entry = await _backend.get(key)
+    if not entry:
+        return
+
+    count = entry["count"] + delta
+    ttl = entry["reconcile_at"] - time.time()
+    if count < 0 or ttl <= 0:
+        # out of sync: recount on the next read
+        await _backend.delete(key)
+        return
+
+    await _backend.set(key, {**entry, "count": count}, ttl=ttl)
+
+
+async def invalidate_unread_count(*user_ids: Any):
+    if user_ids:
+        await _backend.delete(*[unread_key(user_id) for user_id in user_ids])
@@ -0,0 +1,131 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo import UpdateOne
+
+from config import PRESENCE_FLUSH_INTERVAL_SECONDS
+from fast_app.defaults.user_enums import UserActivityStatusEnum
+from fast_app.utils.logger import logger
+
+
+class PresenceRegistry:
+    """
+    In-memory presence for users connected to this worker.
+
+    Online state is derived from the websocket connections of the bound
+    WSManager. Device status changes are buffered per access token and
+    written behind to `user_devices` in periodic bulk writes, so
+    heartbeats and reconnects never cost a database round trip.
+    """
+
+    def __init__(self, flush_interval: float = PRESENCE_FLUSH_INTERVAL_SECONDS):
+        self.flush_interval = flush_interval
+        self.ws_manager: Any = None
+
+        # access_token -> fields to $set on the device (latest wins)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+        # user_id -> last time the user went offline on this worker (not flushed yet)
+        self._last_seen: Dict[str, datetime] = {}
+
+        self._task: Optional[asyncio.Task] = None
+
+    # ----------------------------------
+    # LIFECYCLE
+    # ----------------------------------
+
+    async def start(self, ws_manager: Any):
+        self.ws_manager = ws_manager
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # don't lose buffered updates on shutdown
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Presence flush failed: {e}")
+
+    # ----------------------------------
+    # STATE
+    # ----------------------------------
+
+    def is_online(self, user_id: str) -> bool:
+        return bool(self.ws_manager and self.ws_manager.connections.get(user_id))
+
+    def mark(self, access_token: str, status: UserActivityStatusEnum, user_id: Optional[str] = None):
+        now = datetime.now()
+        is_offline = status == UserActivityStatusEnum.OFFLINE
+
+        self._pending[access_token] = {
+            "current_status": UserActivityStatusEnum(status).value,
+            "last_active": now if is_offline else None,
+        }
+
+        if user_id and is_offline:
+            self._last_seen[user_id] = now
+        elif user_id:
+            self._last_seen.pop(user_id, None)
+
+    def get_statuses(self, user_ids: List[str]) -> Dict[str, dict]:
+        """Statuses this worker knows without asking the database"""
+        result: Dict[str, dict] = {}
+
+        for uid in user_ids:
+            if self.is_online(uid):
+                result[uid] = {
+                    "activity_status": UserActivityStatusEnum.ONLINE,
+                    "last_seen": None,
+                }
+            elif uid in self._last_seen:
+                result[uid] = {
+                    "activity_status": UserActivityStatusEnum.OFFLINE,
+                    "last_seen": self._last_seen[uid].isoformat(),
+                }
+
+        return result
+
+    # ----------------------------------
+    # WRITE-BEHIND
+    # ----------------------------------
+
+    async def flush(self):
+        if not self._pending:
+            return
+
+        # imported lazily: models import the core package
+        from fast_app.modules.user.models.user_device_model import UserDevice
+
+        pending, self._pending = self._pending, {}
+        flushed_users, self._last_seen = self._last_seen, {}
+
+        operations = [
+            UpdateOne({"access_token": token}, {"$set": fields})
+            for token, fields in pending.items()
+        ]
+
+        try:
+            await UserDevice.get_pymongo_collection().bulk_write(operations, ordered=False)
+        except Exception:
+            # keep the updates for the next round unless newer ones arrived
+            for token, fields in pending.items():
+                self._pending.setdefault(token, fields)
+            for uid, seen in flushed_users.items():
+                self._last_seen.setdefault(uid, seen)
+            raise
+
+
+presence_registry = PresenceRegistry()
@@ -0,0 +1,72 @@
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from config import CHAT_RECENT_MESSAGES, CHAT_RECENT_ROOMS
+
+
+class RoomBuffer:
+    def __init__(self, docs: List[Dict[str, Any]], size: int, complete: bool):
+        # newest first
+        self.docs: Deque[Dict[str, Any]] = deque(docs, maxlen=size)
+
+        # True when the room has no older messages than the buffered ones
+        self.complete = complete
+
+    @property
+    def newest_id(self) -> Any:
+        return self.docs[0]["_id"] if self.docs else None
+
+
+class RecentMessages:
+    """
+    Per-room ring buffer of the newest messages, used to answer the first
+    history page of a conversation without touching the database.
+
+    A buffer is only served while its newest message is the room's
+    `last_message_id`, so rooms written by other workers are reloaded
+    instead of being served stale.
+    """
+
+    def __init__(self, size: int = CHAT_RECENT_MESSAGES, max_rooms: int = CHAT_RECENT_ROOMS):
+        self.size = size
+        self.max_rooms = max_rooms
+
+        self._rooms: OrderedDict[str, RoomBuffer] = OrderedDict()
+
+    def get(self, room_id: Any, last_message_id: Any) -> Optional[RoomBuffer]:
+        key = str(room_id)
+        buffer = self._rooms.get(key)
+        if buffer is None:
+            return None
+
+        if str(buffer.newest_id) != str(last_message_id):
+            del self._rooms[key]
+            return None
+
+        self._rooms.move_to_end(key)
+        return buffer
+
+    def seed(self, room_id: Any, docs: List[Dict[str, Any]], complete: bool):
+        """Store the newest messages of a room (newest first) as loaded from the db"""
+        key = str(room_id)
+        self._rooms[key] = RoomBuffer(docs[: self.size], self.size, complete)
+        self._rooms.move_to_end(key)
+
+        while len(self._rooms) > self.max_rooms:
+            self._rooms.popitem(last=False)
+
+    def append(self, room_id: Any, doc: Dict[str, Any]):
+        """Push a newly written message onto an already loaded buffer"""
+        buffer = self._rooms.get(str(room_id))
+        if buffer is None:
+            return
+
+        if len(buffer.docs) == buffer.docs.maxlen:
+            buffer.complete = False
+        buffer.docs.appendleft(doc)
+
+    def invalidate(self, room_id: Any):
+        self._rooms.pop(str(room_id), None)
+
+
+recent_messages = RecentMessages()
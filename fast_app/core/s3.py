@@ -0,0 +1,71 @@
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, Optional
+
+import aiobotocore.session
+from aiobotocore.config import AioConfig
+
+from config import (
+    AWS_S3_BUCKET_ACCESS_KEY,
+    AWS_S3_BUCKET_HOST,
+    AWS_S3_BUCKET_REGION,
+    AWS_S3_BUCKET_SECRET_KEY,
+    S3_CONNECT_TIMEOUT_SECONDS,
+    S3_MAX_POOL_CONNECTIONS,
+    S3_READ_TIMEOUT_SECONDS,
+)
+
+
+class S3:
+    """
+    Application scoped S3 client.
+
+    A single aiobotocore client keeps a pool of up to
+    S3_MAX_POOL_CONNECTIONS keep-alive connections that every upload /
+    download reuses, instead of a new client and TLS handshake per file.
+    """
+
+    client: Any = None
+
+    _stack: Optional[AsyncExitStack] = None
+    _lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls):
+        async with cls._lock:
+            if cls.client is not None:
+                return
+
+            session = aiobotocore.session.get_session()
+            stack = AsyncExitStack()
+
+            cls.client = await stack.enter_async_context(
+                session.create_client(
+                    "s3",
+                    region_name=AWS_S3_BUCKET_REGION,
+                    aws_access_key_id=AWS_S3_BUCKET_ACCESS_KEY,
+                    aws_secret_access_key=AWS_S3_BUCKET_SECRET_KEY,
+                    endpoint_url=f"https://{AWS_S3_BUCKET_HOST}",
+                    config=AioConfig(
+                        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                        connect_timeout=S3_CONNECT_TIMEOUT_SECONDS,
+                        read_timeout=S3_READ_TIMEOUT_SECONDS,
+                    ),
+                )
+            )
+            cls._stack = stack
+
+    @classmethod
+    async def get_client(cls) -> Any:
+        # lazily connected outside the app lifespan (scripts, export workers)
+        if cls.client is None:
+            await cls.connect()
+        return cls.client
+
+    @classmethod
+    async def close(cls):
+        async with cls._lock:
+            if cls._stack is not None:
+                await cls._stack.aclose()
+            cls.client = None
+            cls._stack = None
@@ -0,0 +1,288 @@
+import gzip
+import os
+import stat
+import uuid
+from email.utils import formatdate, parsedate
+from mimetypes import guess_type
+from typing import List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import PathLike, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from config import STATIC_CACHE_MAX_AGE_SECONDS, STATIC_IMMUTABLE_MAX_AGE_SECONDS
+from fast_app.utils.file_utils import parse_range_header
+
+STATIC_ROOT = os.path.join("fast_app", "static")
+
+# text assets that get / are served from .br / .gz siblings
+PRECOMPRESS_EXTENSIONS = {".css", ".js", ".svg", ".json", ".html", ".txt"}
+
+# preferred first
+PRECOMPRESSED_ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+# upload keys are never overwritten (timestamp + uuid or content hash)
+IMMUTABLE_PREFIXES = ("uploads/",)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StaticFileResponse(Response):
+    """
+    A file, or the inclusive byte range `start..end` of it.
+
+    Bodies go out with `http.response.zerocopysend` when the server offers
+    it (sendfile), otherwise in chunks read off the event loop.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        size: int,
+        headers: dict,
+        media_type: str,
+        status_code: int = 200,
+        start: int = 0,
+        end: Optional[int] = None,
+        send_header_only: bool = False,
+    ):
+        self.path = path
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.start = start
+        self.end = size - 1 if end is None else end
+        self.send_header_only = send_header_only
+
+        self.init_headers({**headers, "content-length": str(max(self.end - self.start + 1, 0))})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+
+        remaining = self.end - self.start + 1
+        if self.send_header_only or remaining <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file.wrapped.fileno(),
+                    "offset": self.start,
+                    "count": remaining,
+                    "more_body": False,
+                })
+                return
+
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with HTTP caching.
+
+    - strong ETags + Last-Modified, answered with 304 on a match
+    - `immutable` year long Cache-Control for upload keys, a short max-age
+      (revalidated through the ETag) for css / js / img assets
+    - single byte-range requests (206 / 416, If-Range)
+    - precompressed `.br` / `.gz` siblings picked by Accept-Encoding
+    """
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        relative_path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        media_type = guess_type(str(full_path))[0] or "text/plain"
+
+        range_header = request_headers.get("range")
+        encoding, encoded_path, encoded_stat = (None, full_path, stat_result)
+        if not range_header:
+            encoding, encoded_path, encoded_stat = self.precompressed(full_path, stat_result, request_headers)
+
+        etag = make_etag(encoded_stat, encoding)
+        headers = {
+            "etag": etag,
+            "last-modified": formatdate(encoded_stat.st_mtime, usegmt=True),
+            "cache-control": cache_control(relative_path),
+            "accept-ranges": "bytes",
+        }
+        if os.path.splitext(str(full_path))[1] in PRECOMPRESS_EXTENSIONS:
+            headers["vary"] = "Accept-Encoding"
+        if encoding:
+            headers["content-encoding"] = encoding
+
+        if is_not_modified(etag, encoded_stat, request_headers):
+            return Response(status_code=304, headers=headers)
+
+        size = encoded_stat.st_size
+        byte_range = None
+        if range_header and if_range_matches(request_headers.get("if-range"), etag):
+            byte_range = parse_range_header(range_header, size)
+
+        if byte_range and status_code == 200:
+            start, end = byte_range
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            return StaticFileResponse(
+                encoded_path, size, headers, media_type, 206, start, end,
+                send_header_only=scope["method"] == "HEAD",
+            )
+
+        return StaticFileResponse(
+            encoded_path, size, headers, media_type, status_code,
+            send_header_only=scope["method"] == "HEAD",
+        )
+
+    @staticmethod
+    def precompressed(
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        request_headers: Headers,
+    ) -> Tuple[Optional[str], PathLike, os.stat_result]:
+        if os.path.splitext(str(full_path))[1] not in PRECOMPRESS_EXTENSIONS:
+            return None, full_path, stat_result
+
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                encoded_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            # a stale sibling would serve an old asset
+            if stat.S_ISREG(encoded_stat.st_mode) and encoded_stat.st_mtime >= stat_result.st_mtime:
+                return encoding, f"{full_path}{suffix}", encoded_stat
+
+        return None, full_path, stat_result
+
+
+# ----------------------------------
+# HELPERS
+# ----------------------------------
+
+def make_etag(stat_result: os.stat_result, encoding: Optional[str] = None) -> str:
+    tag = f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
+    if encoding:
+        tag = f"{tag}-{encoding}"
+    return f'"{tag}"'
+
+
+def cache_control(relative_path: str) -> str:
+    if relative_path.startswith(IMMUTABLE_PREFIXES):
+        return f"public, max-age={STATIC_IMMUTABLE_MAX_AGE_SECONDS}, immutable"
+    return f"public, max-age={STATIC_CACHE_MAX_AGE_SECONDS}"
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    accepted = []
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if name:
+            accepted.append(name.lower())
+    return accepted
+
+
+def _etag_list(header: str) -> List[str]:
+    return [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+def is_not_modified(etag: str, stat_result: os.stat_result, request_headers: Headers) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # weak comparison, If-Modified-Since is ignored when present
+        return if_none_match.strip() == "*" or etag in _etag_list(if_none_match)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        since = parsedate(if_modified_since)
+        modified = parsedate(formatdate(stat_result.st_mtime, usegmt=True))
+        return since is not None and modified is not None and since >= modified
+
+    return False
+
+
+def if_range_matches(if_range: Optional[str], etag: str) -> bool:
+    # If-Range only honours strong validators, a date never matches ours
+    return if_range is None or if_range.strip() == etag
+
+
+def precompress_assets(directory: str) -> int:
+    """
+    Write `.gz` (and `.br` when the brotli package is installed) siblings
+    of text assets under `directory` that are missing or stale. Uploads
+    are skipped. Returns the number of files written.
+
+    Every worker runs this at startup: a sibling is written to a temp file
+    next to it and renamed into place, so a concurrent worker never
+    truncates one that is being served.
+    """
+    try:
+        import brotli  # type: ignore
+    except ImportError:
+        brotli = None
+
+    written = 0
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != os.path.join(directory, "uploads")]
+
+        for name in files:
+            if os.path.splitext(name)[1] not in PRECOMPRESS_EXTENSIONS:
+                continue
+
+            path = os.path.join(root, name)
+            mtime = os.stat(path).st_mtime
+
+            targets = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                targets.append((".br", lambda data: brotli.compress(data, quality=11)))
+
+            data = None
+            for suffix, compress in targets:
+                target = f"{path}{suffix}"
+                if os.path.exists(target) and os.stat(target).st_mtime >= mtime:
+                    continue
+                if data is None:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                _write_atomic(target, compress(data))
+                written += 1
+
+    return written
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -1,18 +1,101 @@
-from typing import Dict, Set, DefaultDict
+from typing import Any, Dict, Iterable, List, Optional, DefaultDict
 from collections import defaultdict
-from fastapi import WebSocket
+from contextlib import AsyncExitStack, asynccontextmanager
+from uuid import uuid4
+import zlib
+from fastapi import WebSocket, status
+from fastapi.encoders import jsonable_encoder
 import asyncio
+import json
+
+from config import WS_SEND_QUEUE_SIZE, WS_SLOW_CONSUMER_POLICY
+from fast_app.core.ws_pubsub import InMemoryPubSubBackend, WSPubSubBackend
+from fast_app.defaults.common_enums import SlowConsumerPolicy
+from fast_app.utils.logger import logger
+
+# number of locks the room registry is striped over
+ROOM_LOCK_SHARDS = 64
+
+
+class WSConnection:
+    """
+    A single websocket with a bounded outgoing queue drained by its own
+    writer task, so a slow or dead client never blocks a broadcast.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        websocket: WebSocket,
+        queue_size: int = WS_SEND_QUEUE_SIZE,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy(WS_SLOW_CONSUMER_POLICY),
+    ):
+        self.user_id = user_id
+        self.websocket = websocket
+        self.policy = policy
+        self.closed = False
+
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def send_text(self, text: str):
+        """Queue an already-serialized frame without waiting for the socket"""
+        if self.closed:
+            return
+
+        try:
+            self._queue.put_nowait(text)
+        except asyncio.QueueFull:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                logger.warning(f"Disconnecting slow websocket consumer: {self.user_id}")
+                self.closed = True
+                asyncio.create_task(self._close_socket())
+            else:
+                logger.warning(f"Send queue full, dropping message for: {self.user_id}")
+
+    async def _write_loop(self):
+        try:
+            while True:
+                text = await self._queue.get()
+                await self.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # the receive loop of the route handles the disconnect itself
+            logger.warning(f"Websocket send failed for user {self.user_id}: {e}")
+            self.closed = True
+
+    async def _close_socket(self):
+        try:
+            await self.websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        except Exception:
+            pass
+
+    def close(self):
+        self.closed = True
+        self._writer.cancel()
 
 
 class WSManager:
-    def __init__(self):
-        # user_id -> set of websockets
-        self.connections: DefaultDict[str, Set[WebSocket]] = defaultdict(set)
+    def __init__(self, backend: Optional[WSPubSubBackend] = None):
+        # user_id -> websocket -> connection (on this worker only)
+        self.connections: DefaultDict[str, Dict[WebSocket, WSConnection]] = defaultdict(dict)
 
-        # room_id -> set of user_ids
-        self.rooms: DefaultDict[str, Set[str]] = defaultdict(set)
+        # room_id -> set of user_ids (replicated across workers)
+        self.rooms: DefaultDict[str, set[str]] = defaultdict(set)
+
+        # user_id -> set of room_ids (reverse index of `rooms`)
+        self.user_rooms: DefaultDict[str, set[str]] = defaultdict(set)
 
         self._lock = asyncio.Lock()
+        self._room_locks = [asyncio.Lock() for _ in range(ROOM_LOCK_SHARDS)]
+
+        # fan-out transport shared by all workers
+        self.backend = backend or InMemoryPubSubBackend()
+        self.node_id = uuid4().hex
+
+    async def start(self):
+        await self.backend.start(self._on_message)
 
     # ----------------------------------
     # CONNECTION
@@ -21,47 +104,151 @@ class WSManager:
     async def connect(self, user_id: str, websocket: WebSocket):
         await websocket.accept()
         async with self._lock:
-            self.connections[user_id].add(websocket)
+            self.connections[user_id][websocket] = WSConnection(user_id, websocket)
 
     async def disconnect(self, user_id: str, websocket: WebSocket):
         async with self._lock:
-            self.connections[user_id].discard(websocket)
+            connection = self.connections[user_id].pop(websocket, None)
+            if connection:
+                connection.close()
             if not self.connections[user_id]:
                 del self.connections[user_id]
 
-            for users in self.rooms.values():
-                users.discard(user_id)
+        await self._apply_and_publish({"type": "leave_all", "user_id": user_id})
 
     # ----------------------------------
     # ROOMS
     # ----------------------------------
 
     async def join_room(self, room_id: str, user_id: str):
-        async with self._lock:
-            self.rooms[room_id].add(user_id)
+        await self._apply_and_publish(
+            {"type": "join", "room_id": room_id, "user_id": user_id}
+        )
+
+    async def join_rooms(self, room_ids: List[str], user_id: str):
+        """Join several rooms in a single locked operation / broadcast"""
+        if room_ids:
+            await self._apply_and_publish(
+                {"type": "join_many", "room_ids": list(room_ids), "user_id": user_id}
+            )
 
     async def leave_room(self, room_id: str, user_id: str):
-        async with self._lock:
-            self.rooms[room_id].discard(user_id)
-            if not self.rooms[room_id]:
+        await self._apply_and_publish(
+            {"type": "leave", "room_id": room_id, "user_id": user_id}
+        )
+
+    @asynccontextmanager
+    async def _room_locks_for(self, room_ids: Iterable[str]):
+        """Hold the lock shards of the given rooms (in a fixed order)"""
+        shards = sorted({zlib.crc32(r.encode()) % ROOM_LOCK_SHARDS for r in room_ids})
+        async with AsyncExitStack() as stack:
+            for shard in shards:
+                await stack.enter_async_context(self._room_locks[shard])
+            yield
+
+    def _remove_member(self, room_id: str, user_id: str):
+        users = self.rooms.get(room_id)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
                 del self.rooms[room_id]
 
+        joined = self.user_rooms.get(user_id)
+        if joined is not None:
+            joined.discard(room_id)
+            if not joined:
+                del self.user_rooms[user_id]
+
     # ----------------------------------
     # EMIT
     # ----------------------------------
 
+    @staticmethod
+    def encode(payload: Any) -> str:
+        return json.dumps(jsonable_encoder(payload), separators=(",", ":"))
+
     async def emit_user(self, user_id: str, payload: dict):
-        for ws in list(self.connections.get(user_id, [])):
-            await ws.send_json(payload)
+        await self._apply_and_publish(
+            {"type": "emit_user", "user_id": user_id, "data": self.encode(payload)}
+        )
 
     async def emit_room(self, room_id: str, payload: dict):
-        for user_id in self.rooms.get(room_id, set()):
-            await self.emit_user(user_id, payload)
+        # serialized once per broadcast, whatever the number of receivers
+        await self._apply_and_publish(
+            {"type": "emit_room", "room_id": room_id, "data": self.encode(payload)}
+        )
+
+    def _send_user(self, user_id: str, text: str):
+        for connection in list(self.connections.get(user_id, {}).values()):
+            connection.send_text(text)
+
+    def _send_room(self, room_id: str, text: str):
+        for user_id in list(self.rooms.get(room_id, set())):
+            self._send_user(user_id, text)
+
+    # ----------------------------------
+    # FAN-OUT
+    # ----------------------------------
+
+    async def _apply_and_publish(self, message: Dict[str, Any]):
+        """Apply an event on this worker and hand it to the other workers"""
+        await self._apply(message)
+        await self.backend.publish({**message, "origin": self.node_id})
+
+    async def _on_message(self, message: Dict[str, Any]):
+        # already applied locally by the publishing worker
+        if message.get("origin") == self.node_id:
+            return
+        await self._apply(message)
+
+    async def _apply(self, message: Dict[str, Any]):
+        event_type = message.get("type")
+
+        if event_type == "emit_room":
+            self._send_room(message["room_id"], message["data"])
+
+        elif event_type == "emit_user":
+            self._send_user(message["user_id"], message["data"])
+
+        elif event_type == "join":
+            room_id, user_id = message["room_id"], message["user_id"]
+            async with self._room_locks_for([room_id]):
+                self.rooms[room_id].add(user_id)
+                self.user_rooms[user_id].add(room_id)
+
+        elif event_type == "join_many":
+            room_ids, user_id = message["room_ids"], message["user_id"]
+            async with self._room_locks_for(room_ids):
+                for room_id in room_ids:
+                    self.rooms[room_id].add(user_id)
+                self.user_rooms[user_id].update(room_ids)
+
+        elif event_type == "leave":
+            room_id, user_id = message["room_id"], message["user_id"]
+            async with self._room_locks_for([room_id]):
+                self._remove_member(room_id, user_id)
+
+        elif event_type == "leave_all":
+            # only the rooms the user is in, via the reverse index
+            user_id = message["user_id"]
+            room_ids = list(self.user_rooms.get(user_id, ()))
+            async with self._room_locks_for(room_ids):
+                for room_id in room_ids:
+                    self._remove_member(room_id, user_id)
 
     # ----------------------------------
     # CLEANUP
     # ----------------------------------
 
     def close_all(self):
+        for sockets in self.connections.values():
+            for connection in sockets.values():
+                connection.close()
+
         self.connections.clear()
         self.rooms.clear()
+        self.user_rooms.clear()
+
+    async def close(self):
+        await self.backend.close()
+        self.close_all()
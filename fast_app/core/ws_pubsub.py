@@ -0,0 +1,170 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from fast_app.utils.logger import logger
+
+MessageHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+NAMESPACE_EXISTS_ERROR = 48
+
+
+class WSPubSubBackend(ABC):
+    """
+    Transport used by WSManager to fan room/user events out to every
+    worker process. Messages are plain JSON-compatible dicts.
+    """
+
+    @abstractmethod
+    async def start(self, handler: MessageHandler) -> None:
+        """Start delivering messages published by any worker to `handler`"""
+
+    @abstractmethod
+    async def publish(self, message: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        ...
+
+
+# ----------------------------------
+# IN-MEMORY
+# ----------------------------------
+
+class InMemoryPubSubBackend(WSPubSubBackend):
+    """
+    Single-process backend. Every manager started on the same instance
+    receives each message, so one instance shared by several WSManagers
+    behaves like several workers behind a broker.
+    """
+
+    def __init__(self):
+        self._handlers: List[MessageHandler] = []
+
+    async def start(self, handler: MessageHandler) -> None:
+        self._handlers.append(handler)
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        for handler in list(self._handlers):
+            await handler(dict(message))
+
+    async def close(self) -> None:
+        self._handlers.clear()
+
+
+# ----------------------------------
+# MONGODB (capped collection)
+# ----------------------------------
+
+class MongoPubSubBackend(WSPubSubBackend):
+    """
+    Broker-backed fan-out over a MongoDB capped collection.
+
+    Each worker inserts published messages and tails the collection with
+    a tailable/await cursor, so no extra infrastructure is needed besides
+    the database the app already uses.
+    """
+
+    def __init__(
+        self,
+        database: Any,
+        collection_name: str = "ws_events",
+        size_bytes: int = 16 * 1024 * 1024,
+        retry_delay: float = 1.0,
+    ):
+        self.database = database
+        self.collection_name = collection_name
+        self.size_bytes = size_bytes
+        self.retry_delay = retry_delay
+
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def collection(self):
+        return self.database[self.collection_name]
+
+    async def _ensure_collection(self):
+        # every worker runs this at startup, the ones losing the creation
+        # race find the collection already there
+        try:
+            await self.database.create_collection(
+                self.collection_name,
+                capped=True,
+                size=self.size_bytes,
+            )
+        except CollectionInvalid:
+            pass
+        except OperationFailure as e:
+            if e.code != NAMESPACE_EXISTS_ERROR:
+                raise
+
+        # tailable cursors die immediately on an empty collection; an extra
+        # seed from a concurrent worker is harmless, they are skipped
+        if await self.collection.find_one({}, {"_id": 1}) is None:
+            await self.collection.insert_one({"type": "init"})
+
+    async def start(self, handler: MessageHandler) -> None:
+        await self._ensure_collection()
+
+        # only deliver messages published after this worker started
+        last = await self.collection.find_one({}, {"_id": 1}, sort=[("$natural", -1)])
+        last_id = last["_id"] if last else None
+
+        self._task = asyncio.create_task(self._tail(handler, last_id))
+
+    async def _tail(self, handler: MessageHandler, last_id: Any):
+        while True:
+            try:
+                # ObjectIds of different processes are not ordered, resume by
+                # position instead: the tailable cursor walks the collection in
+                # insertion ($natural) order, skip up to the last document seen.
+                # If that one was already evicted, everything left is newer.
+                skipping = bool(last_id) and await self.collection.find_one({"_id": last_id}, {"_id": 1}) is not None
+
+                cursor = self.collection.find(
+                    {},
+                    cursor_type=CursorType.TAILABLE_AWAIT,
+                )
+
+                while cursor.alive:
+                    async for doc in cursor:
+                        doc_id = doc.pop("_id")
+                        if skipping:
+                            skipping = doc_id != last_id
+                            continue
+
+                        last_id = doc_id
+                        if doc.get("type") == "init":
+                            continue
+                        try:
+                            await handler(doc)
+                        except Exception:
+                            logger.exception("WS pubsub handler failed")
+
+                    # caught up without meeting last_id: evicted meanwhile
+                    skipping = False
+                    await asyncio.sleep(0)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WS pubsub tail failed: {e}")
+
+            await asyncio.sleep(self.retry_delay)
+
+    async def publish(self, message: Dict[str, Any]) -> None:
+        # insert_one adds _id to the given dict
+        await self.collection.insert_one(dict(message))
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
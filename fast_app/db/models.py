@@ -10,6 +10,9 @@ from fast_app.modules.contact_us.models.contact_us_model import ContactUs
 from fast_app.modules.demo.models.demo_model import Demo
 from fast_app.modules.democms.models.democms_model import Democms
 from fast_app.modules.demoform.models.demoform_model import Demoform
+from fast_app.modules.export.models.export_job_model import ExportJob
+from fast_app.modules.file.models.stored_file_model import StoredFile
+from fast_app.modules.notification.models.broadcast_model import NotificationBroadcast
 from fast_app.modules.notification.models.notification_model import Notification
 from fast_app.modules.privacy_policy.models.privacy_policy_model import PrivacyPolicy
 from fast_app.modules.product.models.product_model import Product
@@ -25,6 +28,7 @@ document_models = [
     Demoform,
     UserDevice,
     Notification,
+    NotificationBroadcast,
     Room,
     Message,
     Report,
@@ -39,4 +43,6 @@ document_models = [
     BuyerCms,
     SellerCms,
     Democms,
+    ExportJob,
+    StoredFile,
 ]
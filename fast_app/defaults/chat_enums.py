@@ -36,6 +36,7 @@ class WSIncomingEvent(str, Enum):
     READ_MESSAGE = "read_message"
     EDIT_MESSAGE = "edit_message"
     DELETE_MESSAGE = "delete_message"
+    GET_MESSAGES = "get_messages"
 
     # realtime signals
     TYPING = "typing"
@@ -66,9 +67,11 @@ class WSOutgoingEvent(str, Enum):
 
     # messaging
     NEW_MESSAGE = "new_message"
+    MESSAGE_SENT = "message_sent"
     MESSAGE_EDITED = "message_edited"
     MESSAGE_DELETED = "message_deleted"
     MESSAGE_READ = "message_read"
+    MESSAGES = "messages"
 
     # realtime signals
     USER_TYPING = "user_typing"
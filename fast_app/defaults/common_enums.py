@@ -41,4 +41,35 @@ class GeoType(str, Enum):
 class OtpPurpose(str, Enum):
     LOGIN = "login"
     REGISTRATION = "registration"
-    RESET_PASSWORD = "reset_password"
\ No newline at end of file
+    RESET_PASSWORD = "reset_password"
+
+class PaginationType(str, Enum):
+    OFFSET = "offset"
+    CURSOR = "cursor"
+
+
+class CountMode(str, Enum):
+    """How the total document count is resolved for cursor pagination"""
+    NONE = "none"
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What to do with a websocket whose send queue is full"""
+    DROP = "drop"
+    DISCONNECT = "disconnect"
+
+
+class ExportFormat(str, Enum):
+    """File formats of data exports"""
+    XLSX = "xlsx"
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ImageSize(str, Enum):
+    """Stored renditions of an uploaded image"""
+    ORIGINAL = "original"
+    MEDIUM = "medium"
+    THUMB = "thumb"
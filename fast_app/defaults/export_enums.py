@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ExportType(str, Enum):
+    USERS = "users"
+
+
+class ExportJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
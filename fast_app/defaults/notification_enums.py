@@ -10,4 +10,10 @@ class NotificationType(str, Enum):
 class NotificationReceiverType(str, Enum):
     ALL_USERS = "all-users"
     ONLY_PROVIDER = "only-vendor"
-    ONLY_CLIENT = "only-customer"
\ No newline at end of file
+    ONLY_CLIENT = "only-customer"
+
+class BroadcastStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
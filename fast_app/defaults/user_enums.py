@@ -3,11 +3,13 @@ from enum import Enum
 
 class UserWsIncomingEvents(str, Enum):
     GET_USER_STATUS = "get_user_status"
+    SUBSCRIBE_USER_STATUS = "subscribe_user_status"
     UPDATE_STATUS = "update_status"
 
 
 class UserWsOutgoingEvents(str, Enum):
     USER_STATUS = "user_status"
+    USER_STATUSES = "user_statuses"
 
 class UserActivityStatusEnum(str, Enum):
     ONLINE="online"
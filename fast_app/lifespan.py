@@ -1,8 +1,28 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 
+from config import BUCKET, DB_NAME, STATIC_PRECOMPRESS, WS_PUBSUB_BACKEND
+from fast_app.core.local_storage import LocalStorage
+from fast_app.core.presence import presence_registry
+from fast_app.core.s3 import S3
+from fast_app.core.static_files import STATIC_ROOT, precompress_assets
 from fast_app.core.ws_manager import WSManager
+from fast_app.core.ws_pubsub import InMemoryPubSubBackend, MongoPubSubBackend, WSPubSubBackend
 from fast_app.db.mongodb import MongoDB
+from fast_app.modules.chat.services.message_pipeline import message_writer
+from fast_app.modules.export.services import export_service
+from fast_app.modules.notification.services import broadcast_service
+from fast_app.modules.notification.services.notification_scheduler import notification_scheduler
+from fast_app.utils.file_utils import start_upload_purge, stop_upload_purge
+from fast_app.utils.firebase_utils import start_push, stop_push
+from fast_app.utils.image_utils import close_image_pool
+
+
+def get_ws_pubsub_backend() -> WSPubSubBackend:
+    if WS_PUBSUB_BACKEND == "mongo" and MongoDB.client:
+        return MongoPubSubBackend(MongoDB.client[DB_NAME])
+    return InMemoryPubSubBackend()
 
 
 @asynccontextmanager
@@ -10,13 +30,53 @@ async def lifespan(app: FastAPI):
     # 🔼 STARTUP
     await MongoDB.connect()
 
-    ws_manager = WSManager()
+    # one pooled S3 client for all uploads / downloads
+    if BUCKET == "s3":
+        await S3.connect()
+
+    ws_manager = WSManager(backend=get_ws_pubsub_backend())
+    await ws_manager.start()
     app.state.ws_manager = ws_manager
 
+    # online state from the sockets, device status written behind
+    await presence_registry.start(ws_manager)
+
+    # firebase is initialized once, sends run on the push pool
+    await start_push()
+
+    # chat messages are written in batches
+    await message_writer.start()
+
+    # resume export jobs queued before a restart
+    await export_service.start_export_jobs()
+
+    # resume notification broadcasts (scheduled ones wait for their time)
+    await broadcast_service.start_broadcasts()
+
+    # push notifications when their scheduled_time comes
+    await notification_scheduler.start()
+
+    # reclaim unreferenced content addressed uploads
+    start_upload_purge()
+
+    # .gz / .br siblings served by CachedStaticFiles
+    if STATIC_PRECOMPRESS:
+        await run_in_threadpool(precompress_assets, STATIC_ROOT)
+
     try:
         yield
 
     finally:
         # 🔽 SHUTDOWN
-        ws_manager.close_all()
+        await export_service.stop_export_jobs()
+        await broadcast_service.stop_broadcasts()
+        await notification_scheduler.stop()
+        await stop_upload_purge()
+        close_image_pool()
+        await stop_push()
+        await message_writer.stop()
+        await presence_registry.stop()
+        await ws_manager.close()
+        await S3.close()
+        LocalStorage.close()
         await MongoDB.close()
@@ -1,7 +1,7 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from config import APP_NAME, APP_VERSION
+from fast_app.core.static_files import STATIC_ROOT, CachedStaticFiles
 from fast_app.lifespan import lifespan
 from fast_app.middlewares.exception_handler import ExceptionHandlerMiddleware
 from fast_app.utils.register_routes import register_all_routes
@@ -32,8 +32,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Serve static files globally
-app.mount("/static", StaticFiles(directory="fast_app/static"), name="static")
+# Serve static files globally, with ETag / Cache-Control / range support
+app.mount("/static", CachedStaticFiles(directory=STATIC_ROOT), name="static")
 
 # Register all routes
 register_all_routes(app,app_modules)
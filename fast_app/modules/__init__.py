@@ -7,6 +7,7 @@ from fast_app.modules import (
     demo,
     democms,
     demoform,
+    export,
     file,
     notification,
     privacy_policy,
@@ -32,4 +33,5 @@ app_modules=[
     terms_and_condition,
     contact_us,
     cms,
+    export,
 ]
\ No newline at end of file
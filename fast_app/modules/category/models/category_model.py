@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Annotated, Optional
+from typing import Annotated, Dict, Optional
 
 from beanie import Indexed, Insert, Replace, before_event
+from pydantic import Field
 from fast_app.defaults.common_enums import StatusEnum
 from fast_app.modules.common.models.base_model import BaseDocument
 
@@ -10,6 +11,8 @@ class Category(BaseDocument):
     name: str
     description: Optional[str]
     image: Optional[str]
+    # ImageSize value -> path of the resized webp rendition
+    image_variants: Dict[str, str] = Field(default_factory=dict)
 
     status: StatusEnum = StatusEnum.ACTIVE
     is_deleted: bool = False
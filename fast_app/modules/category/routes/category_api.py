@@ -7,7 +7,7 @@ from fast_app.decorators.permission_decorator import action_type
 from fast_app.defaults.permission_enums import Action, Resource
 from fast_app.modules.category.services import category_service
 from fast_app.decorators.catch_error import catch_error
-from fast_app.defaults.common_enums import StatusEnum, UserRole
+from fast_app.defaults.common_enums import CountMode, ImageSize, PaginationType, StatusEnum, UserRole
 
 from fast_app.modules.category.schemas.category_schema import (
     CategoryCreateForm,
@@ -17,6 +17,7 @@ from fast_app.modules.category.schemas.category_schema import (
 )
 
 from fast_app.modules.common.schemas.response_schema import (
+    CursorPaginationMeta,
     PaginatedData,
     PaginationMeta,
     SuccessResponse,
@@ -38,6 +39,11 @@ async def list_categories(
     search: Optional[str] = Query(None),
     sort: Optional[str] = Query(None),
     status_filter: Optional[StatusEnum] = Query(None),
+    pagination_type: PaginationType = Query(PaginationType.OFFSET),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+    count_mode: CountMode = Query(CountMode.NONE),
+    image_size: ImageSize = Query(ImageSize.ORIGINAL),
 ):
     filters = {}
     if status_filter:
@@ -49,12 +55,21 @@ async def list_categories(
         search=search,
         sort=sort,
         filters=filters,
+        pagination_type=pagination_type,
+        after=after,
+        before=before,
+        count_mode=count_mode,
+        image_size=image_size,
     )
 
     return SuccessDataPaginated(
         message="Categories retrieved successfully",
         data=PaginatedData(
-            meta=PaginationMeta(**pagination),
+            meta=(
+                CursorPaginationMeta(**pagination)
+                if pagination_type == PaginationType.CURSOR
+                else PaginationMeta(**pagination)
+            ),
             docs=categories,
         ),
     )
@@ -65,9 +80,13 @@ async def list_categories(
 @catch_error
 @login_required(UserRole.ADMIN)
 @action_type(Action.READ)
-async def get_category(request: Request, category_id: str):
+async def get_category(
+    request: Request,
+    category_id: str,
+    image_size: ImageSize = Query(ImageSize.ORIGINAL),
+):
 
-    category = await category_service.get_category_by_id(category_id)
+    category = await category_service.get_category_by_id(category_id, image_size)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
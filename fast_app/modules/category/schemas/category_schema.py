@@ -1,6 +1,6 @@
 from fastapi import File, Form, UploadFile
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 from fast_app.defaults.common_enums import StatusEnum
@@ -18,6 +18,7 @@ class CategoryStatusUpdate(BaseModel):
 class CategoryResponse(CategoryBase):
     id: str = Field(..., alias="_id")
     image: Optional[str]
+    image_variants: Dict[str, str] = {}
     status: StatusEnum
     is_deleted: bool
     created_at: datetime
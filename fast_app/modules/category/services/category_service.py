@@ -8,9 +8,10 @@ from fast_app.modules.category.schemas.category_schema import (
     CategoryCreateForm,
     CategoryUpdateForm,
 )
-from fast_app.defaults.common_enums import StatusEnum
+from fast_app.defaults.common_enums import CountMode, ImageSize, PaginationType, StatusEnum
 from fast_app.utils.common_utils import escape_regex, exclude_unset
-from fast_app.utils.file_utils import upload_files
+from fast_app.utils.file_utils import release_file, upload_files
+from fast_app.utils.image_utils import apply_image_size
 from fast_app.utils.logger import logger
 
 
@@ -23,6 +24,11 @@ async def get_categories(
     search: Optional[str] = None,
     sort: Optional[str] = None,
     filters: Optional[Dict] = None,
+    pagination_type: PaginationType = PaginationType.OFFSET,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    count_mode: CountMode = CountMode.NONE,
+    image_size: ImageSize = ImageSize.ORIGINAL,
 ) -> Tuple[List[dict], Dict[str, Any]]:
 
     pipeline = []
@@ -43,17 +49,31 @@ async def get_categories(
     sort_field = sort.lstrip("-") if sort else "created_at"
     sort_dir = -1 if sort and sort.startswith("-") else 1
 
-    categories, pagination = await Category.aggregate_with_pagination(
-        pipeline=pipeline,
-        page=page,
-        limit=limit,
-        sort_field=sort_field,
-        sort_dir=sort_dir,
-    )
+    if pagination_type == PaginationType.CURSOR:
+        categories, pagination = await Category.aggregate_with_cursor(
+            pipeline=pipeline,
+            limit=limit,
+            sort_field=sort_field,
+            sort_dir=sort_dir,
+            after=after,
+            before=before,
+            count_mode=count_mode,
+        )
+    else:
+        categories, pagination = await Category.aggregate_with_pagination(
+            pipeline=pipeline,
+            page=page,
+            limit=limit,
+            sort_field=sort_field,
+            sort_dir=sort_dir,
+        )
 
     return (
         [
-            Category.model_validate(category).model_dump(by_alias=True, mode="json")
+            apply_image_size(
+                Category.model_validate(category).model_dump(by_alias=True, mode="json"),
+                image_size,
+            )
             for category in categories
         ],
         pagination,
@@ -63,10 +83,13 @@ async def get_categories(
 # -----------------------------------------------------
 # GET BY ID
 # -----------------------------------------------------
-async def get_category_by_id(category_id: str) -> Optional[dict]:
+async def get_category_by_id(category_id: str, image_size: ImageSize = ImageSize.ORIGINAL) -> Optional[dict]:
     try:
         category = await Category.get(PydanticObjectId(category_id))
-        return category.model_dump(by_alias=True, mode="json") if category else None
+        if not category:
+            return None
+        data: Dict[str, Any] = apply_image_size(category.model_dump(by_alias=True, mode="json"), image_size)
+        return data
     except Exception as e:
         logger.error(str(e))
         return None
@@ -82,13 +105,14 @@ async def create_category(data: CategoryCreateForm):
     
     image_data={}
     if data.image:
-        upload_result = await upload_files([data.image], "category-images")
+        upload_result = await upload_files([data.image], "category-images", variants=True)
         image_data = upload_result[0]
     
     category = Category(
         name=data.name,
         description=data.description,
-        image=image_data.get("path","")
+        image=image_data.get("path",""),
+        image_variants=image_data.get("variants", {}),
     )
 
     await category.create()
@@ -108,13 +132,17 @@ async def update_category(category_id: str, data: CategoryUpdateForm):
     if not update_data:
         return None
 
+    replaced_image = None
     if data.image:
-        upload_result = await upload_files([data.image], "category-images")
+        upload_result = await upload_files([data.image], "category-images", variants=True)
         image_data = upload_result[0]
+        replaced_image = category.image
         update_data["image"]=image_data.get("path","")
+        update_data["image_variants"]=image_data.get("variants", {})
     
     update_data["updated_at"] = datetime.utcnow()
     await category.set(exclude_unset(update_data))
+    await release_file(replaced_image)
 
     return category.model_dump(by_alias=True, mode="json")
 
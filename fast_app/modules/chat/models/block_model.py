@@ -1,8 +1,10 @@
 from datetime import datetime
 
+from beanie import Delete, Insert, Replace, Save, SaveChanges, Update, after_event
 from pydantic import Field
 from pymongo import IndexModel
 
+from fast_app.core.chat_cache import invalidate_block
 from fast_app.modules.common.models.base_model import BaseDocument
 
 
@@ -22,3 +24,8 @@ class Block(BaseDocument):
             IndexModel([("blocked_id", 1)]),
             IndexModel([("is_active", 1)]),
         ]
+
+    @after_event(Insert, Replace, Save, SaveChanges, Update, Delete)
+    async def invalidate_chat_cache(self):
+        # block / unblock takes effect on the next message
+        await invalidate_block(self.blocker_id, self.blocked_id)
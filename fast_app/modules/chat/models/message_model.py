@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import List, Optional
 
-from beanie import PydanticObjectId
+from beanie import Delete, PydanticObjectId, Replace, Save, SaveChanges, Update, after_event
 from pydantic import Field
 from pymongo import IndexModel
 
+from fast_app.core.recent_messages import recent_messages
 from fast_app.defaults.chat_enums import MessageType
 from fast_app.modules.common.models.base_model import BaseDocument
 
@@ -16,6 +17,7 @@ class Message(BaseDocument):
     content: str
     message_type: MessageType = MessageType.TEXT
 
+    # no longer written, read state is the room's per-member read_at watermark
     read_by: List[str] = Field(default_factory=list)
     deleted_for: List[str] = Field(default_factory=list)
 
@@ -27,6 +29,12 @@ class Message(BaseDocument):
     class Settings:
         name = "messages"
         indexes = [
-            IndexModel([("room_id", 1), ("created_at", -1)]),
+            # history pages: equality on room, range + tiebreak fully on the index
+            IndexModel([("room_id", 1), ("created_at", -1), ("_id", -1)]),
             IndexModel([("sender_id", 1)]),
         ]
+
+    @after_event(Replace, Save, SaveChanges, Update, Delete)
+    def invalidate_recent_messages(self):
+        # edited / deleted messages must not be served from the room buffer
+        recent_messages.invalidate(self.room_id)
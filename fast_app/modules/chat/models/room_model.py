@@ -1,25 +1,48 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from beanie import PydanticObjectId
-from pydantic import Field
+from beanie import Delete, PydanticObjectId, Replace, Save, SaveChanges, Update, after_event
+from pydantic import BaseModel, Field
 from pymongo import IndexModel
 
-from fast_app.defaults.chat_enums import RoomType
+from fast_app.core.chat_cache import invalidate_direct_room
+from fast_app.defaults.chat_enums import MessageType, RoomType
 from fast_app.modules.common.models.base_model import BaseDocument
 
 
+# characters of the last message kept on the room for the inbox
+LAST_MESSAGE_SNIPPET_LENGTH = 120
+
+
+class LastMessage(BaseModel):
+    message_id: PydanticObjectId
+    sender_id: PydanticObjectId
+    snippet: str
+    message_type: MessageType = MessageType.TEXT
+    created_at: datetime
+
+
 class Room(BaseDocument):
     room_type: RoomType = RoomType.DIRECT
 
     members: List[PydanticObjectId] = Field(default_factory=list)
     admins: List[PydanticObjectId] = Field(default_factory=list)
 
+    # sorted "<user_id>:<user_id>" of direct rooms, see chat_cache.member_pair_key
+    member_pair_key: Optional[str] = None
+
     title: Optional[str] = None
     description: Optional[str] = None
 
     last_message_id: Optional[PydanticObjectId] = None
 
+    # denormalized for the inbox, maintained by the message writer
+    last_message: Optional[LastMessage] = None
+    unread_counts: Dict[str, int] = Field(default_factory=dict)
+
+    # member -> read watermark: messages created up to it are read by them
+    read_at: Dict[str, datetime] = Field(default_factory=dict)
+
     is_deleted: bool = False
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -29,6 +52,23 @@ class Room(BaseDocument):
         name = "rooms"
         indexes = [
             IndexModel([("members", 1)]),
+            # inbox: a member's rooms, most recent first
+            IndexModel([("members", 1), ("updated_at", -1), ("_id", -1)]),
             IndexModel([("room_type", 1)]),
             IndexModel([("updated_at", -1)]),
-        ]
\ No newline at end of file
+            # one live direct room per member pair
+            IndexModel(
+                [("member_pair_key", 1)],
+                unique=True,
+                partialFilterExpression={
+                    "member_pair_key": {"$type": "string"},
+                    "is_deleted": False,
+                },
+            ),
+        ]
+
+    @after_event(Replace, Save, SaveChanges, Update, Delete)
+    async def invalidate_chat_cache(self):
+        # a deleted / re-membered room must not keep receiving messages
+        if self.member_pair_key:
+            await invalidate_direct_room(self.member_pair_key)
@@ -1,12 +1,25 @@
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
 
 from fast_app.decorators.catch_error import catch_error
 from fast_app.decorators.authenticator import login_required
-from fast_app.modules.chat.schemas.chat_schema import MessageSendSuccessResponse, SendMessagePayload
+from fast_app.modules.chat.schemas.chat_schema import (
+    ChatMessageResponse,
+    InboxRoomResponse,
+    MessageSendSuccessResponse,
+    RoomReadResponse,
+    SendMessagePayload,
+)
 from fast_app.modules.chat.services import chat_service
-from fast_app.modules.common.schemas.response_schema import SuccessData
+from fast_app.modules.common.schemas.response_schema import (
+    CursorPaginationMeta,
+    PaginatedData,
+    SuccessData,
+    SuccessDataPaginated,
+)
 
 router = APIRouter(prefix="/chat")
 
@@ -20,7 +33,7 @@ async def send_message_api(
 ):
     try:
         user = request.state.user
-        room, message = await chat_service.send_message(
+        room_id, message = await chat_service.send_message(
             sender_id=user.id,
             receiver_id=payload.receiver_user_id,
             content=payload.content,
@@ -31,8 +44,84 @@ async def send_message_api(
     return SuccessData(
         message="Message send successfully",
         data={
-            "room_id": room.id,
+            "room_id": room_id,
             "message_id": message.id,
             "created_at": str(message.created_at),
         }
     )
+
+
+@router.get("/rooms/{room_id}/messages", response_model=SuccessDataPaginated[ChatMessageResponse])
+@catch_error
+@login_required()
+async def get_room_messages_api(
+    request: Request,
+    room_id: str,
+    limit: int = Query(30, ge=1, le=100),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+):
+    try:
+        user = request.state.user
+        messages, pagination = await chat_service.get_room_messages(
+            room_id=room_id,
+            user_id=str(user.id),
+            limit=limit,
+            after=after,
+            before=before,
+        )
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    return SuccessDataPaginated(
+        message="Messages retrieved successfully",
+        data=PaginatedData(
+            meta=CursorPaginationMeta(**pagination),
+            docs=messages,
+        ),
+    )
+
+
+@router.get("/inbox", response_model=SuccessDataPaginated[InboxRoomResponse])
+@catch_error
+@login_required()
+async def get_inbox_api(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+):
+    user = request.state.user
+    rooms, pagination = await chat_service.get_inbox(
+        user_id=str(user.id),
+        limit=limit,
+        after=after,
+        before=before,
+    )
+
+    return SuccessDataPaginated(
+        message="Inbox retrieved successfully",
+        data=PaginatedData(
+            meta=CursorPaginationMeta(**pagination),
+            docs=rooms,
+        ),
+    )
+
+
+@router.post("/rooms/{room_id}/read", response_model=SuccessData[RoomReadResponse])
+@catch_error
+@login_required()
+async def mark_room_read_api(
+    request: Request,
+    room_id: str,
+):
+    try:
+        user = request.state.user
+        read_at = await chat_service.mark_room_read(room_id, str(user.id))
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    return SuccessData(
+        message="Room marked as read",
+        data={"room_id": room_id, "read_at": read_at},
+    )
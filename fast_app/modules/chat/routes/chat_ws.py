@@ -1,43 +1,108 @@
+from typing import Any, Optional
+
 from beanie import PydanticObjectId
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
 
 from fast_app.core.ws_manager import WSManager
 from fast_app.defaults.chat_enums import (
+    WSErrorCode,
     WSIncomingEvent,
     WSOutgoingEvent,
 )
 from fast_app.modules.chat.services import chat_service
+from fast_app.utils.auth_utils import check_access
 
 router = APIRouter()
 
 
-@router.websocket("/chat/{user_id}")
+def valid_room_id(data: dict) -> Optional[str]:
+    room_id = data.get("room_id")
+    return room_id if isinstance(room_id, str) and PydanticObjectId.is_valid(room_id) else None
+
+
+async def emit_error(ws_manager: WSManager, user_id: str, code: WSErrorCode, message: Any):
+    await ws_manager.emit_user(
+        user_id,
+        {
+            "event": WSOutgoingEvent.ERROR,
+            "data": {"code": code, "message": str(message)},
+        },
+    )
+
+
+@router.websocket("/chat/{token}")
 async def chat_ws(
     websocket: WebSocket,
-    user_id: str,
+    token: str,
 ):
     ws_manager: WSManager = websocket.app.state.ws_manager
+
+    # the user is the token's owner, never an id sent by the client
+    try:
+        user = await check_access(token, ())
+    except Exception:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    user_id = str(user.id)
     await ws_manager.connect(user_id, websocket)
+
+    # set by each event branch, validated ones narrow it to str
+    room_id: Optional[str]
     try:
         while True:
-            payload = await websocket.receive_json()
+            try:
+                payload = await websocket.receive_json()
+            except ValueError:
+                await emit_error(ws_manager, user_id, WSErrorCode.VALIDATION_ERROR, "Invalid JSON payload")
+                continue
+
+            if not isinstance(payload, dict) or not isinstance(payload.get("data") or {}, dict):
+                await emit_error(ws_manager, user_id, WSErrorCode.VALIDATION_ERROR, "Invalid payload")
+                continue
+
             event = payload.get("event")
-            data = payload.get("data", {})
+            data = payload.get("data") or {}
 
             # ----------------------------------
             # SEND MESSAGE
             # ----------------------------------
             if event == WSIncomingEvent.SEND_MESSAGE:
-                receiver_id = data["receiver_user_id"]
-                content = data["content"]
+                receiver_id = data.get("receiver_user_id")
+                content = data.get("content")
+                if not isinstance(receiver_id, str) or not PydanticObjectId.is_valid(receiver_id) or not isinstance(content, str):
+                    await emit_error(ws_manager, user_id, WSErrorCode.VALIDATION_ERROR, "receiver_user_id and content are required")
+                    continue
+
+                try:
+                    room_obj_id, message = await chat_service.send_message(
+                        sender_id=user_id,
+                        receiver_id=receiver_id,
+                        content=content,
+                    )
+                except PermissionError as e:
+                    await emit_error(ws_manager, user_id, WSErrorCode.USER_BLOCKED, e)
+                    continue
+                except RuntimeError:
+                    # message writer stopped (shutting down)
+                    await emit_error(ws_manager, user_id, WSErrorCode.INTERNAL_ERROR, "Message could not be sent")
+                    continue
 
-                room, message = await chat_service.send_message(
-                    sender_id=user_id,
-                    receiver_id=receiver_id,
-                    content=content,
+                room_id = str(room_obj_id)
+
+                # ack to the sender once the message is stored
+                await ws_manager.emit_user(
+                    user_id,
+                    {
+                        "event": WSOutgoingEvent.MESSAGE_SENT,
+                        "data": {
+                            "client_message_id": data.get("client_message_id"),
+                            "room_id": room_id,
+                            "message_id": str(message.id),
+                            "created_at": message.created_at.isoformat(),
+                        },
+                    },
                 )
-                
-                room_id: str = str(room.id)
 
                 # join both users to room
                 await ws_manager.join_room(room_id, user_id)
@@ -57,5 +122,77 @@ async def chat_ws(
                     },
                 )
 
+            # ----------------------------------
+            # MESSAGE HISTORY
+            # ----------------------------------
+            if event == WSIncomingEvent.GET_MESSAGES:
+                room_id = valid_room_id(data)
+                if not room_id:
+                    await emit_error(ws_manager, user_id, WSErrorCode.VALIDATION_ERROR, "Invalid room id")
+                    continue
+
+                try:
+                    limit = max(min(int(data.get("limit", 30)), 100), 1)
+                except (TypeError, ValueError):
+                    await emit_error(ws_manager, user_id, WSErrorCode.VALIDATION_ERROR, "Invalid limit")
+                    continue
+
+                try:
+                    messages, pagination = await chat_service.get_room_messages(
+                        room_id=room_id,
+                        user_id=user_id,
+                        limit=limit,
+                        after=data.get("after"),
+                        before=data.get("before"),
+                    )
+                except PermissionError as e:
+                    await emit_error(ws_manager, user_id, WSErrorCode.NOT_ROOM_MEMBER, e)
+                    continue
+                except HTTPException as e:
+                    await emit_error(ws_manager, user_id, WSErrorCode.VALIDATION_ERROR, e.detail)
+                    continue
+
+                await ws_manager.emit_user(
+                    user_id,
+                    {
+                        "event": WSOutgoingEvent.MESSAGES,
+                        "data": {
+                            "room_id": room_id,
+                            "docs": messages,
+                            "meta": pagination,
+                        },
+                    },
+                )
+
+            # ----------------------------------
+            # READ RECEIPT
+            # ----------------------------------
+            if event == WSIncomingEvent.READ_MESSAGE:
+                room_id = valid_room_id(data)
+                if not room_id:
+                    await emit_error(ws_manager, user_id, WSErrorCode.VALIDATION_ERROR, "Invalid room id")
+                    continue
+
+                # only the authenticated user's own receipt, for a room they belong to
+                try:
+                    read_at = await chat_service.mark_room_read(room_id, user_id)
+                except PermissionError as e:
+                    await emit_error(ws_manager, user_id, WSErrorCode.NOT_ROOM_MEMBER, e)
+                    continue
+
+                await ws_manager.emit_room(
+                    room_id,
+                    {
+                        "event": WSOutgoingEvent.MESSAGE_READ,
+                        "data": {
+                            "room_id": room_id,
+                            "user_id": user_id,
+                            "read_at": read_at.isoformat(),
+                        },
+                    },
+                )
+
     except WebSocketDisconnect:
+        pass
+    finally:
         await ws_manager.disconnect(user_id, websocket)
@@ -1,5 +1,10 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
 from beanie import PydanticObjectId
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from fast_app.defaults.chat_enums import MessageType, RoomType
 
 
 class MessageSendSuccessResponse(BaseModel):
@@ -10,4 +15,44 @@ class MessageSendSuccessResponse(BaseModel):
     
 class SendMessagePayload(BaseModel):
     receiver_user_id: str
-    content: str
\ No newline at end of file
+    content: str
+
+
+class ChatMessageResponse(BaseModel):
+    id: str = Field(..., alias="_id")
+    room_id: str
+    sender_id: str
+    content: str
+    message_type: MessageType
+    created_at: datetime
+
+    class Config:
+        populate_by_name = True
+
+
+class LastMessageResponse(BaseModel):
+    message_id: str
+    sender_id: str
+    snippet: str
+    message_type: MessageType
+    created_at: datetime
+
+
+class InboxRoomResponse(BaseModel):
+    id: str = Field(..., alias="_id")
+    room_type: RoomType
+    members: List[str]
+    title: Optional[str] = None
+    last_message: Optional[LastMessageResponse] = None
+    unread_count: int = 0
+    # member id -> read watermark, messages created up to it were seen
+    read_at: Dict[str, datetime] = Field(default_factory=dict)
+    updated_at: datetime
+
+    class Config:
+        populate_by_name = True
+
+
+class RoomReadResponse(BaseModel):
+    room_id: str
+    read_at: datetime
@@ -1,14 +1,20 @@
-from typing import Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from uuid import uuid4
 from datetime import datetime
 from fastapi import HTTPException, status
 
 from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
 
+from fast_app.core import chat_cache
+from fast_app.core.recent_messages import recent_messages
 from fast_app.modules.chat.models.room_model import Room
 from fast_app.modules.chat.models.message_model import Message
 from fast_app.modules.chat.models.block_model import Block
+from fast_app.modules.chat.services.message_pipeline import message_writer
 from fast_app.defaults.chat_enums import RoomType
+from fast_app.utils.common_utils import stringify_object_ids
+from fast_app.utils.pagination_utils import encode_cursor
 
 
 # -------------------------------------------------
@@ -16,12 +22,20 @@ from fast_app.defaults.chat_enums import RoomType
 # -------------------------------------------------
 
 async def is_blocked(sender_id: PydanticObjectId, receiver_id: PydanticObjectId) -> bool:
+    cached: Optional[bool] = await chat_cache.get_cached_block(receiver_id, sender_id)
+    if cached is not None:
+        return cached
+
+    # block ids are stored as strings
     block = await Block.find_one(
-        Block.blocker_id == receiver_id,
-        Block.blocked_id == sender_id,
+        Block.blocker_id == str(receiver_id),
+        Block.blocked_id == str(sender_id),
         Block.is_active == True,
     )
-    return block is not None
+    blocked = block is not None
+
+    await chat_cache.cache_block(receiver_id, sender_id, blocked)
+    return blocked
 
 
 # -------------------------------------------------
@@ -32,11 +46,26 @@ async def find_direct_room(
     user_id: PydanticObjectId,
     receiver_id: PydanticObjectId,
 ) -> Optional[Room]:
-    return await Room.find_one(
+    pair_key = chat_cache.member_pair_key(user_id, receiver_id)
+
+    room = await Room.find_one(
+        Room.member_pair_key == pair_key,
+        Room.is_deleted == False,
+    )
+    if room:
+        return room
+
+    # rooms created before member_pair_key existed
+    room = await Room.find_one(
         Room.room_type == RoomType.DIRECT,
         Room.members == {"$all": [user_id, receiver_id]},
+        Room.member_pair_key == None,
         Room.is_deleted == False,
     )
+    if room:
+        await room.set({Room.member_pair_key: pair_key})
+
+    return room
 
 
 async def create_direct_room(
@@ -47,6 +76,7 @@ async def create_direct_room(
         room_type=RoomType.DIRECT,
         members=[user_id, receiver_id],
         admins=[user_id],
+        member_pair_key=chat_cache.member_pair_key(user_id, receiver_id),
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
     )
@@ -61,7 +91,34 @@ async def find_or_create_direct_room(
     room = await find_direct_room(user_id, receiver_id)
     if room:
         return room
-    return await create_direct_room(user_id, receiver_id)
+
+    try:
+        return await create_direct_room(user_id, receiver_id)
+    except DuplicateKeyError:
+        # the other member created it concurrently
+        room = await find_direct_room(user_id, receiver_id)
+        if not room:
+            raise
+        return room
+
+
+async def get_direct_room_id(
+    user_id: PydanticObjectId,
+    receiver_id: PydanticObjectId,
+) -> PydanticObjectId:
+    pair_key = chat_cache.member_pair_key(user_id, receiver_id)
+
+    cached = await chat_cache.get_cached_direct_room_id(pair_key)
+    if cached:
+        return PydanticObjectId(cached)
+
+    room = await find_or_create_direct_room(user_id, receiver_id)
+    if not room.id:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid room id")
+
+    room_id: PydanticObjectId = room.id
+    await chat_cache.cache_direct_room_id(pair_key, room_id)
+    return room_id
 
 
 # -------------------------------------------------
@@ -69,29 +126,217 @@ async def find_or_create_direct_room(
 # -------------------------------------------------
 
 async def create_message(
-    room: Room,
+    room_id: PydanticObjectId,
     sender_id: PydanticObjectId,
     content: str,
+    recipients: Optional[List[str]] = None,
 ) -> Message:
-    if not room.id:
-        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid room id")
-        
     message = Message(
-        room_id=room.id,
+        room_id=room_id,
         sender_id=sender_id,
         content=content,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
     )
 
-    await message.insert()
+    # batched with concurrent messages; the room's last message and the
+    # recipients' unread counters are bumped once per batch.
+    # Returns when the message is stored.
+    return await message_writer.submit(message, recipients)
 
-    room.last_message_id = message.id
-    room.updated_at = datetime.utcnow()
-    await room.save()
 
-    return message
 
+# -------------------------------------------------
+# HISTORY
+# -------------------------------------------------
+
+HISTORY_PROJECTION = {
+    "_id": 1,
+    "room_id": 1,
+    "sender_id": 1,
+    "content": 1,
+    "message_type": 1,
+    "created_at": 1,
+    "deleted_for": 1,
+}
+
+
+def _history_page(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # deleted_for is only needed for filtering, never sent to clients
+    page: List[Dict[str, Any]] = stringify_object_ids(
+        [{k: v for k, v in doc.items() if k != "deleted_for"} for doc in docs]
+    )
+    return page
+
+
+async def _first_page_from_buffer(
+    room: Room,
+    user_id: str,
+    limit: int,
+) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+    buffer = recent_messages.get(room.id, room.last_message_id)
+
+    if buffer is None:
+        docs, pagination = await Message.aggregate_with_cursor(
+            [{"$match": {"room_id": room.id, "is_deleted": False}}],
+            limit=recent_messages.size,
+            sort_field="created_at",
+            sort_dir=-1,
+            post_pipeline=[{"$project": HISTORY_PROJECTION}],
+        )
+        recent_messages.seed(room.id, docs, complete=not pagination["has_next_page"])
+        buffer = recent_messages.get(room.id, room.last_message_id)
+        if buffer is None:
+            # a message landed while loading, the db path handles it
+            return None
+
+    visible = [doc for doc in buffer.docs if user_id not in doc.get("deleted_for", [])]
+
+    has_next_page = len(visible) > limit
+    if not has_next_page and not buffer.complete:
+        # too many messages deleted for this user to fill the page
+        return None
+
+    docs = visible[:limit]
+    last = docs[-1] if docs else None
+
+    return docs, {
+        "total_docs": None,
+        "limit": limit,
+        "has_prev_page": False,
+        "has_next_page": has_next_page,
+        "prev_cursor": None,
+        "next_cursor": encode_cursor(last["created_at"], last["_id"]) if has_next_page and last else None,
+    }
+
+
+async def get_room_messages(
+    room_id: str,
+    user_id: str,
+    limit: int = 30,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Messages of a room, newest first. `after` pages to older messages,
+    `before` back to newer ones. The first page comes from the room's
+    in-memory buffer when it is current.
+    """
+    if not PydanticObjectId.is_valid(room_id):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid room id")
+
+    room = await Room.find_one(
+        Room.id == PydanticObjectId(room_id),
+        Room.members == PydanticObjectId(user_id),
+        Room.is_deleted == False,
+    )
+    if not room:
+        raise PermissionError("You are not a member of this room")
+
+    if not after and not before and limit <= recent_messages.size:
+        page = await _first_page_from_buffer(room, str(user_id), limit)
+        if page is not None:
+            docs, pagination = page
+            return _history_page(docs), pagination
+
+    # single range scan over (room_id, created_at, _id)
+    docs, pagination = await Message.aggregate_with_cursor(
+        [
+            {
+                "$match": {
+                    "room_id": room.id,
+                    "is_deleted": False,
+                    "deleted_for": {"$ne": str(user_id)},
+                }
+            }
+        ],
+        limit=limit,
+        sort_field="created_at",
+        sort_dir=-1,
+        after=after,
+        before=before,
+        post_pipeline=[{"$project": HISTORY_PROJECTION}],
+    )
+
+    return _history_page(docs), pagination
+
+
+# -------------------------------------------------
+# INBOX
+# -------------------------------------------------
+
+INBOX_PROJECTION = {
+    "_id": 1,
+    "room_type": 1,
+    "members": 1,
+    "title": 1,
+    "last_message": 1,
+    "read_at": 1,
+    "updated_at": 1,
+}
+
+
+async def get_inbox(
+    user_id: str,
+    limit: int = 20,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Rooms of a user, most recently active first, with the last message
+    snippet and the user's unread count stored on the room itself.
+
+    Pages are keyed on `updated_at`, which moves on every new message: a
+    room that gets a message while the client is paging jumps to the top
+    and can be skipped or repeated by the following pages. Clients are
+    expected to reload from the first page on `new_message` rather than
+    keep paging a stale listing.
+    """
+    user_id = str(user_id)
+
+    docs, pagination = await Room.aggregate_with_cursor(
+        [{"$match": {"members": PydanticObjectId(user_id), "is_deleted": False}}],
+        limit=limit,
+        sort_field="updated_at",
+        sort_dir=-1,
+        after=after,
+        before=before,
+        # only the caller's own counter leaves the db
+        post_pipeline=[{"$project": {**INBOX_PROJECTION, f"unread_counts.{user_id}": 1}}],
+    )
+
+    for doc in docs:
+        doc["unread_count"] = doc.pop("unread_counts", {}).get(user_id, 0)
+
+    return stringify_object_ids(docs), pagination
+
+
+async def mark_room_read(room_id: str, user_id: str) -> datetime:
+    """
+    Reset the user's unread counter and move their read watermark to now.
+
+    A constant size update of the room whatever its history: messages
+    created up to `read_at[user_id]` count as read by the user.
+    """
+    if not PydanticObjectId.is_valid(room_id):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid room id")
+
+    room_obj_id = PydanticObjectId(room_id)
+    user_id = str(user_id)
+    read_at = datetime.utcnow()
+
+    result = await Room.get_pymongo_collection().update_one(
+        {"_id": room_obj_id, "members": PydanticObjectId(user_id), "is_deleted": False},
+        {
+            "$set": {f"unread_counts.{user_id}": 0},
+            # never moves back when receipts from several workers race
+            "$max": {f"read_at.{user_id}": read_at},
+        },
+    )
+    if not result.matched_count:
+        raise PermissionError("You are not a member of this room")
+
+    return read_at
 
 
 # -------------------------------------------------
@@ -102,19 +347,20 @@ async def send_message(
     sender_id: str,
     receiver_id: str,
     content: str,
-) -> Tuple[Room, Message]:
+) -> Tuple[PydanticObjectId, Message]:
     sender_id_obj=PydanticObjectId(sender_id)
     receiver_id_obj=PydanticObjectId(receiver_id)
 
     if await is_blocked(sender_id_obj, receiver_id_obj):
         raise PermissionError("You are blocked by this user")
 
-    room = await find_or_create_direct_room(sender_id_obj, receiver_id_obj)
+    room_id = await get_direct_room_id(sender_id_obj, receiver_id_obj)
 
     message = await create_message(
-        room=room,
+        room_id=room_id,
         sender_id=sender_id_obj,
         content=content,
+        recipients=[str(receiver_id_obj)],
     )
 
-    return room, message
+    return room_id, message
@@ -0,0 +1,284 @@
+import asyncio
+from collections import Counter, defaultdict
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config import (
+    CHAT_WRITE_BATCH_SIZE,
+    CHAT_WRITE_FLUSH_MS,
+    CHAT_WRITE_QUEUE_SIZE,
+    WS_PUBSUB_BACKEND,
+)
+from fast_app.core.count_cache import count_cache
+from fast_app.core.recent_messages import recent_messages
+from fast_app.modules.chat.models.message_model import Message
+from fast_app.modules.chat.models.room_model import LAST_MESSAGE_SNIPPET_LENGTH, Room
+from fast_app.utils.logger import logger
+
+# message, members whose unread counter it bumps, completion future
+PendingMessage = Tuple[Message, List[str], asyncio.Future]
+
+
+def _fail(batch: List[PendingMessage], error: BaseException):
+    for _, _, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+class MessageWriter:
+    """
+    Group-commit writer for chat messages.
+
+    Messages submitted concurrently are persisted together with one
+    `insert_many`, followed by one bulk update that bumps each touched
+    room's last message and unread counters once per batch. `submit`
+    returns when the message's batch is written, so callers can
+    acknowledge the sender only once the message is durable.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = CHAT_WRITE_BATCH_SIZE,
+        flush_ms: int = CHAT_WRITE_FLUSH_MS,
+        queue_size: int = CHAT_WRITE_QUEUE_SIZE,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.queue_size = queue_size
+
+        self._queue: Optional[asyncio.Queue[Optional[PendingMessage]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # set from stop(): submits are rejected, a queue drained after the
+        # loop ended is remembered so late puts into it fail too
+        self._stopping = False
+        self._closed_queue: Optional[asyncio.Queue[Optional[PendingMessage]]] = None
+
+    # ----------------------------------
+    # LIFECYCLE
+    # ----------------------------------
+
+    async def start(self):
+        self._stopping = False
+        self._closed_queue = None
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._write_loop(self._queue))
+
+    async def stop(self):
+        queue, task = self._queue, self._task
+        if queue is None or task is None:
+            return
+
+        # new submits are rejected; the sentinel lets the loop write
+        # everything queued before it
+        self._stopping = True
+        self._queue, self._task = None, None
+        await queue.put(None)
+        await task
+
+        # submits that were blocked on a full queue landed behind the
+        # sentinel: nothing will write them
+        self._fail_queued(queue)
+        self._closed_queue = queue
+
+    @staticmethod
+    def _fail_queued(queue: "asyncio.Queue[Optional[PendingMessage]]"):
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                _fail([item], RuntimeError("Message writer stopped"))
+
+    # ----------------------------------
+    # SUBMIT
+    # ----------------------------------
+
+    async def submit(self, message: Message, recipients: Optional[List[str]] = None) -> Message:
+        """
+        Queue a message and wait until it is stored. `recipients` are the
+        room members whose unread counter the message increments.
+        """
+        if self._stopping:
+            raise RuntimeError("Message writer stopped")
+
+        if message.id is None:
+            message.id = PydanticObjectId()
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        queue = self._queue
+
+        if queue is None:
+            # writer never started (scripts): write straight away
+            await self._write([(message, list(recipients or []), future)])
+        else:
+            # waits when the queue is full (backpressure on senders)
+            await queue.put((message, list(recipients or []), future))
+            if queue is self._closed_queue:
+                # put after stop() drained it
+                self._fail_queued(queue)
+
+        await future
+        return message
+
+    # ----------------------------------
+    # WRITE
+    # ----------------------------------
+
+    async def _write_loop(self, queue: "asyncio.Queue[Optional[PendingMessage]]"):
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                break
+            batch = [item]
+
+            try:
+                # collect whatever else arrives within the flush window
+                deadline = asyncio.get_running_loop().time() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                await self._write(batch)
+
+            except asyncio.CancelledError:
+                _fail(batch, RuntimeError("Message writer stopped"))
+                self._fail_queued(queue)
+                raise
+            except Exception as e:
+                # never leave a sender waiting, the loop keeps going
+                logger.exception("Message batch write failed")
+                _fail(batch, e)
+
+    async def _write(self, batch: List[PendingMessage]):
+        failed: Dict[int, Exception] = {}
+
+        try:
+            await Message.insert_many([message for message, _, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = Exception(error.get("errmsg", "Message insert failed"))
+        except Exception as e:
+            logger.error(f"Message batch insert failed: {e}")
+            failed = {index: e for index in range(len(batch))}
+
+        written = [item for index, item in enumerate(batch) if index not in failed]
+
+        try:
+            await self._update_rooms(written)
+        except Exception as e:
+            # messages are stored, only the room summary lags behind
+            logger.error(f"Room last message update failed: {e}")
+
+        if written:
+            count_cache.invalidate(Message.get_collection_name())
+            try:
+                self._buffer_recent([message for message, _, _ in written])
+            except Exception as e:
+                # the buffer is only a read cache, reloaded from the db when stale
+                logger.error(f"Recent messages buffer update failed: {e}")
+
+        for index, (_, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            if index in failed:
+                future.set_exception(failed[index])
+            else:
+                future.set_result(None)
+
+    @staticmethod
+    def _buffer_recent(messages: List[Message]):
+        # with several workers a room's buffer can't know about messages
+        # written elsewhere; it is reloaded from the db instead
+        if WS_PUBSUB_BACKEND != "memory":
+            return
+
+        for message in sorted(messages, key=lambda m: (m.created_at, m.id)):
+            recent_messages.append(
+                message.room_id,
+                {
+                    "_id": message.id,
+                    "room_id": message.room_id,
+                    "sender_id": message.sender_id,
+                    "content": message.content,
+                    "message_type": message.message_type.value,
+                    # stored with millisecond precision, cursors must match the db
+                    "created_at": message.created_at.replace(
+                        microsecond=message.created_at.microsecond // 1000 * 1000
+                    ),
+                    "deleted_for": list(message.deleted_for),
+                },
+            )
+
+    @staticmethod
+    async def _update_rooms(items: List[PendingMessage]):
+        # newest message and unread increments per room, one round trip per batch
+        latest: Dict[PydanticObjectId, Message] = {}
+        unread: DefaultDict[PydanticObjectId, Counter] = defaultdict(Counter)
+
+        for message, recipients, _ in items:
+            current = latest.get(message.room_id)
+            if current is None or (message.created_at, message.id) > (current.created_at, current.id):
+                latest[message.room_id] = message
+            unread[message.room_id].update(recipients)
+
+        if not latest:
+            return
+
+        operations = []
+        for room_id, message in latest.items():
+            # $max keeps concurrent batches (other workers) from going back in time
+            update: Dict[str, Any] = {"$max": {"updated_at": message.created_at}}
+            if unread[room_id]:
+                update["$inc"] = {
+                    f"unread_counts.{member}": count
+                    for member, count in unread[room_id].items()
+                }
+            operations.append(UpdateOne({"_id": room_id}, update))
+
+            # last message id and inbox snippet, unless a newer message already
+            # replaced them. Ordered by (created_at, _id) like the batch above:
+            # ObjectIds of different workers are not ordered within a second
+            operations.append(
+                UpdateOne(
+                    {
+                        "_id": room_id,
+                        "$or": [
+                            {"last_message": None},
+                            {"last_message.created_at": {"$lt": message.created_at}},
+                            {
+                                "last_message.created_at": message.created_at,
+                                "last_message.message_id": {"$lte": message.id},
+                            },
+                        ],
+                    },
+                    {
+                        "$set": {
+                            "last_message_id": message.id,
+                            "last_message": {
+                                "message_id": message.id,
+                                "sender_id": message.sender_id,
+                                "snippet": message.content[:LAST_MESSAGE_SNIPPET_LENGTH],
+                                "message_type": message.message_type.value,
+                                "created_at": message.created_at,
+                            },
+                        }
+                    },
+                )
+            )
+
+        await Room.get_pymongo_collection().bulk_write(operations, ordered=False)
+
+
+message_writer = MessageWriter()
@@ -1,6 +1,19 @@
 from typing import Any, Dict, List, Optional, Tuple
 
-from beanie import Document
+from beanie import (
+    Delete,
+    Document,
+    Insert,
+    Replace,
+    Save,
+    SaveChanges,
+    Update,
+    after_event,
+)
+
+from fast_app.core.count_cache import count_cache
+from fast_app.defaults.common_enums import CountMode
+from fast_app.utils.pagination_utils import decode_cursor, encode_cursor, get_field_value
 
 
 class BaseDocument(Document):
@@ -10,6 +23,11 @@ class BaseDocument(Document):
         use_state_management = True
         use_revision = False
         abstract = True
+
+    @after_event(Insert, Replace, Save, SaveChanges, Update, Delete)
+    def invalidate_count_cache(self):
+        """Drop cached list totals of this collection after any write"""
+        count_cache.invalidate(self.get_collection_name())
     
     @classmethod
     async def aggregate_with_pagination(
@@ -29,18 +47,21 @@ class BaseDocument(Document):
         limit = max(limit, 1)
         skip = (page - 1) * limit
 
-        full_pipeline = pipeline + [
-            {
-                "$facet": {
-                    "metadata": [{"$count": "total_docs"}],
-                    "docs": [
-                        {"$sort": {sort_field: sort_dir}},
-                        {"$skip": skip},
-                        {"$limit": limit},
-                    ],
-                }
-            }
-        ]
+        collection_name = cls.get_collection_name()
+        cached_total = count_cache.get(collection_name, pipeline)
+
+        facet: Dict[str, Any] = {
+            "docs": [
+                {"$sort": {sort_field: sort_dir}},
+                {"$skip": skip},
+                {"$limit": limit},
+            ],
+        }
+        # the total only needs counting when it isn't cached yet
+        if cached_total is None:
+            facet["metadata"] = [{"$count": "total_docs"}]
+
+        full_pipeline = pipeline + [{"$facet": facet}]
 
         collection = cls.get_pymongo_collection()
         cursor = collection.aggregate(full_pipeline)
@@ -62,11 +83,15 @@ class BaseDocument(Document):
                 "next_page": None,
             }
 
-        facet = result[0]
-        docs = facet.get("docs", [])
-        metadata = facet.get("metadata", [])
+        docs = result[0].get("docs", [])
+        metadata = result[0].get("metadata", [])
+
+        if cached_total is not None:
+            total_docs = cached_total
+        else:
+            total_docs = metadata[0]["total_docs"] if metadata else 0
+            count_cache.set(collection_name, pipeline, total_docs)
 
-        total_docs = metadata[0]["total_docs"] if metadata else 0
         total_pages = (total_docs + limit - 1) // limit if total_docs else 0
 
         pagination = {
@@ -83,7 +108,115 @@ class BaseDocument(Document):
 
         return docs, pagination
 
-    
+    @classmethod
+    async def aggregate_with_cursor(
+        cls,
+        pipeline: List[Dict[str, Any]],
+        limit: int = 10,
+        sort_field: str = "created_at",
+        sort_dir: int = -1,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        count_mode: CountMode = CountMode.NONE,
+        post_pipeline: Optional[List[Dict[str, Any]]] = None,
+    ) -> Tuple[List[Dict], Dict[str, Any]]:
+        """
+        Execute aggregation with keyset (cursor) pagination.
+
+        Pages are addressed by opaque `after` / `before` tokens encoding the
+        sort key and `_id` of the boundary document, so every page is a
+        single range scan instead of a skip over the whole match set.
+
+        `pipeline` must only contain stages that filter the base collection
+        (the sort field has to exist on the stored document). Stages that
+        enrich each row ($lookup, $project, ...) go into `post_pipeline`
+        and run on the current page only.
+        """
+
+        limit = max(limit, 1)
+        cursor_token = before or after
+        query_dir = -sort_dir if before else sort_dir
+
+        stages = list(pipeline)
+
+        if cursor_token:
+            value, doc_id = decode_cursor(cursor_token)
+            op = "$gt" if query_dir == 1 else "$lt"
+
+            if sort_field == "_id":
+                stages.append({"$match": {"_id": {op: doc_id}}})
+            else:
+                stages.append(
+                    {
+                        "$match": {
+                            "$or": [
+                                {sort_field: {op: value}},
+                                {sort_field: value, "_id": {op: doc_id}},
+                            ]
+                        }
+                    }
+                )
+
+        sort_stage = {sort_field: query_dir}
+        if sort_field != "_id":
+            sort_stage["_id"] = query_dir
+
+        stages += [{"$sort": sort_stage}, {"$limit": limit + 1}]
+        stages += post_pipeline or []
+
+        collection = cls.get_pymongo_collection()
+        cursor = collection.aggregate(stages)
+        docs = await cursor.to_list(length=limit + 1)  # type: ignore
+
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+        if before:
+            docs.reverse()
+
+        has_next_page = True if before else has_more
+        has_prev_page = has_more if before else bool(after)
+
+        def _cursor(doc: Dict[str, Any]) -> str:
+            cursor: str = encode_cursor(get_field_value(doc, sort_field), doc.get("_id"))
+            return cursor
+
+        pagination = {
+            "total_docs": await cls._resolve_total_docs(pipeline, count_mode),
+            "limit": limit,
+            "has_prev_page": has_prev_page and bool(docs),
+            "has_next_page": has_next_page and bool(docs),
+            "prev_cursor": _cursor(docs[0]) if has_prev_page and docs else None,
+            "next_cursor": _cursor(docs[-1]) if has_next_page and docs else None,
+        }
+
+        return docs, pagination
+
+    @classmethod
+    async def _resolve_total_docs(
+        cls,
+        pipeline: List[Dict[str, Any]],
+        count_mode: CountMode,
+    ) -> Optional[int]:
+        """Total count for cursor pagination, depending on the count mode"""
+        collection = cls.get_pymongo_collection()
+
+        if count_mode == CountMode.ESTIMATE:
+            return await collection.estimated_document_count()  # type: ignore
+
+        if count_mode == CountMode.EXACT:
+            collection_name = cls.get_collection_name()
+            cached_total: Optional[int] = count_cache.get(collection_name, pipeline)
+            if cached_total is not None:
+                return cached_total
+
+            cursor = collection.aggregate(pipeline + [{"$count": "total_docs"}])
+            result = await cursor.to_list(length=1)  # type: ignore
+            total_docs = result[0]["total_docs"] if result else 0
+            count_cache.set(collection_name, pipeline, total_docs)
+            return total_docs
+
+        return None
+
     @classmethod
     async def aggregate_list(cls, pipeline: List[Dict[str, Any]]) -> List[Dict] | Any:
         """
@@ -28,8 +28,16 @@ class PaginationMeta(BaseModel):
     prev_page: Optional[int]
     next_page: Optional[int]
 
+class CursorPaginationMeta(BaseModel):
+    total_docs: Optional[int] = None
+    limit: int
+    has_prev_page: bool
+    has_next_page: bool
+    prev_cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+
 class PaginatedData(BaseModel, Generic[T]):
-    meta: PaginationMeta
+    meta: PaginationMeta | CursorPaginationMeta
     docs: List[T] | Dict
 
 
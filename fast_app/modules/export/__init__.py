@@ -0,0 +1,6 @@
+from fastapi import FastAPI
+
+from fast_app.modules.export.routes import export_api
+
+def register_routes(app: FastAPI):
+    app.include_router(export_api.router, tags=["Exports"], prefix="/api/v1")
@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from beanie import PydanticObjectId
+from pydantic import Field
+from pymongo import IndexModel
+
+from fast_app.defaults.common_enums import ExportFormat
+from fast_app.defaults.export_enums import ExportJobStatus, ExportType
+from fast_app.modules.common.models.base_model import BaseDocument
+
+
+class ExportJob(BaseDocument):
+    export_type: ExportType
+    export_format: ExportFormat = ExportFormat.XLSX
+
+    # exporter specific filters, as received by the submitting route
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+    requested_by: PydanticObjectId
+    status: ExportJobStatus = ExportJobStatus.PENDING
+
+    rows: int = 0
+    error: Optional[str] = None
+
+    # stored result
+    filename: Optional[str] = None
+    file_key: Optional[str] = None
+    file_size: Optional[int] = None
+    storage: Optional[str] = None
+
+    # worker running the job and until when, see core.job_lease
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "export_jobs"
+        indexes = [
+            IndexModel([("requested_by", 1), ("created_at", -1), ("_id", -1)]),
+            IndexModel([("status", 1), ("lease_expires_at", 1)]),
+        ]
@@ -0,0 +1,101 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from fast_app.decorators.authenticator import login_required
+from fast_app.decorators.catch_error import catch_error
+from fast_app.defaults.common_enums import UserRole
+from fast_app.defaults.export_enums import ExportJobStatus
+from fast_app.modules.common.schemas.response_schema import (
+    CursorPaginationMeta,
+    PaginatedData,
+    SuccessData,
+    SuccessDataPaginated,
+)
+from fast_app.modules.export.schemas.export_schema import ExportJobResponse
+from fast_app.modules.export.services import export_service
+from fast_app.utils.export_utils import EXPORT_MEDIA_TYPES
+from fast_app.utils.file_utils import parse_range_header, read_stored_file
+
+router = APIRouter(prefix="/exports")
+
+
+# -----------------------------------------------------
+# LIST JOBS
+# -----------------------------------------------------
+@router.get("/jobs", response_model=SuccessDataPaginated[ExportJobResponse])
+@catch_error
+@login_required(UserRole.ADMIN)
+async def list_export_jobs(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+):
+    jobs, pagination = await export_service.get_export_jobs(
+        requested_by=request.state.user.id,
+        limit=limit,
+        after=after,
+        before=before,
+    )
+
+    return SuccessDataPaginated(
+        message="Export jobs retrieved successfully",
+        data=PaginatedData(
+            meta=CursorPaginationMeta(**pagination),
+            docs=jobs,
+        ),
+    )
+
+
+# -----------------------------------------------------
+# JOB STATUS
+# -----------------------------------------------------
+@router.get("/jobs/{job_id}", response_model=SuccessData[ExportJobResponse])
+@catch_error
+@login_required(UserRole.ADMIN)
+async def get_export_job(request: Request, job_id: str):
+    job = await export_service.get_export_job(job_id, request.state.user.id)
+
+    return SuccessData(
+        message="Export job retrieved successfully",
+        data=job.model_dump(by_alias=True, mode="json"),
+    )
+
+
+# -----------------------------------------------------
+# DOWNLOAD RESULT (supports Range)
+# -----------------------------------------------------
+@router.get("/jobs/{job_id}/download", response_class=StreamingResponse)
+@catch_error
+@login_required(UserRole.ADMIN)
+async def download_export(request: Request, job_id: str):
+    job = await export_service.get_export_job(job_id, request.state.user.id)
+
+    if job.status != ExportJobStatus.COMPLETED or not job.file_key or job.file_size is None:
+        raise HTTPException(status.HTTP_409_CONFLICT, "Export is not ready yet")
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{job.filename}"',
+    }
+
+    byte_range = parse_range_header(request.headers.get("range"), job.file_size)
+
+    if byte_range is None:
+        start, end = 0, job.file_size - 1
+        status_code = status.HTTP_200_OK
+    else:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{job.file_size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        read_stored_file(job.file_key, start, end, storage=job.storage or "local"),
+        status_code=status_code,
+        media_type=EXPORT_MEDIA_TYPES[job.export_format],
+        headers=headers,
+    )
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from fast_app.defaults.common_enums import ExportFormat
+from fast_app.defaults.export_enums import ExportJobStatus, ExportType
+
+
+class ExportJobResponse(BaseModel):
+    id: str = Field(..., alias="_id")
+    export_type: ExportType
+    export_format: ExportFormat
+    status: ExportJobStatus
+
+    rows: int = 0
+    error: Optional[str] = None
+
+    filename: Optional[str] = None
+    file_size: Optional[int] = None
+
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,272 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from beanie import PydanticObjectId
+from fastapi import HTTPException, UploadFile, status
+from starlette.datastructures import Headers
+
+from config import BUCKET, EXPORT_JOB_LEASE_SECONDS, EXPORT_PROCESS_WORKERS
+from fast_app.core.job_lease import JobLease
+from fast_app.defaults.common_enums import ExportFormat
+from fast_app.defaults.export_enums import ExportJobStatus, ExportType
+from fast_app.modules.export.models.export_job_model import ExportJob
+from fast_app.modules.export.services.export_worker import (
+    EXPORTERS,
+    build_export_file,
+    init_export_worker,
+)
+from fast_app.utils.common_utils import stringify_object_ids
+from fast_app.utils.export_utils import EXPORT_MEDIA_TYPES
+from fast_app.utils.file_utils import upload_files
+from fast_app.utils.logger import logger
+
+
+# -------------------------------------------------
+# PROCESS POOL
+# -------------------------------------------------
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+# keeps running job tasks referenced until they finish
+_tasks: Set[asyncio.Task] = set()
+# jobs with a task on this worker
+_scheduled: Set[Any] = set()
+
+_recover_task: Optional[asyncio.Task] = None
+
+
+def get_export_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: never fork a process holding a running event loop / db client
+        _pool = ProcessPoolExecutor(
+            max_workers=EXPORT_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_export_worker,
+        )
+    return _pool
+
+
+def _lease() -> JobLease:
+    return JobLease(
+        ExportJob.get_pymongo_collection(),
+        pending=ExportJobStatus.PENDING.value,
+        running=ExportJobStatus.RUNNING.value,
+        duration=EXPORT_JOB_LEASE_SECONDS,
+    )
+
+
+async def recover_export_jobs() -> int:
+    """
+    Schedule the jobs waiting for a worker: queued ones, and running ones
+    whose worker stopped renewing their lease (crash, kill)
+    """
+    recovered = 0
+    for doc in await _lease().find_claimable():
+        if doc["_id"] not in _scheduled:
+            _schedule(doc["_id"])
+            recovered += 1
+    return recovered
+
+
+async def _recover_loop():
+    while True:
+        try:
+            await recover_export_jobs()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Export job recovery failed: {e}")
+
+        await asyncio.sleep(EXPORT_JOB_LEASE_SECONDS)
+
+
+async def start_export_jobs():
+    """Pick up queued / abandoned jobs now and whenever a lease expires"""
+    global _recover_task
+    _recover_task = asyncio.create_task(_recover_loop())
+
+
+async def stop_export_jobs():
+    global _pool, _recover_task
+
+    if _recover_task is not None:
+        _recover_task.cancel()
+        try:
+            await _recover_task
+        except asyncio.CancelledError:
+            pass
+        _recover_task = None
+
+    for task in list(_tasks):
+        task.cancel()
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
+
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _schedule(job_id: Any):
+    task = asyncio.create_task(run_export_job(job_id))
+    _tasks.add(task)
+    _scheduled.add(job_id)
+
+    def done(task: asyncio.Task):
+        _tasks.discard(task)
+        _scheduled.discard(job_id)
+
+    task.add_done_callback(done)
+
+
+# -------------------------------------------------
+# JOBS
+# -------------------------------------------------
+
+async def submit_export_job(
+    export_type: ExportType,
+    export_format: ExportFormat,
+    params: Dict[str, Any],
+    requested_by: PydanticObjectId,
+) -> ExportJob:
+    job = ExportJob(
+        export_type=export_type,
+        export_format=export_format,
+        params=params,
+        requested_by=requested_by,
+    )
+    await job.insert()
+
+    _schedule(job.id)
+    return job
+
+
+async def run_export_job(job_id: Any):
+    lease = _lease()
+
+    # atomic claim: only one API worker runs a given job
+    claimed = await lease.claim(job_id, {"started_at": datetime.utcnow()})
+    if not claimed:
+        return
+
+    job = ExportJob.model_validate(claimed)
+    exporter = EXPORTERS[job.export_type]
+    filename = f"{exporter.filename}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{job.export_format.value}"
+
+    fd, out_path = tempfile.mkstemp(suffix=f".{job.export_format.value}")
+    os.close(fd)
+    build: Optional[Future] = None
+
+    heartbeat = asyncio.create_task(lease.keep(job_id, asyncio.current_task()))
+
+    try:
+        build = get_export_pool().submit(
+            build_export_file,
+            job.export_type.value,
+            job.export_format.value,
+            job.params,
+            out_path,
+        )
+        rows = await asyncio.wrap_future(build)
+
+        with open(out_path, "rb") as f:
+            uploaded = await upload_files(
+                [
+                    UploadFile(
+                        file=f,
+                        filename=filename,
+                        headers=Headers({"content-type": EXPORT_MEDIA_TYPES[job.export_format]}),
+                    )
+                ],
+                dir="exports",
+                validate=False,
+                private=True,
+            )
+
+        stored = uploaded[0]
+        released = await lease.release(job_id, {
+            "status": ExportJobStatus.COMPLETED.value,
+            "rows": rows,
+            "filename": filename,
+            "file_key": stored.get("file_key") or stored.get("s3_key"),
+            "file_size": stored.get("size"),
+            "storage": BUCKET,
+            "finished_at": datetime.utcnow(),
+        })
+        if released:
+            logger.info(f"Export job {job_id} completed with {rows} rows")
+        else:
+            logger.warning(f"Export job {job_id} was taken over by another worker, result dropped")
+
+    except asyncio.CancelledError:
+        # shutting down (or lease lost): let another worker pick it up again
+        await lease.release(job_id, {"status": ExportJobStatus.PENDING.value})
+        raise
+
+    except Exception as e:
+        logger.error(f"Export job {job_id} failed: {e}")
+        await lease.release(job_id, {
+            "status": ExportJobStatus.FAILED.value,
+            "error": getattr(e, "detail", None) or str(e) or e.__class__.__name__,
+            "finished_at": datetime.utcnow(),
+        })
+
+    finally:
+        heartbeat.cancel()
+        if build is not None and not build.cancel() and not build.done():
+            # the pool process is still writing the file, drop it once it is done
+            build.add_done_callback(lambda _: _remove_file(out_path))
+        else:
+            _remove_file(out_path)
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# -------------------------------------------------
+# QUERIES
+# -------------------------------------------------
+
+JOB_PROJECTION = {"params": 0, "file_key": 0, "storage": 0}
+
+
+async def get_export_jobs(
+    requested_by: PydanticObjectId,
+    limit: int = 20,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    docs, pagination = await ExportJob.aggregate_with_cursor(
+        [{"$match": {"requested_by": requested_by}}],
+        limit=limit,
+        sort_field="created_at",
+        sort_dir=-1,
+        after=after,
+        before=before,
+        post_pipeline=[{"$project": JOB_PROJECTION}],
+    )
+    return stringify_object_ids(docs), pagination
+
+
+async def get_export_job(job_id: str, requested_by: PydanticObjectId) -> ExportJob:
+    if not PydanticObjectId.is_valid(job_id):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid job id")
+
+    job = await ExportJob.find_one(
+        ExportJob.id == PydanticObjectId(job_id),
+        ExportJob.requested_by == requested_by,
+    )
+    if not job:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Export job not found")
+
+    return job
@@ -0,0 +1,112 @@
+"""
+Export building, run inside the export process pool.
+
+Each pool process keeps its own event loop and database connection
+(created by `init_export_worker`), so encoding large spreadsheets never
+runs on the API workers' event loop.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fast_app.defaults.common_enums import ExportFormat, UserRole
+from fast_app.defaults.export_enums import ExportType
+from fast_app.utils.export_utils import RowBatches, stream_export
+
+
+class Exporter(NamedTuple):
+    filename: str
+    get_sheet: Callable[[Dict[str, Any]], Tuple[str, List[str]]]
+    iter_rows: Callable[[Dict[str, Any]], RowBatches]
+
+
+# ----------------------------------
+# EXPORTERS
+# ----------------------------------
+
+def _user_sheet(params: Dict[str, Any]) -> Tuple[str, List[str]]:
+    from fast_app.modules.user.services import user_service
+
+    role = params.get("role")
+    sheet: Tuple[str, List[str]] = user_service.get_export_sheet(UserRole(role) if role else None)
+    return sheet
+
+
+def _user_rows(params: Dict[str, Any]) -> RowBatches:
+    from fast_app.modules.user.services import user_service
+
+    return user_service.iter_export_users(
+        search=params.get("search"),
+        sort=params.get("sort"),
+        filters=user_service.build_export_filters(
+            params.get("status"),
+            params.get("role"),
+            params.get("reg_from"),
+            params.get("reg_to"),
+        ),
+    )
+
+
+# register new export types here
+EXPORTERS: Dict[ExportType, Exporter] = {
+    ExportType.USERS: Exporter("users_export", _user_sheet, _user_rows),
+}
+
+
+# ----------------------------------
+# POOL PROCESS
+# ----------------------------------
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def init_export_worker():
+    """Process pool initializer: one event loop + db connection per process"""
+    global _loop
+    from fast_app.db.mongodb import MongoDB
+
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    _loop.run_until_complete(MongoDB.connect())
+
+
+async def write_export(
+    export_type: ExportType,
+    export_format: ExportFormat,
+    params: Dict[str, Any],
+    out_path: str,
+) -> int:
+    """Write the export to `out_path` and return the number of rows"""
+    exporter = EXPORTERS[export_type]
+    sheet_title, header = exporter.get_sheet(params)
+
+    rows = 0
+
+    async def counted(batches: RowBatches) -> AsyncIterator[List[List[Any]]]:
+        nonlocal rows
+        async for batch in batches:
+            rows += len(batch)
+            yield batch
+
+    chunks = stream_export(export_format, sheet_title, header, counted(exporter.iter_rows(params)))
+
+    with open(out_path, "wb") as f:
+        async for chunk in chunks:
+            f.write(chunk)
+
+    return rows
+
+
+def build_export_file(
+    export_type: str,
+    export_format: str,
+    params: Dict[str, Any],
+    out_path: str,
+) -> int:
+    """Entry point submitted to the process pool"""
+    if _loop is None:
+        init_export_worker()
+    assert _loop is not None
+
+    return _loop.run_until_complete(
+        write_export(ExportType(export_type), ExportFormat(export_format), params, out_path)
+    )
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import Field
+from pymongo import IndexModel
+
+from fast_app.modules.common.models.base_model import BaseDocument
+
+
+class StoredFile(BaseDocument):
+    """
+    One content addressed upload (see file_utils.dedup_upload).
+
+    Identical uploads share the stored object, `ref_count` tracks how many
+    uploads point at it so unreferenced objects can be purged.
+    """
+
+    file_key: str
+    content_hash: str
+    content_type: Optional[str] = None
+    size: int = 0
+    storage: str
+
+    ref_count: int = 0
+
+    # the object is written out (an upload that finds it False writes it)
+    committed: bool = True
+    # a purge is deleting the object
+    purging: bool = False
+
+    # image variants stored next to the object, {size: path} as returned
+    # by upload_files; reused by later uploads of the same content
+    variants: Dict[str, str] = Field(default_factory=dict)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "stored_files"
+        indexes = [
+            IndexModel([("file_key", 1)], unique=True),
+            # purge: unreferenced objects, oldest first
+            IndexModel([("ref_count", 1), ("updated_at", 1)]),
+        ]
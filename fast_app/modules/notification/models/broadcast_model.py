@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from beanie import PydanticObjectId
+from pydantic import Field
+from pymongo import IndexModel
+
+from fast_app.defaults.notification_enums import (
+    BroadcastStatus,
+    NotificationReceiverType,
+    NotificationType,
+)
+from fast_app.modules.common.models.base_model import BaseDocument
+
+
+class NotificationBroadcast(BaseDocument):
+    """
+    One notification fanned out to an audience (receiver_type + city).
+
+    Every created Notification shares this broadcast's `unit`. Recipients
+    are processed in `_id` order and `last_user_id` checkpoints progress,
+    so an interrupted broadcast resumes where it stopped.
+    """
+
+    sender_id: Optional[PydanticObjectId] = None
+
+    title: str
+    message: str
+    data: Optional[Dict[str, Any]] = None
+    type: NotificationType
+
+    receiver_type: NotificationReceiverType
+    city: Optional[str] = None
+    scheduled_time: Optional[datetime] = None
+
+    unit: str
+
+    status: BroadcastStatus = BroadcastStatus.PENDING
+    error: Optional[str] = None
+
+    # progress
+    last_user_id: Optional[PydanticObjectId] = None
+    recipients: int = 0
+    push_sent: int = 0
+    push_failed: int = 0
+    push_pruned: int = 0
+
+    # worker running the broadcast and until when, see core.job_lease
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "notification_broadcasts"
+        indexes = [
+            IndexModel([("created_at", -1), ("_id", -1)]),
+            IndexModel([("status", 1), ("lease_expires_at", 1)]),
+        ]
@@ -69,6 +69,15 @@ class Notification(BaseDocument):
 
             # Grouping key
             IndexModel([("unit", 1)]),
+
+            # One notification per recipient of a broadcast (idempotent fan-out)
+            IndexModel([("unit", 1), ("receiver_id", 1)], unique=True),
+
+            # Unread badge count (covering)
+            IndexModel([("receiver_id", 1), ("is_read", 1), ("is_deleted", 1)]),
+
+            # Scheduler poll: pending pushes by due time
+            IndexModel([("is_push_send", 1), ("scheduled_time", 1)]),
         ]
 
     # --------------------------------------------------
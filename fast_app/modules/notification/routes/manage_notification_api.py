@@ -5,11 +5,13 @@ from fast_app.core.router_context import RouterContext
 from fast_app.decorators.authenticator import login_required
 from fast_app.decorators.permission_decorator import action_type
 from fast_app.defaults.permission_enums import Action, Resource
-from fast_app.modules.notification.services import notification_service
+from fast_app.modules.notification.services import broadcast_service, notification_service, push_service
 from fast_app.decorators.catch_error import catch_error
-from fast_app.defaults.common_enums import StatusEnum, UserRole
+from fast_app.defaults.common_enums import CountMode, PaginationType, StatusEnum, UserRole
 
 from fast_app.modules.notification.schemas.notification_schema import (
+    BroadcastCreate,
+    BroadcastResponse,
     NotificationCreate,
     NotificationResponseWithReceiver,
     NotificationUpdate,
@@ -17,6 +19,7 @@ from fast_app.modules.notification.schemas.notification_schema import (
 )
 
 from fast_app.modules.common.schemas.response_schema import (
+    CursorPaginationMeta,
     PaginatedData,
     PaginationMeta,
     SuccessResponse,
@@ -39,6 +42,10 @@ async def list_notifications(
     search: Optional[str] = Query(None),
     sort: Optional[str] = Query(None),
     status_filter: Optional[StatusEnum] = Query(None),
+    pagination_type: PaginationType = Query(PaginationType.OFFSET),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+    count_mode: CountMode = Query(CountMode.NONE),
 ):
     filters = {}
     if status_filter:
@@ -50,18 +57,85 @@ async def list_notifications(
         search=search,
         sort=sort,
         filters=filters,
+        pagination_type=pagination_type,
+        after=after,
+        before=before,
+        count_mode=count_mode,
     )
 
     return SuccessDataPaginated(
         message="Notifications retrieved successfully",
         data=PaginatedData(
-            meta=PaginationMeta(**pagination),
+            meta=(
+                CursorPaginationMeta(**pagination)
+                if pagination_type == PaginationType.CURSOR
+                else PaginationMeta(**pagination)
+            ),
             docs=notifications,
         ),
     )
 
 
 
+@router.post("/broadcasts", response_model=SuccessData[BroadcastResponse], status_code=status.HTTP_202_ACCEPTED)
+@catch_error
+@login_required(UserRole.ADMIN)
+@action_type(Action.CREATE)
+async def create_broadcast(request: Request, broadcast_data: BroadcastCreate):
+
+    broadcast = await broadcast_service.create_broadcast(broadcast_data, request.state.user.id)
+    return SuccessData(
+        message="Broadcast started",
+        data=broadcast.model_dump(by_alias=True, mode="json"),
+    )
+
+
+@router.get("/broadcasts", response_model=SuccessDataPaginated[BroadcastResponse])
+@catch_error
+@login_required(UserRole.ADMIN)
+@action_type(Action.READ)
+async def list_broadcasts(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+):
+    broadcasts, pagination = await broadcast_service.get_broadcasts(limit=limit, after=after, before=before)
+
+    return SuccessDataPaginated(
+        message="Broadcasts retrieved successfully",
+        data=PaginatedData(
+            meta=CursorPaginationMeta(**pagination),
+            docs=broadcasts,
+        ),
+    )
+
+
+@router.get("/broadcasts/{broadcast_id}", response_model=SuccessData[BroadcastResponse])
+@catch_error
+@login_required(UserRole.ADMIN)
+@action_type(Action.READ)
+async def get_broadcast(request: Request, broadcast_id: str):
+
+    broadcast = await broadcast_service.get_broadcast(broadcast_id)
+    return SuccessData(
+        message="Broadcast retrieved successfully",
+        data=broadcast.model_dump(by_alias=True, mode="json"),
+    )
+
+
+@router.get("/push/metrics", response_model=SuccessData[dict])
+@catch_error
+@login_required(UserRole.ADMIN)
+@action_type(Action.READ)
+async def get_push_metrics(request: Request):
+
+    return SuccessData(
+        message="Push metrics retrieved successfully",
+        data=push_service.get_push_metrics(),
+    )
+
+
 @router.get("/{notification_id}", response_model=SuccessData[dict])
 @catch_error
 @login_required(UserRole.ADMIN)
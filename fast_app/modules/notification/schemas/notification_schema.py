@@ -3,7 +3,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-from fast_app.defaults.notification_enums import NotificationReceiverType, NotificationType
+from fast_app.defaults.notification_enums import BroadcastStatus, NotificationReceiverType, NotificationType
 
 
 # --------------------------------------------------
@@ -111,3 +111,46 @@ class NotificationResponseWithReceiver(BaseModel):
     class Config:
         populate_by_name = True
         from_attributes = True
+
+
+# --------------------------------------------------
+# Broadcast (audience fan-out)
+# --------------------------------------------------
+
+class BroadcastCreate(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    message: str = Field(..., min_length=1, max_length=1000)
+
+    data: Optional[Dict[str, Any]] = None
+
+    type: NotificationType
+    receiver_type: NotificationReceiverType = NotificationReceiverType.ALL_USERS
+    city: Optional[str] = None
+
+    scheduled_time: Optional[datetime] = None
+
+
+class BroadcastResponse(BaseModel):
+    id: str = Field(..., alias="_id")
+    title: str
+    message: str
+    type: NotificationType
+    receiver_type: NotificationReceiverType
+    city: Optional[str] = None
+    scheduled_time: Optional[datetime] = None
+    unit: str
+
+    status: BroadcastStatus
+    error: Optional[str] = None
+
+    recipients: int = 0
+    push_sent: int = 0
+    push_failed: int = 0
+    push_pruned: int = 0
+
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,361 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from beanie import PydanticObjectId
+from fastapi import HTTPException, status
+from pymongo.errors import BulkWriteError
+
+from config import NOTIFICATION_BROADCAST_BATCH_SIZE, NOTIFICATION_BROADCAST_LEASE_SECONDS
+from fast_app.core.count_cache import count_cache
+from fast_app.core.job_lease import JobLease
+from fast_app.core.notification_cache import invalidate_unread_count
+from fast_app.defaults.common_enums import StatusEnum, UserRole
+from fast_app.defaults.notification_enums import BroadcastStatus, NotificationReceiverType
+from fast_app.modules.notification.models.broadcast_model import NotificationBroadcast
+from fast_app.modules.notification.models.notification_model import Notification
+from fast_app.modules.notification.schemas.notification_schema import BroadcastCreate
+from fast_app.modules.notification.services import push_service
+from fast_app.modules.user.models.user_device_model import UserDevice
+from fast_app.modules.user.models.user_model import User
+from fast_app.utils.common_utils import naive_utc, stringify_object_ids
+from fast_app.utils.logger import logger
+
+AUDIENCE_ROLES = {
+    NotificationReceiverType.ALL_USERS: [UserRole.END_USER, UserRole.VENDOR],
+    NotificationReceiverType.ONLY_PROVIDER: [UserRole.VENDOR],
+    NotificationReceiverType.ONLY_CLIENT: [UserRole.END_USER],
+}
+
+DUPLICATE_KEY_ERROR = 11000
+
+# keeps running broadcast tasks referenced until they finish
+_tasks: Set[asyncio.Task] = set()
+# broadcasts with a task on this worker
+_scheduled: Set[Any] = set()
+
+_recover_task: Optional[asyncio.Task] = None
+
+
+# -----------------------------------------------------
+# LIFECYCLE
+# -----------------------------------------------------
+def _lease() -> JobLease:
+    return JobLease(
+        NotificationBroadcast.get_pymongo_collection(),
+        pending=BroadcastStatus.PENDING.value,
+        running=BroadcastStatus.RUNNING.value,
+        duration=NOTIFICATION_BROADCAST_LEASE_SECONDS,
+    )
+
+
+async def recover_broadcasts() -> int:
+    """
+    Schedule the broadcasts waiting for a worker: queued ones, and running
+    ones whose worker stopped renewing their lease (they resume from
+    their checkpoint)
+    """
+    recovered = 0
+    for doc in await _lease().find_claimable({"_id": 1, "scheduled_time": 1}):
+        if doc["_id"] not in _scheduled:
+            _schedule(doc["_id"], doc.get("scheduled_time"))
+            recovered += 1
+    return recovered
+
+
+async def _recover_loop():
+    while True:
+        try:
+            await recover_broadcasts()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Notification broadcast recovery failed: {e}")
+
+        await asyncio.sleep(NOTIFICATION_BROADCAST_LEASE_SECONDS)
+
+
+async def start_broadcasts():
+    """Pick up queued / abandoned broadcasts now and whenever a lease expires"""
+    global _recover_task
+    _recover_task = asyncio.create_task(_recover_loop())
+
+
+async def stop_broadcasts():
+    global _recover_task
+
+    if _recover_task is not None:
+        _recover_task.cancel()
+        try:
+            await _recover_task
+        except asyncio.CancelledError:
+            pass
+        _recover_task = None
+
+    for task in list(_tasks):
+        task.cancel()
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
+
+
+def _schedule(broadcast_id: Any, scheduled_time: Optional[datetime] = None):
+    task = asyncio.create_task(_run_when_due(broadcast_id, scheduled_time))
+    _tasks.add(task)
+    _scheduled.add(broadcast_id)
+
+    def done(task: asyncio.Task):
+        _tasks.discard(task)
+        _scheduled.discard(broadcast_id)
+
+    task.add_done_callback(done)
+
+
+async def _run_when_due(broadcast_id: Any, scheduled_time: Optional[datetime]):
+    try:
+        if scheduled_time:
+            delay = (naive_utc(scheduled_time) - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await run_broadcast(broadcast_id)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # left PENDING, retried by the next recovery pass
+        logger.error(f"Notification broadcast {broadcast_id} could not be run: {e}")
+
+
+# -----------------------------------------------------
+# CREATE
+# -----------------------------------------------------
+async def create_broadcast(data: BroadcastCreate, sender_id: Optional[PydanticObjectId]) -> NotificationBroadcast:
+    broadcast = NotificationBroadcast(
+        sender_id=sender_id,
+        title=data.title,
+        message=data.message,
+        data=data.data,
+        type=data.type,
+        receiver_type=data.receiver_type,
+        city=data.city.strip() if data.city else None,
+        # stored and compared as naive UTC, like every other datetime
+        scheduled_time=naive_utc(data.scheduled_time) if data.scheduled_time else None,
+        unit=str(uuid.uuid4()),
+    )
+    await broadcast.insert()
+
+    _schedule(broadcast.id, broadcast.scheduled_time)
+    return broadcast
+
+
+# -----------------------------------------------------
+# AUDIENCE
+# -----------------------------------------------------
+async def iter_audience(
+    receiver_type: NotificationReceiverType,
+    city: Optional[str] = None,
+    after: Optional[PydanticObjectId] = None,
+    batch_size: int = NOTIFICATION_BROADCAST_BATCH_SIZE,
+) -> AsyncIterator[List[PydanticObjectId]]:
+    """
+    Stream the recipients' user ids in `_id` order, in batches, straight
+    from a db cursor.
+
+    Users carry no location, a city audience is the users with a live
+    device seen in that city.
+    """
+    roles = [role.value for role in AUDIENCE_ROLES[receiver_type]]
+    user_match: Dict[str, Any] = {
+        "role": {"$in": roles},
+        "is_deleted": False,
+        "status": StatusEnum.ACTIVE.value,
+    }
+
+    if city:
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": {
+                "role": {"$in": roles},
+                "city": city,
+                "is_deleted": False,
+                "expired": False,
+            }},
+            {"$group": {"_id": "$user_id"}},
+        ]
+        if after:
+            pipeline.append({"$match": {"_id": {"$gt": after}}})
+        pipeline.append({"$sort": {"_id": 1}})
+
+        cursor = UserDevice.get_pymongo_collection().aggregate(
+            pipeline,
+            allowDiskUse=True,
+            batchSize=batch_size,
+        )
+    else:
+        if after:
+            user_match["_id"] = {"$gt": after}
+        cursor = User.get_pymongo_collection().find(
+            user_match,
+            {"_id": 1},
+            sort=[("_id", 1)],
+            batch_size=batch_size,
+        )
+
+    async def active(ids: List[PydanticObjectId]) -> List[PydanticObjectId]:
+        if not city:
+            return ids
+        rows = await User.get_pymongo_collection().find(
+            {"_id": {"$in": ids}, **user_match},
+            {"_id": 1},
+            sort=[("_id", 1)],
+        ).to_list(None)
+        return [row["_id"] for row in rows]
+
+    ids: List[PydanticObjectId] = []
+    async for doc in cursor:
+        ids.append(doc["_id"])
+        if len(ids) >= batch_size:
+            yield await active(ids)
+            ids = []
+
+    if ids:
+        yield await active(ids)
+
+
+# -----------------------------------------------------
+# FAN-OUT
+# -----------------------------------------------------
+async def _insert_notifications(broadcast: NotificationBroadcast, user_ids: List[PydanticObjectId]):
+    now = datetime.utcnow()
+    docs = [
+        {
+            "sender_id": broadcast.sender_id,
+            "receiver_id": user_id,
+            "title": broadcast.title,
+            "message": broadcast.message,
+            "data": broadcast.data,
+            "type": broadcast.type.value,
+            "receiver_type": broadcast.receiver_type.value,
+            "city": broadcast.city,
+            "is_deleted": False,
+            "is_read": False,
+            "is_push_send": False,
+            # the broadcast itself carries the schedule, keeps these rows
+            # out of the notification scheduler
+            "scheduled_time": None,
+            "unit": broadcast.unit,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for user_id in user_ids
+    ]
+
+    try:
+        await Notification.get_pymongo_collection().insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        # (unit, receiver_id) is unique: rows of a batch re-run after a
+        # restart already exist
+        if any(err.get("code") != DUPLICATE_KEY_ERROR for err in e.details.get("writeErrors", [])):
+            raise
+
+    # raw collection writes bypass the document event hooks
+    count_cache.invalidate(Notification.get_collection_name())
+
+    # a re-run batch may hold rows inserted before, recount rather than +1
+    await invalidate_unread_count(*user_ids)
+
+
+async def run_broadcast(broadcast_id: Any):
+    lease = _lease()
+
+    # atomic claim: only one API worker runs a given broadcast
+    claimed = await lease.claim(broadcast_id, {"started_at": datetime.utcnow()})
+    if not claimed:
+        return
+
+    broadcast = NotificationBroadcast.model_validate(claimed)
+    heartbeat = asyncio.create_task(lease.keep(broadcast_id, asyncio.current_task()))
+
+    try:
+        async for user_ids in iter_audience(broadcast.receiver_type, broadcast.city, broadcast.last_user_id):
+            if user_ids:
+                await _insert_notifications(broadcast, user_ids)
+
+                report = await push_service.push_to_users(
+                    user_ids,
+                    broadcast.title,
+                    broadcast.message,
+                    {**(broadcast.data or {}), "unit": broadcast.unit},
+                )
+                await Notification.get_pymongo_collection().update_many(
+                    {"unit": broadcast.unit, "receiver_id": {"$in": user_ids}},
+                    {"$set": {"is_push_send": True, "updated_at": datetime.utcnow()}},
+                )
+                count_cache.invalidate(Notification.get_collection_name())
+
+                checkpointed = await lease.update(
+                    broadcast_id,
+                    {
+                        "$set": {"last_user_id": user_ids[-1], "updated_at": datetime.utcnow()},
+                        "$inc": {
+                            "recipients": len(user_ids),
+                            "push_sent": report["sent"],
+                            "push_failed": report["failed"],
+                            "push_pruned": report["pruned"],
+                        },
+                    },
+                )
+                if not checkpointed:
+                    logger.warning(f"Notification broadcast {broadcast_id} was taken over by another worker")
+                    return
+
+        await lease.release(broadcast_id, {
+            "status": BroadcastStatus.COMPLETED.value,
+            "finished_at": datetime.utcnow(),
+        })
+        logger.info(f"Notification broadcast {broadcast_id} completed")
+
+    except asyncio.CancelledError:
+        # shutting down (or lease lost): resumed from the checkpoint by the
+        # next worker claiming it
+        await lease.release(broadcast_id, {"status": BroadcastStatus.PENDING.value})
+        raise
+
+    except Exception as e:
+        logger.error(f"Notification broadcast {broadcast_id} failed: {e}")
+        await lease.release(broadcast_id, {
+            "status": BroadcastStatus.FAILED.value,
+            "error": str(e) or e.__class__.__name__,
+            "finished_at": datetime.utcnow(),
+        })
+
+    finally:
+        heartbeat.cancel()
+
+
+# -----------------------------------------------------
+# QUERIES
+# -----------------------------------------------------
+async def get_broadcasts(
+    limit: int = 20,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    docs, pagination = await NotificationBroadcast.aggregate_with_cursor(
+        [],
+        limit=limit,
+        sort_field="created_at",
+        sort_dir=-1,
+        after=after,
+        before=before,
+    )
+    return stringify_object_ids(docs), pagination
+
+
+async def get_broadcast(broadcast_id: str) -> NotificationBroadcast:
+    if not PydanticObjectId.is_valid(broadcast_id):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid broadcast id")
+
+    broadcast = await NotificationBroadcast.get(PydanticObjectId(broadcast_id))
+    if not broadcast:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Broadcast not found")
+
+    return broadcast
@@ -3,6 +3,12 @@ from datetime import datetime
 
 from beanie import PydanticObjectId
 
+from fast_app.core.count_cache import count_cache
+from fast_app.core.notification_cache import (
+    adjust_unread_count,
+    cache_unread_count,
+    get_cached_unread_count,
+)
 from fast_app.modules.notification.models.notification_model import Notification
 
 from fast_app.modules.common.schemas.response_schema import SuccessData
@@ -13,7 +19,8 @@ from fast_app.modules.notification.schemas.notification_schema import Notificati
 # -----------------------------------------------------
 # GET UNREAD COUNT
 # -----------------------------------------------------
-async def get_unread_count(user_id: str) -> int:
+async def count_unread(user_id: str) -> int:
+    # covered by the (receiver_id, is_read, is_deleted) index
     count = await Notification.find(
         Notification.receiver_id == PydanticObjectId(user_id),
         Notification.is_read == False,
@@ -23,6 +30,17 @@ async def get_unread_count(user_id: str) -> int:
     return count or 0
 
 
+async def get_unread_count(user_id: str) -> int:
+    """Badge count, served from the user's cached counter when it has one"""
+    cached: Optional[int] = await get_cached_unread_count(user_id)
+    if cached is not None:
+        return cached
+
+    count = await count_unread(user_id)
+    await cache_unread_count(user_id, count)
+    return count
+
+
 # -----------------------------------------------------
 # UPDATE READ STATUS
 # -----------------------------------------------------
@@ -37,8 +55,17 @@ async def update_read_status(
     # Mark selected notifications as read
     # ----------------------------------
     if not payload.mark_all_as_read:
+        ids = [PydanticObjectId(i) for i in payload.ids] if payload.ids else []
+
+        # only the caller's own unread notifications: each one modified
+        # here is exactly one less on their counter
         result = await collection.update_many(
-            {"_id": {"$in": [PydanticObjectId(i) for i in payload.ids] if payload.ids else []}},
+            {
+                "_id": {"$in": ids},
+                "receiver_id": PydanticObjectId(user_id),
+                "is_read": False,
+                "is_deleted": False,
+            },
             {
                 "$set": {
                     "is_read": True,
@@ -46,6 +73,7 @@ async def update_read_status(
                 }
             },
         )
+        await adjust_unread_count(user_id, -result.modified_count)
 
     # ----------------------------------
     # Mark all user's notifications as read
@@ -63,6 +91,11 @@ async def update_read_status(
                 }
             },
         )
+        # nothing left unread, no recount needed
+        await cache_unread_count(user_id, 0)
+
+    # raw collection writes bypass the document event hooks
+    count_cache.invalidate(Notification.get_collection_name())
 
     return {
         "message": "Notification read status updated successfully",
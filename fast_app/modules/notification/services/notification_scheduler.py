@@ -0,0 +1,242 @@
+import asyncio
+import heapq
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from beanie import PydanticObjectId
+
+from config import (
+    NOTIFICATION_SCHEDULER_BATCH_SIZE,
+    NOTIFICATION_SCHEDULER_LOOKAHEAD_SECONDS,
+    NOTIFICATION_SCHEDULER_MAX_LATENESS_SECONDS,
+    NOTIFICATION_SCHEDULER_MAX_QUEUED,
+    NOTIFICATION_SCHEDULER_POLL_SECONDS,
+)
+from fast_app.core.count_cache import count_cache
+from fast_app.modules.notification.models.notification_model import Notification
+from fast_app.modules.notification.services import push_service
+from fast_app.utils.common_utils import naive_utc
+from fast_app.utils.logger import logger
+
+# due time, notification id
+ScheduledEntry = Tuple[datetime, PydanticObjectId]
+
+
+class NotificationScheduler:
+    """
+    Pushes notifications when their `scheduled_time` comes.
+
+    Every poll loads the notifications due within the lookahead window
+    (an index range scan on `(is_push_send, scheduled_time)`) into a
+    time-ordered heap, and the worker sleeps until the earliest one is
+    due. Each due notification is claimed by flipping `is_push_send`
+    with `find_one_and_update`, so with several API workers polling the
+    same collection a notification is pushed by exactly one of them.
+    Claimed notifications sharing the same content go out as one
+    multicast push. Notifications overdue by more than `max_lateness`
+    (e.g. rows created before the scheduler existed) are marked as
+    handled without being pushed.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = NOTIFICATION_SCHEDULER_POLL_SECONDS,
+        lookahead: float = NOTIFICATION_SCHEDULER_LOOKAHEAD_SECONDS,
+        batch_size: int = NOTIFICATION_SCHEDULER_BATCH_SIZE,
+        max_queued: int = NOTIFICATION_SCHEDULER_MAX_QUEUED,
+        max_lateness: float = NOTIFICATION_SCHEDULER_MAX_LATENESS_SECONDS,
+    ):
+        self.poll_interval = poll_interval
+        self.lookahead = timedelta(seconds=lookahead)
+        self.batch_size = batch_size
+        self.max_queued = max_queued
+        self.max_lateness = timedelta(seconds=max_lateness) if max_lateness > 0 else None
+
+        self._heap: List[ScheduledEntry] = []
+        self._queued: Set[PydanticObjectId] = set()
+
+        # set by schedule() to interrupt the worker's sleep
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # ----------------------------------
+    # LIFECYCLE
+    # ----------------------------------
+
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        self._heap.clear()
+        self._queued.clear()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time()
+
+        while True:
+            # cleared before computing the sleep, a schedule() call landing
+            # in between still wakes the loop up
+            self._wakeup.clear()
+
+            try:
+                if loop.time() >= next_poll:
+                    await self.load()
+                    next_poll = loop.time() + self.poll_interval
+                await self.dispatch_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification scheduler failed: {e}")
+
+            timeout = next_poll - loop.time()
+            if self._heap:
+                due_in = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+                timeout = min(timeout, due_in)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    # ----------------------------------
+    # QUEUE
+    # ----------------------------------
+
+    def schedule(self, notification_id: PydanticObjectId, scheduled_time: Optional[datetime]):
+        """
+        Queue a notification created / rescheduled on this worker right
+        away instead of waiting for the next poll
+        """
+        # nothing to wake up before start()
+        if self._task is None or not scheduled_time or notification_id in self._queued:
+            return
+
+        scheduled_time = naive_utc(scheduled_time)
+        if scheduled_time > datetime.utcnow() + self.lookahead:
+            return
+
+        self._push(scheduled_time, notification_id)
+        self._wakeup.set()
+
+    def _push(self, scheduled_time: datetime, notification_id: PydanticObjectId):
+        heapq.heappush(self._heap, (scheduled_time, notification_id))
+        self._queued.add(notification_id)
+
+    async def expire_overdue(self) -> int:
+        """Mark notifications too late to be worth a push as handled"""
+        if self.max_lateness is None:
+            return 0
+
+        now = datetime.utcnow()
+        result = await Notification.get_pymongo_collection().update_many(
+            {"is_push_send": False, "scheduled_time": {"$lt": now - self.max_lateness}},
+            {"$set": {"is_push_send": True, "updated_at": now}},
+        )
+        skipped: int = result.modified_count
+        if skipped:
+            # raw write, no document hooks
+            count_cache.invalidate(Notification.get_collection_name())
+            logger.warning(f"Skipped {skipped} scheduled notifications overdue by more than {self.max_lateness}")
+        return skipped
+
+    async def load(self) -> int:
+        """Queue pending notifications due within the lookahead window"""
+        await self.expire_overdue()
+
+        room = self.max_queued - len(self._queued)
+        if room <= 0:
+            return 0
+
+        horizon = datetime.utcnow() + self.lookahead
+        cursor = Notification.get_pymongo_collection().find(
+            {
+                "is_push_send": False,
+                # past due ones too (missed while no worker was running),
+                # older ones were expired above
+                "scheduled_time": {"$lte": horizon},
+                "is_deleted": False,
+            },
+            {"_id": 1, "scheduled_time": 1},
+            sort=[("scheduled_time", 1)],
+            limit=room,
+        )
+
+        loaded = 0
+        async for doc in cursor:
+            if doc["_id"] not in self._queued:
+                self._push(doc["scheduled_time"], doc["_id"])
+                loaded += 1
+        return loaded
+
+    # ----------------------------------
+    # DISPATCH
+    # ----------------------------------
+
+    async def _claim(self, notification_id: PydanticObjectId, now: datetime) -> Optional[Dict[str, Any]]:
+        # fails when another worker got it first, or it was deleted /
+        # rescheduled later since it was queued
+        doc: Optional[Dict[str, Any]] = await Notification.get_pymongo_collection().find_one_and_update(
+            {
+                "_id": notification_id,
+                "is_push_send": False,
+                "is_deleted": False,
+                "scheduled_time": {"$lte": now},
+            },
+            {"$set": {"is_push_send": True, "updated_at": now}},
+            projection={"receiver_id": 1, "title": 1, "message": 1, "data": 1},
+        )
+        return doc
+
+    async def dispatch_due(self) -> int:
+        """Claim and push the due notifications, returns how many were pushed"""
+        pushed = 0
+        now = datetime.utcnow()
+
+        while self._heap and self._heap[0][0] <= now:
+            due: List[PydanticObjectId] = []
+            while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+                _, notification_id = heapq.heappop(self._heap)
+                self._queued.discard(notification_id)
+                due.append(notification_id)
+
+            claimed = await asyncio.gather(*[self._claim(notification_id, now) for notification_id in due])
+            if any(claimed):
+                # raw writes, no document hooks
+                count_cache.invalidate(Notification.get_collection_name())
+
+            # same content -> one multicast to all its receivers' devices
+            groups: Dict[str, Tuple[Dict[str, Any], List[PydanticObjectId]]] = {}
+            for doc in claimed:
+                if not doc:
+                    continue
+                key = json.dumps(
+                    [doc["title"], doc["message"], doc.get("data") or {}],
+                    sort_keys=True,
+                    default=str,
+                )
+                groups.setdefault(key, (doc, []))[1].append(doc["receiver_id"])
+
+            # claimed means sent: a failed push is logged, not retried, so a
+            # notification is never pushed twice
+            for doc, receiver_ids in groups.values():
+                try:
+                    await push_service.push_to_users(receiver_ids, doc["title"], doc["message"], doc.get("data"))
+                except Exception as e:
+                    logger.error(f"Scheduled notification push failed: {e}")
+                pushed += len(receiver_ids)
+
+        return pushed
+
+
+notification_scheduler = NotificationScheduler()
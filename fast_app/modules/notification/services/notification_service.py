@@ -3,12 +3,15 @@ from datetime import datetime
 
 from beanie import PydanticObjectId
 
+from fast_app.core.notification_cache import adjust_unread_count, invalidate_unread_count
+from fast_app.defaults.common_enums import CountMode, PaginationType
 from fast_app.modules.notification.models.notification_model import Notification
 from fast_app.modules.notification.schemas.notification_schema import (
     NotificationCreate,
     NotificationResponseWithReceiver,
     NotificationUpdate,
 )
+from fast_app.modules.notification.services.notification_scheduler import notification_scheduler
 from fast_app.utils.logger import logger
 
 
@@ -21,6 +24,10 @@ async def get_notifications(
     search: Optional[str] = None,
     sort: Optional[str] = None,
     filters: Optional[Dict] = None,
+    pagination_type: PaginationType = PaginationType.OFFSET,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    count_mode: CountMode = CountMode.NONE,
 ) -> Tuple[List[dict], Dict[str, Any]]:
 
     pipeline = []
@@ -48,7 +55,8 @@ async def get_notifications(
     # ------------------------------
     # Lookup receiver details
     # ------------------------------
-    pipeline.append(
+    lookup_stages: List[Dict[str, Any]] = []
+    lookup_stages.append(
         {
             "$lookup": {
                 "from": "users",
@@ -58,9 +66,9 @@ async def get_notifications(
             }
         }
     )
-    pipeline.append({"$unwind": {"path": "$receiver", "preserveNullAndEmptyArrays": True}})
+    lookup_stages.append({"$unwind": {"path": "$receiver", "preserveNullAndEmptyArrays": True}})
     
-    pipeline.append({
+    lookup_stages.append({
         "$addFields": {
             "_id": {"$toString": "$_id"},
             "receiver._id": {"$toString": "$receiver._id"}
@@ -70,7 +78,7 @@ async def get_notifications(
     # ------------------------------
     # Projection
     # ------------------------------
-    pipeline.append(
+    lookup_stages.append(
         {
             "$project": {
                 "_id": 1,
@@ -99,13 +107,25 @@ async def get_notifications(
     sort_field = sort.lstrip("-") if sort else "created_at"
     sort_dir = -1 if sort and sort.startswith("-") else 1
 
-    notifications, pagination = await Notification.aggregate_with_pagination(
-        pipeline=pipeline,
-        page=page,
-        limit=limit,
-        sort_field=sort_field,
-        sort_dir=sort_dir,
-    )
+    if pagination_type == PaginationType.CURSOR:
+        notifications, pagination = await Notification.aggregate_with_cursor(
+            pipeline=pipeline,
+            limit=limit,
+            sort_field=sort_field,
+            sort_dir=sort_dir,
+            after=after,
+            before=before,
+            count_mode=count_mode,
+            post_pipeline=lookup_stages,
+        )
+    else:
+        notifications, pagination = await Notification.aggregate_with_pagination(
+            pipeline=pipeline + lookup_stages,
+            page=page,
+            limit=limit,
+            sort_field=sort_field,
+            sort_dir=sort_dir,
+        )
 
     return (
         [
@@ -147,6 +167,8 @@ async def create_notification(data: NotificationCreate):
     )
 
     await notification.create()
+    await adjust_unread_count(notification.receiver_id, +1)
+    notification_scheduler.schedule(notification.id, notification.scheduled_time)
 
     return notification.model_dump(by_alias=True, mode="json")
 
@@ -166,6 +188,10 @@ async def update_notification(notification_id: str, data: NotificationUpdate):
 
     update_data["updated_at"] = datetime.utcnow()
     await notification.set(update_data)
+    if "is_read" in update_data or "is_deleted" in update_data:
+        await invalidate_unread_count(notification.receiver_id)
+    if not notification.is_push_send:
+        notification_scheduler.schedule(notification.id, notification.scheduled_time)
 
     return notification.model_dump(by_alias=True, mode="json")
 
@@ -179,9 +205,13 @@ async def remove_notification(notification_id: str) -> bool:
     if not notification:
         return False
 
+    was_unread = not notification.is_read and not notification.is_deleted
+
     await notification.set({
         "is_deleted": True,
         "updated_at": datetime.utcnow(),
     })
+    if was_unread:
+        await adjust_unread_count(notification.receiver_id, -1)
 
     return True
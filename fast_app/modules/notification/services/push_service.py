@@ -0,0 +1,133 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from beanie import PydanticObjectId
+
+from fast_app.modules.user.models.user_device_model import UserDevice
+from fast_app.utils.firebase_utils import PushBatchResult, send_push
+from fast_app.utils.logger import logger
+
+# FCM errors meaning the token itself will never work again
+DEAD_TOKEN_ERRORS = {"UnregisteredError", "SenderIdMismatchError"}
+
+# a malformed token; only trusted when the same multicast payload was
+# accepted for other tokens of the batch (otherwise the payload is at fault)
+INVALID_TOKEN_ERROR = "InvalidArgumentError"
+
+
+# process lifetime counters, see get_push_metrics
+_metrics: Dict[str, int] = {
+    "batches": 0,
+    "sent": 0,
+    "failed": 0,
+    "pruned": 0,
+}
+
+
+# -----------------------------------------------------
+# TOKENS
+# -----------------------------------------------------
+def valid_token_filter() -> Dict[str, Any]:
+    """Devices that can receive a push"""
+    return {
+        "device_token": {"$nin": [None, ""]},
+        "token_invalid": {"$ne": True},
+        "expired": False,
+        "is_deleted": False,
+    }
+
+
+async def get_device_tokens(user_ids: Iterable[PydanticObjectId]) -> List[str]:
+    """Distinct deliverable tokens of the given users"""
+    tokens: List[str] = await UserDevice.get_pymongo_collection().distinct(
+        "device_token",
+        {"user_id": {"$in": list(user_ids)}, **valid_token_filter()},
+    )
+    return tokens
+
+
+def dead_tokens(batches: List[PushBatchResult]) -> Set[str]:
+    dead = set()
+    for batch in batches:
+        for result in batch.results:
+            if result.error in DEAD_TOKEN_ERRORS:
+                dead.add(result.token)
+            elif result.error == INVALID_TOKEN_ERROR and batch.success_count:
+                dead.add(result.token)
+    return dead
+
+
+async def prune_tokens(tokens: Iterable[str]) -> int:
+    """Mark tokens invalid on every device using them, returns devices pruned"""
+    tokens = list(tokens)
+    if not tokens:
+        return 0
+
+    now = datetime.utcnow()
+    result = await UserDevice.get_pymongo_collection().update_many(
+        {"device_token": {"$in": tokens}, "token_invalid": {"$ne": True}},
+        {"$set": {"token_invalid": True, "token_invalidated_at": now, "updated_at": now}},
+    )
+    pruned: int = result.modified_count
+    return pruned
+
+
+async def restore_token(token: Optional[str]):
+    """
+    Make a token deliverable again when a device registers it (e.g. the
+    app was reinstalled with a token pruned earlier)
+    """
+    if not token:
+        return
+
+    now = datetime.utcnow()
+    await UserDevice.get_pymongo_collection().update_many(
+        {"device_token": token, "token_invalid": True},
+        {"$set": {"token_invalid": False, "token_invalidated_at": None, "updated_at": now}},
+    )
+
+
+# -----------------------------------------------------
+# DELIVERY
+# -----------------------------------------------------
+async def deliver_push(
+    tokens: List[str],
+    title: str,
+    body: str,
+    data: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    """
+    Send a push to `tokens` and prune the ones FCM reports as dead, so
+    they are skipped by every later send. Returns the delivery report.
+    """
+    batches = await send_push(tokens, title, body, data)
+
+    dead = dead_tokens(batches)
+    pruned = await prune_tokens(dead)
+
+    report = {
+        "batches": len(batches),
+        "sent": sum(batch.success_count for batch in batches),
+        "failed": sum(batch.failure_count for batch in batches),
+        "pruned": pruned,
+    }
+    for key, value in report.items():
+        _metrics[key] += value
+
+    if dead:
+        logger.info(f"Pruned {len(dead)} dead FCM tokens ({pruned} devices)")
+
+    return report
+
+
+async def push_to_users(
+    user_ids: Iterable[PydanticObjectId],
+    title: str,
+    body: str,
+    data: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    return await deliver_push(await get_device_tokens(user_ids), title, body, data)
+
+
+def get_push_metrics() -> Dict[str, int]:
+    return dict(_metrics)
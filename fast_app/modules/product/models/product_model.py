@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Annotated, Optional
+from typing import Annotated, Dict, Optional
 
 from beanie import Indexed, Insert, PydanticObjectId, Replace, before_event
+from pydantic import Field
 from fast_app.defaults.common_enums import StatusEnum
 from fast_app.modules.common.models.base_model import BaseDocument
 
@@ -9,6 +10,8 @@ from fast_app.modules.common.models.base_model import BaseDocument
 class Product(BaseDocument):
     name: str
     image: str
+    # ImageSize value -> path of the resized webp rendition
+    image_variants: Dict[str, str] = Field(default_factory=dict)
     
     category_id: Optional[PydanticObjectId] = None
 
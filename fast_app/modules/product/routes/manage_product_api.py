@@ -8,7 +8,7 @@ from fast_app.decorators.permission_decorator import action_type
 from fast_app.defaults.permission_enums import Action, Resource
 from fast_app.modules.product.services import product_service
 from fast_app.decorators.catch_error import catch_error
-from fast_app.defaults.common_enums import StatusEnum, UserRole
+from fast_app.defaults.common_enums import CountMode, ImageSize, PaginationType, StatusEnum, UserRole
 
 from fast_app.modules.product.schemas.product_schema import (
     ProductCreateForm,
@@ -18,6 +18,7 @@ from fast_app.modules.product.schemas.product_schema import (
 )
 
 from fast_app.modules.common.schemas.response_schema import (
+    CursorPaginationMeta,
     PaginatedData,
     PaginationMeta,
     SuccessResponse,
@@ -40,7 +41,12 @@ async def list_products(
     search: Optional[str] = Query(None),
     sort: Optional[str] = Query(None),
     status_filter: Optional[StatusEnum] = Query(None),
-    category_filter: List[Optional[str|PydanticObjectId]] = Query(default=[], alias="category_filter[]")
+    category_filter: List[Optional[str|PydanticObjectId]] = Query(default=[], alias="category_filter[]"),
+    pagination_type: PaginationType = Query(PaginationType.OFFSET),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+    count_mode: CountMode = Query(CountMode.NONE),
+    image_size: ImageSize = Query(ImageSize.ORIGINAL),
 ):
     filters = {}
     if status_filter:
@@ -52,13 +58,22 @@ async def list_products(
         search=search,
         sort=sort,
         filters=filters,
-        category_filter=category_filter
+        category_filter=category_filter,
+        pagination_type=pagination_type,
+        after=after,
+        before=before,
+        count_mode=count_mode,
+        image_size=image_size,
     )
 
     return SuccessDataPaginated(
         message="Products retrieved successfully",
         data=PaginatedData(
-            meta=PaginationMeta(**pagination),
+            meta=(
+                CursorPaginationMeta(**pagination)
+                if pagination_type == PaginationType.CURSOR
+                else PaginationMeta(**pagination)
+            ),
             docs=products,
         ),
     )
@@ -69,9 +84,13 @@ async def list_products(
 @catch_error
 @login_required(UserRole.ADMIN)
 @action_type(Action.READ)
-async def get_product(request: Request, product_id: str):
+async def get_product(
+    request: Request,
+    product_id: str,
+    image_size: ImageSize = Query(ImageSize.ORIGINAL),
+):
 
-    product = await product_service.get_product_by_id(product_id)
+    product = await product_service.get_product_by_id(product_id, image_size)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
@@ -8,7 +8,7 @@ from fast_app.decorators.permission_decorator import action_type
 from fast_app.defaults.permission_enums import Action, Resource
 from fast_app.modules.product.services import product_service
 from fast_app.decorators.catch_error import catch_error
-from fast_app.defaults.common_enums import StatusEnum, UserRole
+from fast_app.defaults.common_enums import ImageSize, StatusEnum, UserRole
 
 from fast_app.modules.product.schemas.product_schema import (
     ProductCreateForm,
@@ -39,7 +39,8 @@ async def list_products(
     search: Optional[str] = Query(None),
     sort: Optional[str] = Query(None),
     status_filter: Optional[StatusEnum] = Query(None),
-    category_filter: List[Optional[str|PydanticObjectId]] = Query(default=[], alias="category_filter[]")
+    category_filter: List[Optional[str|PydanticObjectId]] = Query(default=[], alias="category_filter[]"),
+    image_size: ImageSize = Query(ImageSize.ORIGINAL),
 ):
     filters = {}
     if status_filter:
@@ -51,7 +52,8 @@ async def list_products(
         search=search,
         sort=sort,
         filters=filters,
-        category_filter=category_filter
+        category_filter=category_filter,
+        image_size=image_size,
     )
 
     return SuccessDataPaginated(
@@ -75,7 +77,8 @@ async def list_products_group_by_category(
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = Query(None),
     status_filter: Optional[StatusEnum] = Query(None),
-    category_filter: List[Optional[str|PydanticObjectId]] = Query(default=[], alias="category_filter[]")
+    category_filter: List[Optional[str|PydanticObjectId]] = Query(default=[], alias="category_filter[]"),
+    image_size: ImageSize = Query(ImageSize.ORIGINAL),
 ):
     filters = {}
     if status_filter:
@@ -86,7 +89,8 @@ async def list_products_group_by_category(
         limit=limit,
         search=search,
         filters=filters,
-        category_filter=category_filter
+        category_filter=category_filter,
+        image_size=image_size,
     )
 
     return SuccessDataPaginated(
@@ -102,9 +106,13 @@ async def list_products_group_by_category(
 @router.get("/{product_id}", response_model=SuccessData[dict])
 @catch_error
 @action_type(Action.READ)
-async def get_product(request: Request, product_id: str):
+async def get_product(
+    request: Request,
+    product_id: str,
+    image_size: ImageSize = Query(ImageSize.ORIGINAL),
+):
 
-    product = await product_service.get_product_by_id(product_id)
+    product = await product_service.get_product_by_id(product_id, image_size)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
@@ -1,7 +1,7 @@
 from beanie import PydanticObjectId
 from fastapi import File, Form, UploadFile
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 from fast_app.defaults.common_enums import StatusEnum
@@ -20,11 +20,13 @@ class ProductCategoryResponse(BaseModel):
     name: Optional[str]
     description: Optional[str]
     image: Optional[str]
+    image_variants: Dict[str, str] = {}
     
 
 class ProductResponse(ProductBase):
     id: str | PydanticObjectId = Field(..., alias="_id")
     image: str
+    image_variants: Dict[str, str] = {}
     category: Optional[ProductCategoryResponse] = None
     status: StatusEnum
     is_deleted: bool
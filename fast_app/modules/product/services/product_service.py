@@ -9,13 +9,20 @@ from fast_app.modules.product.schemas.product_schema import (
     ProductResponse,
     ProductUpdateForm,
 )
-from fast_app.defaults.common_enums import StatusEnum
+from fast_app.defaults.common_enums import CountMode, ImageSize, PaginationType, StatusEnum
 from fast_app.utils.common_utils import escape_regex, exclude_unset
-from fast_app.utils.file_utils import upload_files
+from fast_app.utils.file_utils import release_file, upload_files
+from fast_app.utils.image_utils import apply_image_size
 from fast_app.utils.logger import logger
 import inspect
 
 
+def _product_response(product: Dict[str, Any], image_size: ImageSize) -> Dict[str, Any]:
+    data: Dict[str, Any] = ProductResponse.model_validate(product).model_dump(by_alias=True, mode="json")
+    apply_image_size(data, image_size)
+    apply_image_size(data.get("category"), image_size)
+    return data
+
 
 # -----------------------------------------------------
 # LIST (Pagination + Search + Status)
@@ -26,7 +33,12 @@ async def get_products(
     search: Optional[str] = None,
     sort: Optional[str] = None,
     filters: Optional[Dict] = None,
-    category_filter: List[Optional[str|PydanticObjectId]] = []
+    category_filter: List[Optional[str|PydanticObjectId]] = [],
+    pagination_type: PaginationType = PaginationType.OFFSET,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    count_mode: CountMode = CountMode.NONE,
+    image_size: ImageSize = ImageSize.ORIGINAL,
 ) -> Tuple[List[dict], Dict[str, Any]]:
 
     pipeline = []
@@ -47,37 +59,49 @@ async def get_products(
     pipeline.append({"$match": match_stage})
     
     # category lookup
-    pipeline.append({
-        "$lookup": {
-            "from": "categories",
-            "localField": "category_id",
-            "foreignField": "_id",
-            "as": "category",
-        }
-    })
-    pipeline.append({
-        "$unwind": {
-            "path": "$category",
-            "preserveNullAndEmptyArrays": True
-        }
-    })
+    lookup_stages: List[Dict[str, Any]] = [
+        {
+            "$lookup": {
+                "from": "categories",
+                "localField": "category_id",
+                "foreignField": "_id",
+                "as": "category",
+            }
+        },
+        {
+            "$unwind": {
+                "path": "$category",
+                "preserveNullAndEmptyArrays": True
+            }
+        },
+    ]
 
     sort_field = sort.lstrip("-") if sort else "created_at"
     sort_dir = -1 if sort and sort.startswith("-") else 1
 
-    products, pagination = await Product.aggregate_with_pagination(
-        pipeline=pipeline,
-        page=page,
-        limit=limit,
-        sort_field=sort_field,
-        sort_dir=sort_dir,
-    )
+    if pagination_type == PaginationType.CURSOR:
+        # lookups only run for the rows of the current page
+        products, pagination = await Product.aggregate_with_cursor(
+            pipeline=pipeline,
+            limit=limit,
+            sort_field=sort_field,
+            sort_dir=sort_dir,
+            after=after,
+            before=before,
+            count_mode=count_mode,
+            post_pipeline=lookup_stages,
+        )
+    else:
+        products, pagination = await Product.aggregate_with_pagination(
+            pipeline=pipeline + lookup_stages,
+            page=page,
+            limit=limit,
+            sort_field=sort_field,
+            sort_dir=sort_dir,
+        )
     
     return (
-        [
-            ProductResponse.model_validate(product).model_dump(by_alias=True, mode="json")
-            for product in products
-        ],
+        [_product_response(product, image_size) for product in products],
         pagination,
     )
     
@@ -86,7 +110,8 @@ async def get_products_group_by_category(
     limit: int = 10,
     search: Optional[str] = None,
     filters: Optional[Dict] = None,
-    category_filter: List[Optional[str|PydanticObjectId]] = []
+    category_filter: List[Optional[str|PydanticObjectId]] = [],
+    image_size: ImageSize = ImageSize.ORIGINAL,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
 
     pipeline = []
@@ -133,8 +158,7 @@ async def get_products_group_by_category(
         sort_dir=sort_dir,
     )
     
-    product_list=[ProductResponse.model_validate(product).model_dump(by_alias=True, mode="json")
-            for product in products]
+    product_list=[_product_response(product, image_size) for product in products]
 
     grouped: dict[str, list] = {}
 
@@ -160,7 +184,7 @@ async def get_products_group_by_category(
 # -----------------------------------------------------
 # GET BY ID
 # -----------------------------------------------------
-async def get_product_by_id(product_id: str):
+async def get_product_by_id(product_id: str, image_size: ImageSize = ImageSize.ORIGINAL):
     try:
         collection = Product.get_pymongo_collection()
         match_stage = {
@@ -194,8 +218,7 @@ async def get_product_by_id(product_id: str):
         if not products:
             return None
 
-        product = products[0]
-        return ProductResponse.model_validate(product).model_dump(by_alias=True, mode="json")
+        return _product_response(products[0], image_size)
     except Exception as e:
         logger.error(str(e))
         return None
@@ -211,12 +234,13 @@ async def create_product(data: ProductCreateForm):
     
     image_data={}
     if data.image:
-        upload_result = await upload_files([data.image], "product-images")
+        upload_result = await upload_files([data.image], "product-images", variants=True)
         image_data = upload_result[0]
     
     product = Product(
         name=data.name,
         image=image_data.get("path",""),
+        image_variants=image_data.get("variants", {}),
         category_id=PydanticObjectId(data.category_id)
     )
 
@@ -238,16 +262,20 @@ async def update_product(product_id: str, data: ProductUpdateForm):
         return None
 
     image_data={}
+    replaced_image = None
     if data.image:
-        upload_result = await upload_files([data.image], "product-images")
+        upload_result = await upload_files([data.image], "product-images", variants=True)
         image_data = upload_result[0]
+        replaced_image = product.image
         update_data["image"]=image_data.get("path","")
+        update_data["image_variants"]=image_data.get("variants", {})
     
     if update_data.get("category_id"):
         update_data["category_id"] = PydanticObjectId(update_data.get("category_id"))
 
     update_data["updated_at"] = datetime.utcnow()
     await product.set(exclude_unset(update_data))
+    await release_file(replaced_image)
 
     return product.model_dump(by_alias=True, mode="json")
 
@@ -34,6 +34,9 @@ class UserDevice(BaseDocument):
     user_id: PydanticObjectId
 
     device_token: Optional[str]
+    # set when FCM reports the token dead, such devices are skipped for push
+    token_invalid: bool = False
+    token_invalidated_at: Optional[datetime] = None
     device_type: str = Field(default="Web", pattern="^(Web|Android|iOS)$")
 
     ip: str = ""
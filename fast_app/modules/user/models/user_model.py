@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import Dict, List, Optional
-from beanie import Insert, PydanticObjectId, Replace, before_event
+from beanie import Delete, Insert, PydanticObjectId, Replace, Save, SaveChanges, Update, after_event, before_event
 from fastapi import HTTPException
 from pydantic import BaseModel, Field, EmailStr
 from pymongo import IndexModel
 from argon2.exceptions import InvalidHashError
+from fast_app.core.auth_cache import invalidate_user
 from fast_app.defaults.common_enums import StatusEnum, UserRole
 from fast_app.defaults.permission_enums import Action, Resource
 from fast_app.modules.common.models.base_model import BaseDocument
@@ -92,6 +93,11 @@ class User(BaseDocument):
 
         self.updated_at = datetime.utcnow()
 
+    @after_event(Replace, Save, SaveChanges, Update, Delete)
+    async def invalidate_auth_cache(self):
+        # status / permission / soft-delete changes must not be served stale
+        await invalidate_user(self.id)
+
     def valid_password(self, password: str):
         try:
             return verify_password(password, self.password) if self.password else False
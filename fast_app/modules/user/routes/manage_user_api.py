@@ -8,6 +8,8 @@ from fast_app.core.router_context import RouterContext
 from fast_app.decorators.authenticator import login_required
 from fast_app.decorators.permission_decorator import action_type
 from fast_app.defaults.permission_enums import Action, Resource
+from fast_app.modules.export.schemas.export_schema import ExportJobResponse
+from fast_app.modules.export.services import export_service
 from fast_app.modules.user.services import user_service
 from fast_app.modules.user.schemas.user_schema import (
     UpdateAdminPermissions,
@@ -18,6 +20,7 @@ from fast_app.modules.user.schemas.user_schema import (
     UserStatusUpdate,
 )
 from fast_app.modules.common.schemas.response_schema import (
+    CursorPaginationMeta,
     PaginatedData,
     PaginationMeta,
     SuccessResponse,
@@ -25,9 +28,11 @@ from fast_app.modules.common.schemas.response_schema import (
     SuccessData,
     SuccessDataPaginated,
 )
-from fast_app.defaults.common_enums import UserRole, StatusEnum
+from fast_app.defaults.common_enums import CountMode, ExportFormat, PaginationType, UserRole, StatusEnum
+from fast_app.defaults.export_enums import ExportType
 from fast_app.decorators.catch_error import catch_error
 from fast_app.utils.common_utils import normalize_utc
+from fast_app.utils.export_utils import EXPORT_MEDIA_TYPES, stream_export
 from fast_app.utils.firebase_utils import send_notification
 
 
@@ -52,6 +57,10 @@ async def list_users(
     role: Optional[UserRole] = Query(None),
     reg_from: Optional[datetime] = Query(None),
     reg_to: Optional[datetime] = Query(None),
+    pagination_type: PaginationType = Query(PaginationType.OFFSET),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+    count_mode: CountMode = Query(CountMode.NONE),
 ):
     filters = {}
     if status:
@@ -73,12 +82,20 @@ async def list_users(
         search=search,
         sort=sort,
         filters=filters,
+        pagination_type=pagination_type,
+        after=after,
+        before=before,
+        count_mode=count_mode,
     )
 
     return SuccessDataPaginated(
         message="Users retrieved successfully",
         data=PaginatedData(
-            meta=PaginationMeta(**pagination),
+            meta=(
+                CursorPaginationMeta(**pagination)
+                if pagination_type == PaginationType.CURSOR
+                else PaginationMeta(**pagination)
+            ),
             docs=users,
         ),
     )
@@ -98,41 +115,73 @@ async def export_users(
     role: Optional[UserRole] = Query(None),
     reg_from: Optional[datetime] = Query(None),
     reg_to: Optional[datetime] = Query(None),
+    export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
 ):
-    filters = {}
-    
-    if status:
-        filters["status"] = status
-    if role:
-        if role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
-            raise HTTPException(status_code=400, detail="Cannot export admin users")
-        filters["role"] = role
-    if reg_from or reg_to:
-        filters["created_at"] = {}
-        if reg_from:
-            filters["created_at"]["$gte"] = normalize_utc(reg_from, start=True)
-        if reg_to:
-            filters["created_at"]["$lte"] = normalize_utc(reg_to, end=True)
+    if role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
+        raise HTTPException(status_code=400, detail="Cannot export admin users")
+
+    filters = user_service.build_export_filters(status, role, reg_from, reg_to)
+
+    sheet_title, header = user_service.get_export_sheet(role)
 
-    users = await user_service.export_users(
+    # rows are read, encoded and sent batch by batch
+    rows = user_service.iter_export_users(
         search=search,
         sort=sort,
         filters=filters,
     )
 
-    excel_file = user_service.generate_users_excel(users, role)
-
-    filename = f"users_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    filename = f"users_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{export_format.value}"
 
     return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        stream_export(export_format, sheet_title, header, rows),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"'
         },
     )
 
 
+# -----------------------------------------------------
+# EXPORT USERS (BACKGROUND JOB)
+# -----------------------------------------------------
+@router.post("/export/jobs", response_model=SuccessData[ExportJobResponse], status_code=202)
+@catch_error
+@login_required(UserRole.ADMIN)
+@action_type(Action.READ)
+async def submit_users_export(
+    request: Request,
+    search: Optional[str] = Query(None),
+    sort: Optional[str] = Query(None),
+    status: Optional[StatusEnum] = Query(None),
+    role: Optional[UserRole] = Query(None),
+    reg_from: Optional[datetime] = Query(None),
+    reg_to: Optional[datetime] = Query(None),
+    export_format: ExportFormat = Query(ExportFormat.XLSX, alias="format"),
+):
+    if role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
+        raise HTTPException(status_code=400, detail="Cannot export admin users")
+
+    job = await export_service.submit_export_job(
+        export_type=ExportType.USERS,
+        export_format=export_format,
+        params={
+            "search": search,
+            "sort": sort,
+            "status": status,
+            "role": role,
+            "reg_from": reg_from,
+            "reg_to": reg_to,
+        },
+        requested_by=request.state.user.id,
+    )
+
+    return SuccessData(
+        message="Export started",
+        data=job.model_dump(by_alias=True, mode="json"),
+    )
+
+
 # -----------------------------------------------------
 # GET USER
 # -----------------------------------------------------
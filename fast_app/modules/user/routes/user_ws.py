@@ -24,8 +24,8 @@ async def user_ws(
     user_id = decode_token(token).get("sub")
     await ws_manager.connect(user_id, websocket)
     try:
-        # Update connected user status to online in db
-        await user_service.update_user_activity_status(token, UserActivityStatusEnum.ONLINE)
+        # Update connected user status to online (flushed to db in batches)
+        await user_service.update_user_activity_status(token, UserActivityStatusEnum.ONLINE, user_id)
         
         # broadcast updated status to the user status room
         room_id=user_service.get_status_room_by_user_id(user_id)
@@ -52,8 +52,8 @@ async def user_ws(
             if event == UserWsIncomingEvents.UPDATE_STATUS:
                 status = data.get("status")
                 
-                # update user status in db
-                await user_service.update_user_activity_status(token, UserActivityStatusEnum.ONLINE)
+                # update user status (flushed to db in batches)
+                await user_service.update_user_activity_status(token, UserActivityStatusEnum.ONLINE, user_id)
                 
                 # broadcast updated status to the user status room
                 room_id=user_service.get_status_room_by_user_id(user_id)
@@ -75,44 +75,66 @@ async def user_ws(
             if event == UserWsIncomingEvents.GET_USER_STATUS:                
                 user_ids = data.get("user_ids", [])
 
-                # get current status for the buyers from db
+                # get current status for the buyers (memory first, then db)
                 statuses=await user_service.get_status_by_user_ids(user_ids)
 
-                for uid in user_ids:
-                    activity_status=UserActivityStatusEnum.OFFLINE
-                    last_seen=datetime.now().isoformat()
-                    
-                    # get status for the particular user id
-                    status=statuses.get(uid)
-                    if status:
-                        activity_status=status.get("activity_status")
-                        last_seen=status.get("last_seen")
-                    
-                    # get room id for buyer status
-                    status_room_id = user_service.get_status_room_by_user_id(uid)
+                # join requesting user to all the status rooms at once
+                await ws_manager.join_rooms(
+                    [user_service.get_status_room_by_user_id(uid) for uid in user_ids],
+                    user_id,
+                )
 
-                    # join requesting user to the status room
-                    await ws_manager.join_room(status_room_id, user_id)
+                for uid in user_ids:
+                    status=statuses.get(uid) or {}
 
                     # send current status to the requesting user
-                    await ws_manager.emit_room(
-                        status_room_id,
+                    await ws_manager.emit_user(
+                        user_id,
                         {
                             "event": UserWsOutgoingEvents.USER_STATUS,
                             "data": {
                                 "user_id": uid,
-                                "status": activity_status,
-                                "last_seen": last_seen,
+                                "status": status.get("activity_status", UserActivityStatusEnum.OFFLINE),
+                                "last_seen": status.get("last_seen"),
                             },
                         },
                     )
 
+            # ----------------------------------
+            # Subscribe User Status (batched)
+            # ----------------------------------
+            if event == UserWsIncomingEvents.SUBSCRIBE_USER_STATUS:
+                user_ids = data.get("user_ids", [])
+
+                statuses=await user_service.get_status_by_user_ids(user_ids)
+
+                await ws_manager.join_rooms(
+                    [user_service.get_status_room_by_user_id(uid) for uid in user_ids],
+                    user_id,
+                )
+
+                # single aggregated frame for every requested user
+                await ws_manager.emit_user(
+                    user_id,
+                    {
+                        "event": UserWsOutgoingEvents.USER_STATUSES,
+                        "data": [
+                            {
+                                "user_id": uid,
+                                "status": status["activity_status"],
+                                "last_seen": status["last_seen"],
+                            }
+                            for uid, status in statuses.items()
+                        ],
+                    },
+                )
+
     except WebSocketDisconnect:
         await ws_manager.disconnect(user_id, websocket)
         logger.info(f"WebSocket disconnected for user_id: {user_id}")
         
-        # update user status to offline in db
-        await user_service.update_user_activity_status(token,UserActivityStatusEnum.OFFLINE)
+        # update user status to offline (flushed to db in batches)
+        await user_service.update_user_activity_status(token, UserActivityStatusEnum.OFFLINE, user_id)
         
         # broadcast updated status to the user status room
         room_id=user_service.get_status_room_by_user_id(user_id)
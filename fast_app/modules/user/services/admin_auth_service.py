@@ -6,9 +6,11 @@ from beanie.operators import Or
 from fastapi import HTTPException, Request, status
 
 from config import APP_NAME
+from fast_app.core.auth_cache import invalidate_token, invalidate_user
 from fast_app.defaults.common_enums import StatusEnum, UserRole
 from fast_app.modules.user.models.user_device_model import \
     UserDevice
+from fast_app.modules.notification.services.push_service import restore_token
 from fast_app.modules.user.models.user_model import User
 from fast_app.modules.user.schemas.admin_auth_schema import AdminChangePasswordSchema, AdminProfileUpdateForm
 from fast_app.utils.common_utils import exclude_unset
@@ -63,6 +65,7 @@ async def admin_register(data, request: Request) -> Dict:
             role=user.role,
             last_active=datetime.utcnow(),
         ).insert()
+        await restore_token(data.device_token)
 
     return {
         "user": user.model_dump(by_alias=True, mode="json"),
@@ -120,6 +123,9 @@ async def admin_login(data, request: Request) -> dict:
             last_active=datetime.utcnow(),
         ).insert()
 
+    # a device logging in again may bring back a token pruned earlier
+    await restore_token(data.device_token)
+
     return {
         "user": user.model_dump(by_alias=True, mode="json"),
         "access_token": access_token,
@@ -161,6 +167,8 @@ async def refresh_token(refresh_token: str) -> dict:
 # LOGOUT
 # -----------------------------------------------------
 async def logout(access_token: str) -> None:
+    await invalidate_token(access_token)
+
     device = await UserDevice.find_one(
         UserDevice.access_token == access_token,
         UserDevice.expired == False,
@@ -173,6 +181,7 @@ async def logout(access_token: str) -> None:
                 "updated_at": datetime.utcnow(),
             }
         )
+        await invalidate_user(device.user_id)
 
 
 
@@ -5,9 +5,11 @@ from beanie import PydanticObjectId
 from fastapi import HTTPException, Request, status
 
 from config import ENV
+from fast_app.core.auth_cache import invalidate_token
 from fast_app.defaults.common_enums import Env, OtpPurpose, StatusEnum, UserRole
 from fast_app.modules.user.models.user_device_model import \
     UserDevice
+from fast_app.modules.notification.services.push_service import restore_token
 from fast_app.modules.user.models.user_model import User
 from fast_app.modules.user.models.user_otp_model import UserOtp
 from fast_app.modules.user.schemas.user_auth_schema import BuyerProfileUpdateForm, BuyerRegisterSchema, SellerProfileUpdateForm, SellerRegisterSchema, UserProfileUpdateForm, UserRegisterSchema
@@ -249,6 +251,7 @@ async def buyer_register(data: BuyerRegisterSchema, request: Request) -> Dict:
         role=user.role,
         last_active=datetime.utcnow(),
     ).insert()
+    await restore_token(data.device_token)
 
     return {
         "user": user.model_dump(by_alias=True, mode="json"),
@@ -327,6 +330,7 @@ async def seller_register(data: SellerRegisterSchema, request: Request) -> Dict:
         role=user.role,
         last_active=datetime.utcnow(),
     ).insert()
+    await restore_token(data.device_token)
 
     return {
         "user": user.model_dump(by_alias=True, mode="json"),
@@ -425,6 +429,7 @@ async def verify_login_otp(
         role=user.role,
         last_active=datetime.utcnow(),
     ).insert()
+    await restore_token(data.device_token)
 
     return {
         "user": user.model_dump(by_alias=True, mode="json"),
@@ -484,6 +489,8 @@ async def update_seller_profile(user_id: PydanticObjectId, user_data: SellerProf
 
 
 async def logout(access_token: str) -> None:
+    await invalidate_token(access_token)
+
     # 🔓 Decode token to ensure it's valid
     payload = decode_token(access_token)
     user_id = payload.get("sub")
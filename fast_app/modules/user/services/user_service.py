@@ -1,16 +1,11 @@
-from collections import defaultdict
-from io import BytesIO
-from typing import Any, Optional, Dict, List, Tuple
+from typing import Any, AsyncIterator, Optional, Dict, List, Tuple
 from datetime import datetime
 
 from beanie import PydanticObjectId
 
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from beanie.operators import In
+from fast_app.core.presence import presence_registry
 from fast_app.utils.logger import logger
-from fast_app.defaults.common_enums import UserRole
+from fast_app.defaults.common_enums import CountMode, PaginationType, UserRole
 from fast_app.defaults.user_enums import UserActivityStatusEnum
 from fast_app.modules.product.models.product_model import Product
 from fast_app.modules.user.models.user_device_model import UserDevice
@@ -20,8 +15,10 @@ from fast_app.modules.user.schemas.user_schema import (
     UserCreateForm,
     UserUpdateForm,
 )
-from fast_app.utils.common_utils import escape_regex, exclude_unset, stringify_object_ids
+from fast_app.utils.common_utils import escape_regex, exclude_unset, normalize_utc, stringify_object_ids
+from fast_app.utils.export_utils import EXPORT_BATCH_SIZE
 from fast_app.utils.file_utils import upload_files
+from fast_app.utils.pagination_utils import get_field_value
 from fast_app.utils.logger import logger
 
 # -----------------------------------------------------
@@ -33,6 +30,10 @@ async def get_users(
     search: Optional[str] = None,
     sort: Optional[str] = None,
     filters: Optional[Dict] = None,
+    pagination_type: PaginationType = PaginationType.OFFSET,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    count_mode: CountMode = CountMode.NONE,
 ) -> Tuple[List[dict], Dict[str, Any]]:
 
     pipeline = []
@@ -58,13 +59,24 @@ async def get_users(
     sort_field = sort.lstrip("-") if sort else "created_at"
     sort_dir = -1 if sort and sort.startswith("-") else 1
 
-    users, pagination = await User.aggregate_with_pagination(
-        pipeline=pipeline,
-        page=page,
-        limit=limit,
-        sort_field=sort_field,
-        sort_dir=sort_dir,
-    )
+    if pagination_type == PaginationType.CURSOR:
+        users, pagination = await User.aggregate_with_cursor(
+            pipeline=pipeline,
+            limit=limit,
+            sort_field=sort_field,
+            sort_dir=sort_dir,
+            after=after,
+            before=before,
+            count_mode=count_mode,
+        )
+    else:
+        users, pagination = await User.aggregate_with_pagination(
+            pipeline=pipeline,
+            page=page,
+            limit=limit,
+            sort_field=sort_field,
+            sort_dir=sort_dir,
+        )
 
     return (
         [
@@ -78,14 +90,86 @@ async def get_users(
 # -----------------------------------------------------
 # Export data
 # -----------------------------------------------------
-async def export_users(
+# exported columns (header, document field) and sheet title per role
+USER_EXPORT_SHEETS: Dict[UserRole, Tuple[str, List[Tuple[str, str]]]] = {
+    UserRole.END_USER: (
+        "Sub Constructors",
+        [
+            ("Full Name", "full_name"),
+            ("Email", "email"),
+            ("Phone Number", "phone_number"),
+            ("City", "geo_location.city"),
+            ("State", "geo_location.state"),
+            ("Status", "status"),
+            ("Registered At", "created_at"),
+        ],
+    ),
+    UserRole.VENDOR: (
+        "Store Owners",
+        [
+            ("Full Name", "full_name"),
+            ("Business Name", "business_name"),
+            ("Business Email", "business_email"),
+            ("Email", "email"),
+            ("Phone Number", "phone_number"),
+            ("GST Number", "gst_number"),
+            ("License Number", "lisence_number"),
+            ("Status", "status"),
+            ("Registered At", "created_at"),
+        ],
+    ),
+}
+
+
+def get_export_sheet(role: Optional[UserRole] = None) -> Tuple[str, List[str]]:
+    """Sheet title and header of a user export (end users unless vendors are asked)"""
+    title, columns = USER_EXPORT_SHEETS[role or UserRole.END_USER]
+    return title, [header for header, _ in columns]
+
+
+def build_export_filters(
+    status: Optional[str] = None,
+    role: Optional[str] = None,
+    reg_from: Optional[datetime] = None,
+    reg_to: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    filters: Dict[str, Any] = {}
+
+    if status:
+        filters["status"] = status
+    if role:
+        filters["role"] = role
+    if reg_from or reg_to:
+        filters["created_at"] = {}
+        if reg_from:
+            filters["created_at"]["$gte"] = normalize_utc(reg_from, start=True)
+        if reg_to:
+            filters["created_at"]["$lte"] = normalize_utc(reg_to, end=True)
+
+    return filters
+
+
+def format_export_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return format_date(value)
+    return "" if value is None else value
+
+
+async def iter_export_users(
     search: Optional[str] = None,
     sort: Optional[str] = None,
     filters: Optional[Dict] = None,
-) -> List[dict]:
-
-    pipeline = []
-    match_stage: Dict[str, Any] = {"is_deleted": False}
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[List[List[Any]]]:
+    """
+    Stream the rows of a user export in batches, straight from a db
+    cursor and with only the exported fields.
+    """
+    filters = filters or {}
+    role = filters.get("role") or UserRole.END_USER
+    _, columns = USER_EXPORT_SHEETS[role]
+
+    match_stage: Dict[str, Any] = {"is_deleted": False, "role": role}
 
     if search:
         safe_search=escape_regex(search)
@@ -94,29 +178,35 @@ async def export_users(
             {"email": {"$regex": safe_search, "$options": "i"}},
         ]
 
-    if filters:
-        if "status" in filters:
-            match_stage["status"] = filters["status"]
-        if "role" in filters:
-            match_stage["role"] = filters["role"]
-        if "created_at" in filters:
-            match_stage["created_at"] = filters["created_at"]
-
-    pipeline.append({"$match": match_stage})
+    if "status" in filters:
+        match_stage["status"] = filters["status"]
+    if "created_at" in filters:
+        match_stage["created_at"] = filters["created_at"]
 
     sort_field = sort.lstrip("-") if sort else "created_at"
     sort_dir = -1 if sort and sort.startswith("-") else 1
-    
-    pipeline.append({"$sort": {sort_field: sort_dir}})
 
-    users = await User.aggregate_list(
-        pipeline=pipeline,
+    pipeline = [
+        {"$match": match_stage},
+        {"$sort": {sort_field: sort_dir}},
+        {"$project": {"_id": 0, **{field: 1 for _, field in columns}}},
+    ]
+
+    cursor = User.get_pymongo_collection().aggregate(
+        pipeline,
+        allowDiskUse=True,
+        batchSize=batch_size,
     )
 
-    return [
-            User.model_validate(user).model_dump(by_alias=True, mode="json")
-            for user in users
-        ]
+    rows: List[List[Any]] = []
+    async for doc in cursor:
+        rows.append([format_export_value(get_field_value(doc, field)) for _, field in columns])
+        if len(rows) >= batch_size:
+            yield rows
+            rows = []
+
+    if rows:
+        yield rows
 
 
 def format_date(value):
@@ -127,108 +217,6 @@ def format_date(value):
     return ""
 
 
-def autosize(ws):
-    for col in ws.columns:
-        ws.column_dimensions[get_column_letter(col[0].column)].width = 22
-
-
-def style_header(ws):
-    header_font = Font(bold=True)
-    header_fill = PatternFill(start_color="E5E7EB", end_color="E5E7EB", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center")
-
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
-    )
-
-    for col in range(1, ws.max_column + 1):
-        cell = ws.cell(row=1, column=col)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-        cell.border = thin_border
-
-    ws.row_dimensions[1].height = 26
-
-
-
-def generate_users_excel(users: list, role: UserRole | None = None) -> BytesIO:
-    wb = Workbook()
-    if wb.active is not None:
-        wb.remove(wb.active)
-
-    # ---------------- sub-constructor/end_users ----------------
-    if role in (None, UserRole.END_USER):
-        ws_user = wb.create_sheet("Sub Constructors")
-        ws_user.append([
-            "Full Name",
-            "Email",
-            "Phone Number",
-            "City",
-            "State",
-            "Status",
-            "Registered At",
-        ])
-
-        style_header(ws_user)
-
-        for u in users:
-            if u.get("role") == UserRole.END_USER:
-                geo = u.get("geo_location") or {}
-                ws_user.append([
-                    u.get("full_name", ""),
-                    u.get("email", ""),
-                    u.get("phone_number") or "",
-                    geo.get("city", ""),
-                    geo.get("state", ""),
-                    u.get("status", ""),
-                    format_date(u.get("created_at")),
-                ])
-
-        autosize(ws_user)
-
-    # ---------------- store-owner/vendor ----------------
-    elif role in (UserRole.VENDOR):
-        ws_vendor = wb.create_sheet("Store Owners")
-        ws_vendor.append([
-            "Full Name",
-            "Business Name",
-            "Business Email",
-            "Email",
-            "Phone Number",
-            "GST Number",
-            "License Number",
-            "Status",
-            "Registered At",
-        ])
-
-        style_header(ws_vendor)
-
-        for u in users:
-            if u.get("role") == UserRole.VENDOR:
-                ws_vendor.append([
-                    u.get("full_name", ""),
-                    u.get("business_name", ""),
-                    u.get("business_email", ""),
-                    u.get("email", ""),
-                    u.get("phone_number") or "",
-                    u.get("gst_number", ""),
-                    u.get("lisence_number", ""),
-                    u.get("status", ""),
-                    format_date(u.get("created_at")),
-                ])
-
-        autosize(ws_vendor)
-
-    stream = BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-    return stream
-
-
 # -----------------------------------------------------
 # GET USER
 # -----------------------------------------------------
@@ -373,61 +361,74 @@ def get_status_room_by_user_id(user_id: str) -> str:
     return f"user_status_room_{user_id}"
 
 
-async def update_user_activity_status(access_token: str, status: UserActivityStatusEnum):
-    try:
-        user_device=await UserDevice.find_one(UserDevice.access_token==access_token)
-        if user_device is not None:
-            await user_device.set({
-                "current_status":status,
-                "last_active":datetime.now() if status==UserActivityStatusEnum.OFFLINE else None
-            })
-            logger.info("User status update successfully")
-            return True
-        logger.warning("User not found with the given token, status update failed")
-        return False
-    except Exception as e:
-        logger.error(e)
-        return False
+async def update_user_activity_status(
+    access_token: str,
+    status: UserActivityStatusEnum,
+    user_id: Optional[str] = None,
+):
+    # buffered in memory, written to the device by the periodic presence flush
+    presence_registry.mark(access_token, status, user_id)
+    return True
 
 
 async def get_status_by_user_ids(id_list: List[str]) -> Dict[str, dict]:
-    user_ids = [PydanticObjectId(uid) for uid in id_list]
+    # users connected to (or just left) this worker are answered from memory
+    known = presence_registry.get_statuses(id_list)
 
-    devices = await UserDevice.find(
-        In(UserDevice.user_id, user_ids),
-        UserDevice.is_deleted == False,
-        UserDevice.expired == False,
-    ).to_list()
+    user_ids = [
+        PydanticObjectId(uid)
+        for uid in id_list
+        if uid not in known and PydanticObjectId.is_valid(uid)
+    ]
 
-    devices_by_user = defaultdict(list)
-    for device in devices:
-        devices_by_user[str(device.user_id)].append(device)
+    # one row per user instead of every device document
+    pipeline: List[Dict[str, Any]] = [
+        {
+            "$match": {
+                "user_id": {"$in": user_ids},
+                "is_deleted": False,
+                "expired": False,
+            }
+        },
+        {
+            "$group": {
+                "_id": "$user_id",
+                "is_online": {
+                    "$max": {
+                        "$and": [
+                            {"$eq": ["$current_status", UserActivityStatusEnum.ONLINE.value]},
+                            {"$gt": ["$device_token", ""]},
+                        ]
+                    }
+                },
+                "last_active": {"$max": "$last_active"},
+            }
+        },
+    ]
+
+    rows = await UserDevice.aggregate_list(pipeline) if user_ids else []
+    status_by_user = {str(row["_id"]): row for row in rows}
 
     result: Dict[str, dict] = {}
 
     for uid in id_list:
-        user_devices = devices_by_user.get(uid, [])
+        if uid in known:
+            result[uid] = known[uid]
+            continue
 
-        is_online = any(
-            d.device_token
-            and d.current_status == UserActivityStatusEnum.ONLINE
-            for d in user_devices
-        )
+        row = status_by_user.get(uid) or {}
 
-        if is_online:
+        if row.get("is_online"):
             result[uid] = {
                 "activity_status": UserActivityStatusEnum.ONLINE,
                 "last_seen": None,
             }
         else:
-            last_seen = max(
-                (d.last_active for d in user_devices if d.last_active),
-                default=None,
-            )
+            last_seen = row.get("last_active")
 
             result[uid] = {
                 "activity_status": UserActivityStatusEnum.OFFLINE,
                 "last_seen": last_seen.isoformat() if last_seen else None,
             }
 
-    return result
\ No newline at end of file
+    return result
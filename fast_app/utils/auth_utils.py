@@ -1,18 +1,64 @@
+import time
+from typing import Any, Dict, Optional
+
 from fastapi import HTTPException, status
+from fast_app.core.auth_cache import (
+    cache_token_payload,
+    cache_user,
+    get_cached_token_payload,
+    get_cached_user,
+)
 from fast_app.defaults.common_enums import UserRole
 from fast_app.defaults.permission_enums import Action, Resource
 from fast_app.modules.user.models.user_model import User
 from fast_app.utils.jwt_utils import verify_access_token
 from fast_app.utils.logger import logger
 
+# secrets never leave the database through the (swappable, possibly shared)
+# auth cache; authorization only needs identity, role, status, permissions
+AUTH_CACHE_EXCLUDE = {
+    "password",
+    "password_history",
+    "reset_password_token",
+    "reset_password_expires",
+}
+
+
+async def get_token_payload(token: str) -> Dict[str, Any]:
+    """Verified access token payload, cached until the token expires"""
+    cached: Optional[Dict[str, Any]] = await get_cached_token_payload(token)
+    if cached is not None:
+        return cached
+
+    payload: Dict[str, Any] = verify_access_token(token)
+    await cache_token_payload(token, payload, expires_in=payload.get("exp", 0) - time.time())
+    return payload
+
+
+async def get_user_for_auth(user_id: Any) -> Optional[User]:
+    """
+    User lookup for authentication, served from the auth cache when
+    possible. A cached user carries no password / reset token fields,
+    code needing them reloads the user from the database.
+    """
+    cached = await get_cached_user(user_id)
+    if cached is not None:
+        return User.model_validate(cached)
+
+    user = await User.get(user_id)
+    if user:
+        await cache_user(user_id, user.model_dump(by_alias=True, mode="json", exclude=AUTH_CACHE_EXCLUDE))
+    return user
+
+
 async def check_access(token: str, roles: tuple[UserRole, ...], resource: Resource | None = None, action: Action | None = None) -> User:
     try:
         # get payload from token
-        payload = verify_access_token(token)
+        payload = await get_token_payload(token)
         user_id = payload.get('sub')
         
         # get user details by id
-        user = await User.get(user_id)
+        user = await get_user_for_auth(user_id)
         
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid token or user")
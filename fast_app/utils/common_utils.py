@@ -69,6 +69,16 @@ def normalize_utc(
     return dt
 
 
+def naive_utc(dt: datetime) -> datetime:
+    """
+    Convert an aware datetime to the naive UTC the app stores and compares
+    against datetime.utcnow(); naive ones are assumed UTC already
+    """
+    if dt.tzinfo is not None:
+        return dt.astimezone(UTC).replace(tzinfo=None)
+    return dt
+
+
 def stringify_object_ids(data: Any) -> Any:
     """
     Recursively convert ObjectId / PydanticObjectId to str
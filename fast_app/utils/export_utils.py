@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+import tempfile
+from typing import Any, AsyncIterator, List
+
+from fastapi.concurrency import run_in_threadpool
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from fast_app.defaults.common_enums import ExportFormat
+
+# rows fetched from the db / written per step
+EXPORT_BATCH_SIZE = 1000
+
+# size of the chunks sent to the client
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+RowBatches = AsyncIterator[List[List[Any]]]
+
+
+def stream_export(
+    export_format: ExportFormat,
+    sheet_title: str,
+    header: List[str],
+    batches: RowBatches,
+) -> AsyncIterator[bytes]:
+    """
+    Encode batches of rows into the given format, chunk by chunk, so an
+    export never holds more than one batch of rows in memory.
+    """
+    if export_format == ExportFormat.CSV:
+        return _stream_csv(header, batches)
+    if export_format == ExportFormat.NDJSON:
+        return _stream_ndjson(header, batches)
+    return _stream_xlsx(sheet_title, header, batches)
+
+
+# ----------------------------------
+# CSV / NDJSON
+# ----------------------------------
+
+async def _stream_csv(header: List[str], batches: RowBatches) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # BOM so spreadsheet apps pick utf-8
+    writer.writerow(header)
+    yield ("\ufeff" + buffer.getvalue()).encode()
+
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+
+
+async def _stream_ndjson(header: List[str], batches: RowBatches) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(header, row)), default=str) + "\n"
+            for row in rows
+        ).encode()
+
+
+# ----------------------------------
+# XLSX
+# ----------------------------------
+
+def _header_cells(ws, header: List[str]) -> List[WriteOnlyCell]:
+    font = Font(bold=True)
+    fill = PatternFill(start_color="E5E7EB", end_color="E5E7EB", fill_type="solid")
+    alignment = Alignment(horizontal="center", vertical="center")
+    side = Side(style="thin")
+    border = Border(left=side, right=side, top=side, bottom=side)
+
+    cells = []
+    for title in header:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = font
+        cell.fill = fill
+        cell.alignment = alignment
+        cell.border = border
+        cells.append(cell)
+    return cells
+
+
+def _append_rows(ws, rows: List[List[Any]]):
+    for row in rows:
+        ws.append(row)
+
+
+async def _stream_xlsx(sheet_title: str, header: List[str], batches: RowBatches) -> AsyncIterator[bytes]:
+    # write-only mode spools rows to disk instead of keeping a cell tree
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+
+    for index in range(1, len(header) + 1):
+        ws.column_dimensions[get_column_letter(index)].width = 22
+
+    ws.append(_header_cells(ws, header))
+
+    async for rows in batches:
+        await run_in_threadpool(_append_rows, ws, rows)
+
+    # the zip container can only be written once all rows are known
+    with tempfile.TemporaryFile() as tmp:
+        await run_in_threadpool(wb.save, tmp)
+        tmp.seek(0)
+
+        while True:
+            chunk = await run_in_threadpool(tmp.read, EXPORT_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
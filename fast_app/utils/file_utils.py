@@ -1,20 +1,29 @@
 import os
 import uuid
 import asyncio
-from datetime import datetime
-from typing import Any, List, Dict
-import aiobotocore.session
+import hashlib
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
 from fastapi import HTTPException, UploadFile, status
 from fast_app.utils.logger import logger
 
+from pymongo import ReturnDocument
+
 from config import (
-    AWS_S3_BUCKET_ACCESS_KEY,
     AWS_S3_BUCKET_HOST,
     AWS_S3_BUCKET_NAME,
-    AWS_S3_BUCKET_REGION,
-    AWS_S3_BUCKET_SECRET_KEY,
     BUCKET,
+    IMAGE_VARIANTS_ENABLED,
+    S3_MULTIPART_PART_SIZE,
+    UPLOAD_DEDUP,
+    UPLOAD_DEDUP_PURGE_GRACE_SECONDS,
+    UPLOAD_DEDUP_PURGE_INTERVAL_SECONDS,
 )
+from fast_app.core.local_storage import LocalStorage
+from fast_app.core.s3 import S3
+from fast_app.defaults.common_enums import ImageSize
+from fast_app.utils.image_utils import IMAGE_VARIANT_CONTENT_TYPE, IMAGE_VARIANT_EXT, generate_variants
 
 
 ALLOWED_TYPES = {
@@ -25,6 +34,29 @@ ALLOWED_TYPES = {
 
 MAX_SIZE = 5 * 1024 * 1024  # 5 MB
 
+# bytes read to sniff the magic number, enough for every ALLOWED_TYPES entry
+MAGIC_SNIFF_SIZE = 16
+
+# chunk size when streaming uploads to storage
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+STATIC_DIR = os.path.join("fast_app", "static", "uploads")
+
+# server generated files (exports, ...) that must not be publicly served
+PRIVATE_DIR = os.path.join("fast_app", "storage")
+
+# chunk size when reading stored files back
+READ_CHUNK_SIZE = 64 * 1024
+
+# key prefix of content addressed uploads
+DEDUP_DIR = "cas"
+
+# uploads being hashed, kept out of the publicly served tree
+SPOOL_DIR = os.path.join(PRIVATE_DIR, ".spool")
+
+# how long an upload waits for a purge of the same content to finish
+PURGE_WAIT_SECONDS = 10
+
 
 # -----------------------------------------------------
 # MAIN UPLOAD HANDLER
@@ -32,18 +64,48 @@ MAX_SIZE = 5 * 1024 * 1024  # 5 MB
 async def upload_files(
     files: List[UploadFile],
     dir: str = "default",
+    validate: bool = True,
+    private: bool = False,
+    variants: bool = False,
 ) -> List[Dict[str, Any]]:
+    """
+    Store files on the configured bucket.
+
+    `validate` applies the image checks meant for user uploads; server
+    generated files skip them. `private` files are kept out of the public
+    static dir / ACL and are only readable through `read_stored_file`.
+    `variants` also stores resized webp renditions of images, returned as
+    `variants: {size: path}`.
+
+    With UPLOAD_DEDUP, public files are stored by content hash instead of
+    under `dir`, see `dedup_upload`.
+    """
     try:
-        if BUCKET == "local":
-            return await local_upload(files, dir)
-        elif BUCKET == "s3":
-            return await s3_upload(files, dir)
-        else:
+        if BUCKET not in ("local", "s3"):
             logger.warning("Invalid bucket selected")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid bucket selected",
             )
+
+        if UPLOAD_DEDUP and not private:
+            uploaded = await dedup_upload(files, validate)
+        elif BUCKET == "local":
+            uploaded = await local_upload(files, dir, validate, private)
+        else:
+            uploaded = await s3_upload(files, dir, validate, private)
+
+        if variants and IMAGE_VARIANTS_ENABLED:
+            # deduplicated uploads reuse the variants stored with the object
+            await asyncio.gather(*[
+                upload_variants(file, result, private)
+                for file, result in zip(files, uploaded)
+                if result and not (result.get("deduplicated") and result.get("variants"))
+            ])
+        return uploaded
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"File upload failed: {e}")
         raise HTTPException(
@@ -58,8 +120,10 @@ async def upload_files(
 async def local_upload(
     files: List[UploadFile],
     dir: str = "default",
+    validate: bool = True,
+    private: bool = False,
 ) -> List[Dict[str, Any]]:
-    STATIC_DIR = os.path.join("fast_app", "static", "uploads")
+    root_dir = PRIVATE_DIR if private else STATIC_DIR
 
     # Generate file keys
     file_keys = [
@@ -68,20 +132,25 @@ async def local_upload(
     ]
 
     async def upload_file(file: UploadFile, file_key: str) -> Dict[str, Any]:
-        if not await validate_file(file):
+        if validate and not await validate_file(file):
             return {}
-        file_path = os.path.join(STATIC_DIR, file_key)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        file_path = os.path.join(root_dir, file_key)
+        size = await LocalStorage.write(file_path, read_upload_chunks(file, validate))
 
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        if private:
+            return {
+                "original_name": file.filename,
+                "file_key": file_key,
+                "url": None,
+                "size": size,
+                "path": file_key,
+            }
 
         return {
             "original_name": file.filename,
             "file_key": file_key,
             "url": f"/static/uploads/{file_key}",
-            "size": len(contents),
+            "size": size,
             "path": f"/static/uploads/{file_key}",
         }
 
@@ -99,11 +168,10 @@ async def local_upload(
 async def s3_upload(
     files: List[UploadFile],
     dir: str = "uploads",
+    validate: bool = True,
+    private: bool = False,
 ) -> List[Dict[str, Any]]:
     BUCKET_NAME = AWS_S3_BUCKET_NAME
-    REGION = AWS_S3_BUCKET_REGION
-    ACCESS_KEY = AWS_S3_BUCKET_ACCESS_KEY
-    SECRET_KEY = AWS_S3_BUCKET_SECRET_KEY
     BUCKET_HOST = AWS_S3_BUCKET_HOST
 
     file_keys = [
@@ -111,35 +179,28 @@ async def s3_upload(
         for f in files
     ]
 
-    session = aiobotocore.session.get_session()
+    # shared client, connections are reused across files and requests
+    client = await S3.get_client()
 
     async def upload_file(file: UploadFile, file_key: str) -> Dict[str, Any]:
-        if not await validate_file(file):
+        if validate and not await validate_file(file):
             return {}
-        async with session.create_client(
-            "s3",
-            region_name=REGION,
-            aws_access_key_id=ACCESS_KEY,
-            aws_secret_access_key=SECRET_KEY,
-            endpoint_url=f"https://{BUCKET_HOST}",
-        ) as client:
-
-            contents = await file.read()
-            await client.put_object(
-                Bucket=BUCKET_NAME,
-                Key=file_key,
-                Body=contents,
-                ContentType=file.content_type or "application/octet-stream",
-                ACL="public-read",
-            )
 
-            return {
-                "original_name": file.filename,
-                "s3_key": file_key,
-                "url": f"https://{BUCKET_HOST}/{BUCKET_NAME}/{file_key}",
-                "size": len(contents),
-                "path": f"/{BUCKET_NAME}/{file_key}",
-            }
+        size = await _put_s3(
+            client,
+            file_key,
+            read_upload_chunks(file, validate),
+            ContentType=file.content_type or "application/octet-stream",
+            ACL="private" if private else "public-read",
+        )
+
+        return {
+            "original_name": file.filename,
+            "s3_key": file_key,
+            "url": f"https://{BUCKET_HOST}/{BUCKET_NAME}/{file_key}",
+            "size": size,
+            "path": f"/{BUCKET_NAME}/{file_key}",
+        }
 
     tasks = [
         upload_file(file, key)
@@ -149,6 +210,461 @@ async def s3_upload(
     return await asyncio.gather(*tasks)
 
 
+async def _put_s3(client: Any, file_key: str, chunks: AsyncIterator[bytes], **object_args: Any) -> int:
+    """
+    Stream chunks to S3, return the size.
+
+    Files smaller than one part go out as a single put_object; larger ones
+    use a multipart upload, so at most one part is held in memory.
+    """
+    part = bytearray()
+    size = 0
+    upload_id = None
+    parts: List[Dict[str, Any]] = []
+
+    async def flush_part():
+        nonlocal upload_id
+        if upload_id is None:
+            created = await client.create_multipart_upload(
+                Bucket=AWS_S3_BUCKET_NAME, Key=file_key, **object_args
+            )
+            upload_id = created["UploadId"]
+
+        number = len(parts) + 1
+        uploaded = await client.upload_part(
+            Bucket=AWS_S3_BUCKET_NAME,
+            Key=file_key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=bytes(part),
+        )
+        parts.append({"ETag": uploaded["ETag"], "PartNumber": number})
+        part.clear()
+
+    try:
+        async for chunk in chunks:
+            part.extend(chunk)
+            size += len(chunk)
+            if len(part) >= S3_MULTIPART_PART_SIZE:
+                await flush_part()
+
+        if upload_id is None:
+            await client.put_object(
+                Bucket=AWS_S3_BUCKET_NAME, Key=file_key, Body=bytes(part), **object_args
+            )
+            return size
+
+        if part:
+            await flush_part()
+        await client.complete_multipart_upload(
+            Bucket=AWS_S3_BUCKET_NAME,
+            Key=file_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+        return size
+
+    except BaseException:
+        if upload_id is not None:
+            await client.abort_multipart_upload(
+                Bucket=AWS_S3_BUCKET_NAME, Key=file_key, UploadId=upload_id
+            )
+        raise
+
+
+# -----------------------------------------------------
+# CONTENT ADDRESSED (DEDUP) UPLOAD
+# -----------------------------------------------------
+async def dedup_upload(files: List[UploadFile], validate: bool = True) -> List[Dict[str, Any]]:
+    """
+    Store public files under `cas/<sha256>` so identical uploads share one
+    object.
+
+    The upload is spooled to disk while hashing. The StoredFile reference
+    is taken first (`$inc` upsert); the spooled copy is only written out
+    when no committed object existed before it, so a known hash costs no
+    second write or S3 PUT. A purge running concurrently either sees the
+    new reference and keeps the record, or finished deleting before the
+    object is written again.
+    """
+    # lazy: the file module imports this one
+    from fast_app.modules.file.models.stored_file_model import StoredFile
+
+
+    async def upload_file(file: UploadFile) -> Dict[str, Any]:
+        if validate and not await validate_file(file):
+            return {}
+
+        # local spool on the same disk as the uploads, the commit is a rename
+        spool_dir = SPOOL_DIR if BUCKET == "local" else tempfile.gettempdir()
+        spool_path = os.path.join(spool_dir, uuid.uuid4().hex)
+        digest = hashlib.sha256()
+        collection = StoredFile.get_pymongo_collection()
+
+        try:
+            size = await LocalStorage.write(spool_path, _hashed(read_upload_chunks(file, validate), digest))
+
+            content_hash = digest.hexdigest()
+            _, ext = os.path.splitext(file.filename or "")
+            file_key = f"{DEDUP_DIR}/{content_hash[:2]}/{content_hash}{ext.lower()}"
+
+            # reference first: a purge never deletes a referenced record
+            now = datetime.utcnow()
+            previous = await collection.find_one_and_update(
+                {"file_key": file_key},
+                {
+                    "$inc": {"ref_count": 1},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {
+                        "content_hash": content_hash,
+                        "content_type": file.content_type,
+                        "size": size,
+                        "storage": BUCKET,
+                        "committed": False,
+                        "purging": False,
+                        "created_at": now,
+                    },
+                },
+                projection={"committed": 1, "purging": 1, "variants": 1},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,
+            )
+
+            deduplicated = bool(previous) and previous.get("committed", True) and not previous.get("purging")
+            if not deduplicated:
+                if previous and previous.get("purging"):
+                    await _wait_purged(file_key)
+
+                # also when another upload of the same content is still
+                # committing: rewriting identical bytes is harmless
+                try:
+                    await _commit_spooled(spool_path, file_key, file.content_type)
+                except BaseException:
+                    await release_file_key(file_key)
+                    raise
+                await collection.update_one({"file_key": file_key}, {"$set": {"committed": True}})
+        finally:
+            await LocalStorage.remove(spool_path)
+
+        if BUCKET == "s3":
+            result = {
+                "original_name": file.filename,
+                "s3_key": file_key,
+                "url": f"https://{AWS_S3_BUCKET_HOST}/{AWS_S3_BUCKET_NAME}/{file_key}",
+                "size": size,
+                "path": f"/{AWS_S3_BUCKET_NAME}/{file_key}",
+                "deduplicated": deduplicated,
+            }
+        else:
+            result = {
+                "original_name": file.filename,
+                "file_key": file_key,
+                "url": f"/static/uploads/{file_key}",
+                "size": size,
+                "path": f"/static/uploads/{file_key}",
+                "deduplicated": deduplicated,
+            }
+
+        if deduplicated and previous and previous.get("variants"):
+            result["variants"] = dict(previous["variants"])
+        return result
+
+    return await asyncio.gather(*[upload_file(file) for file in files])
+
+
+async def _hashed(chunks: AsyncIterator[bytes], digest: Any) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+
+async def _commit_spooled(spool_path: str, file_key: str, content_type: Optional[str]):
+    if BUCKET == "s3":
+        await _put_s3(
+            await S3.get_client(),
+            file_key,
+            LocalStorage.read(spool_path, chunk_size=UPLOAD_CHUNK_SIZE),
+            ContentType=content_type or "application/octet-stream",
+            ACL="public-read",
+        )
+        return
+
+    await LocalStorage.move(spool_path, os.path.join(STATIC_DIR, file_key))
+
+
+async def _wait_purged(file_key: str):
+    from fast_app.modules.file.models.stored_file_model import StoredFile
+
+    collection = StoredFile.get_pymongo_collection()
+    for _ in range(PURGE_WAIT_SECONDS * 10):
+        if await collection.find_one({"file_key": file_key, "purging": True}, {"_id": 1}) is None:
+            return
+        await asyncio.sleep(0.1)
+
+
+def file_key_from_path(path: Optional[str]) -> Optional[str]:
+    """Storage key of a public `path` as returned by `upload_files`"""
+    for prefix in ("/static/uploads/", f"/{AWS_S3_BUCKET_NAME}/"):
+        if path and path.startswith(prefix):
+            return path[len(prefix):]
+    return None
+
+
+async def release_file(path: Optional[str]):
+    """
+    Drop one reference to a content addressed upload, e.g. when a product
+    image is replaced. No-op for files that were not deduplicated.
+    """
+    file_key = file_key_from_path(path)
+    if not file_key or not file_key.startswith(f"{DEDUP_DIR}/"):
+        return
+
+    await release_file_key(file_key)
+
+
+async def release_file_key(file_key: str):
+    from fast_app.modules.file.models.stored_file_model import StoredFile
+
+    await StoredFile.get_pymongo_collection().update_one(
+        {"file_key": file_key, "ref_count": {"$gt": 0}},
+        {"$inc": {"ref_count": -1}, "$set": {"updated_at": datetime.utcnow()}},
+    )
+
+
+async def purge_unreferenced_files(grace_seconds: int = UPLOAD_DEDUP_PURGE_GRACE_SECONDS) -> int:
+    """
+    Delete content addressed objects (and their image variants) nobody has
+    referenced for `grace_seconds`. Returns the number of purged files.
+    """
+    from fast_app.modules.file.models.stored_file_model import StoredFile
+
+    collection = StoredFile.get_pymongo_collection()
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    purged = 0
+
+    cursor = collection.find(
+        {"ref_count": {"$lte": 0}, "updated_at": {"$lt": cutoff}},
+        {"file_key": 1, "storage": 1, "updated_at": 1},
+    )
+    async for doc in cursor:
+        # claimed (re-checked: an upload may have referenced it meanwhile);
+        # uploads seeing `purging` wait for the objects to be gone
+        claimed = await collection.update_one(
+            {
+                "_id": doc["_id"],
+                "ref_count": {"$lte": 0},
+                "updated_at": doc["updated_at"],
+                "purging": {"$ne": True},
+            },
+            {"$set": {"purging": True}},
+        )
+        if not claimed.modified_count:
+            continue
+
+        stem, _ = os.path.splitext(doc["file_key"])
+        keys = [doc["file_key"]] + [
+            f"{stem}_{size.value}{IMAGE_VARIANT_EXT}"
+            for size in ImageSize
+            if size != ImageSize.ORIGINAL
+        ]
+        try:
+            await _delete_objects(keys, doc.get("storage") or BUCKET)
+        except Exception:
+            # possibly half deleted: the next upload of it writes it again
+            await collection.update_one(
+                {"_id": doc["_id"]},
+                {"$set": {"purging": False, "committed": False, "variants": {}}},
+            )
+            raise
+
+        result = await collection.delete_one({"_id": doc["_id"], "ref_count": {"$lte": 0}})
+        if not result.deleted_count:
+            # referenced again while deleting, that upload rewrites the object
+            await collection.update_one(
+                {"_id": doc["_id"]},
+                {"$set": {"purging": False, "committed": False, "variants": {}}},
+            )
+            continue
+
+        purged += 1
+
+    return purged
+
+
+# keeps the periodic purge referenced while it runs
+_purge_task: Optional[asyncio.Task] = None
+
+
+async def _purge_loop():
+    while True:
+        try:
+            purged = await purge_unreferenced_files()
+            if purged:
+                logger.info(f"Purged {purged} unreferenced uploads")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Upload purge failed: {e}")
+
+        await asyncio.sleep(UPLOAD_DEDUP_PURGE_INTERVAL_SECONDS)
+
+
+def start_upload_purge():
+    """Reclaim unreferenced content addressed uploads periodically (UPLOAD_DEDUP only)"""
+    global _purge_task
+    if UPLOAD_DEDUP and UPLOAD_DEDUP_PURGE_INTERVAL_SECONDS > 0:
+        _purge_task = asyncio.create_task(_purge_loop())
+
+
+async def stop_upload_purge():
+    global _purge_task
+    if _purge_task is not None:
+        _purge_task.cancel()
+        try:
+            await _purge_task
+        except asyncio.CancelledError:
+            pass
+        _purge_task = None
+
+
+async def _delete_objects(file_keys: List[str], storage: str):
+    if storage == "s3":
+        client = await S3.get_client()
+        await client.delete_objects(
+            Bucket=AWS_S3_BUCKET_NAME,
+            Delete={"Objects": [{"Key": key} for key in file_keys], "Quiet": True},
+        )
+        return
+
+    for key in file_keys:
+        await LocalStorage.remove(os.path.join(STATIC_DIR, key))
+
+
+# -----------------------------------------------------
+# IMAGE VARIANTS
+# -----------------------------------------------------
+async def upload_variants(file: UploadFile, uploaded: Dict[str, Any], private: bool = False):
+    """
+    Resize an uploaded image in the image pool and store its variants next
+    to the original as `<key>_<size>.webp`.
+
+    The original is already stored, so a failure here only leaves the
+    upload without variants and serializers fall back to the original.
+    """
+    file_key: Optional[str] = uploaded.get("file_key") or uploaded.get("s3_key")
+    if not file_key:
+        return
+
+    stem, _ = os.path.splitext(file_key)
+
+    try:
+        await file.seek(0)
+        rendered = await generate_variants(await file.read())
+
+        paths = await asyncio.gather(*[
+            _store_bytes(f"{stem}_{size}{IMAGE_VARIANT_EXT}", data, IMAGE_VARIANT_CONTENT_TYPE, private)
+            for size, data in rendered.items()
+        ])
+    except Exception as e:
+        logger.warning(f"Image variants skipped for {file_key}: {e}")
+        return
+
+    uploaded["variants"] = dict(zip(rendered.keys(), paths))
+
+    if file_key.startswith(f"{DEDUP_DIR}/"):
+        # content addressed: later uploads of the same content reuse them
+        from fast_app.modules.file.models.stored_file_model import StoredFile
+
+        try:
+            await StoredFile.get_pymongo_collection().update_one(
+                {"file_key": file_key},
+                {"$set": {"variants": uploaded["variants"]}},
+            )
+        except Exception as e:
+            logger.warning(f"Image variants of {file_key} not recorded: {e}")
+
+
+async def _store_bytes(file_key: str, data: bytes, content_type: str, private: bool = False) -> str:
+    async def chunks() -> AsyncIterator[bytes]:
+        yield data
+
+    if BUCKET == "s3":
+        await _put_s3(
+            await S3.get_client(),
+            file_key,
+            chunks(),
+            ContentType=content_type,
+            ACL="private" if private else "public-read",
+        )
+        return f"/{AWS_S3_BUCKET_NAME}/{file_key}"
+
+    await LocalStorage.write(os.path.join(PRIVATE_DIR if private else STATIC_DIR, file_key), chunks())
+    return file_key if private else f"/static/uploads/{file_key}"
+
+
+# -----------------------------------------------------
+# READ BACK (PRIVATE FILES)
+# -----------------------------------------------------
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into an inclusive (start, end) tuple.
+
+    Returns None when the whole file should be sent (no / unsupported
+    header), raises 416 when the range can't be satisfied.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+
+    start_str, _, end_str = range_header[len("bytes="):].strip().partition("-")
+
+    try:
+        if start_str:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+        else:
+            # suffix range: the last N bytes
+            start = max(size - int(end_str), 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    return start, end
+
+
+async def read_stored_file(
+    file_key: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    storage: str = BUCKET,
+) -> AsyncIterator[bytes]:
+    """Stream bytes start..end (inclusive) of a privately stored file"""
+    if storage == "s3":
+        client = await S3.get_client()
+        response = await client.get_object(
+            Bucket=AWS_S3_BUCKET_NAME,
+            Key=file_key,
+            Range=f"bytes={start}-{'' if end is None else end}",
+        )
+        async with response["Body"] as body:
+            while True:
+                chunk = await body.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        return
+
+    async for chunk in LocalStorage.read(os.path.join(PRIVATE_DIR, file_key), start, end, READ_CHUNK_SIZE):
+        yield chunk
+
+
 # -----------------------------------------------------
 # FILE KEY GENERATOR
 # -----------------------------------------------------
@@ -163,40 +679,60 @@ def _generate_file_key(filename: str, dir: str) -> str:
     return f"{dir}/{timestamp}_{unique_id}{ext}"
 
 
+async def read_upload_chunks(file: UploadFile, validate: bool = True) -> AsyncIterator[bytes]:
+    """
+    Yield an upload chunk by chunk from the start.
+
+    With `validate`, MAX_SIZE is enforced as bytes arrive, so an oversized
+    upload is rejected without ever being held in memory.
+    """
+    await file.seek(0)
+    size = 0
+
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        size += len(chunk)
+        if validate and size > MAX_SIZE:
+            raise HTTPException(status_code=400, detail="Image too large")
+
+        yield chunk
+
+
 async def validate_file(file: UploadFile | None) -> UploadFile | None:
     """
-    Validates an uploaded image file.
+    Validates an uploaded image file from its first bytes.
 
     - Returns None if file is None or size is 0
-    - Validates max size
+    - Validates max size when the size is already known
     - Validates content type
     - Validates magic bytes
+
+    The full size is enforced while streaming, see `read_upload_chunks`.
     """
 
     if not file:
         return None
 
-    contents = await file.read()
-    size = len(contents)
+    header = await file.read(MAGIC_SNIFF_SIZE)
+
+    # IMPORTANT: reset pointer for further use
+    await file.seek(0)
 
     # Treat empty file as no file
-    if size == 0:
-        await file.seek(0)
+    if not header:
         return None
 
-    print(f"Image size: {size} bytes")
-
-    if size > MAX_SIZE:
+    if file.size is not None and file.size > MAX_SIZE:
         raise HTTPException(status_code=400, detail="Image too large")
 
     if file.content_type not in ALLOWED_TYPES:
         raise HTTPException(status_code=400, detail="Invalid image type")
 
     magic = ALLOWED_TYPES[file.content_type]
-    if not contents.startswith(magic):
+    if not header.startswith(magic):
         raise HTTPException(status_code=400, detail="Invalid image file")
 
-    # IMPORTANT: reset pointer for further use
-    await file.seek(0)
-
     return file
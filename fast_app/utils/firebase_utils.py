@@ -1,14 +1,34 @@
+import asyncio
 import firebase_admin
+from concurrent.futures import ThreadPoolExecutor
 from firebase_admin import credentials, messaging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, NamedTuple, Optional
 from fast_app.utils.logger import logger
 
 from config import (
+    FCM_SEND_THREADS,
     FIREBASE_CLIENT_EMAIL,
     FIREBASE_PRIVATE_KEY,
     FIREBASE_PROJECT_ID,
 )
 
+# FCM accepts at most 500 messages per send_each call
+FCM_BATCH_SIZE = 500
+
+
+class PushResult(NamedTuple):
+    token: str
+    success: bool
+    message_id: Optional[str] = None
+    # FirebaseError class name, e.g. "UnregisteredError"
+    error: Optional[str] = None
+
+
+class PushBatchResult(NamedTuple):
+    success_count: int
+    failure_count: int
+    results: List[PushResult]
+
 
 # ------------------------------------------------
 # Firebase Initialization (Only Once)
@@ -32,6 +52,101 @@ def initialize_firebase() -> None:
     logger.info("Firebase initialized")
 
 
+# ------------------------------------------------
+# Delivery thread pool
+# ------------------------------------------------
+# the SDK is blocking, sends never run on the event loop
+_executor: Optional[ThreadPoolExecutor] = None
+
+# set by start_push once the SDK app exists
+_initialized = False
+
+
+def get_push_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=FCM_SEND_THREADS, thread_name_prefix="fcm")
+    return _executor
+
+
+async def start_push():
+    """Initialize the SDK once, at startup"""
+    global _initialized
+    if not FIREBASE_PROJECT_ID:
+        logger.warning("Firebase is not configured, push notifications are disabled")
+        return
+
+    try:
+        await asyncio.get_running_loop().run_in_executor(get_push_executor(), initialize_firebase)
+        _initialized = True
+    except Exception:
+        logger.exception("Firebase initialization failed")
+
+
+async def stop_push():
+    global _executor, _initialized
+    _initialized = False
+    if _executor is not None:
+        executor, _executor = _executor, None
+        # waits for in-flight sends off the event loop
+        await asyncio.to_thread(executor.shutdown, True)
+
+
+# ------------------------------------------------
+# Send Push Notifications (batched)
+# ------------------------------------------------
+def _send_batch(message: messaging.MulticastMessage) -> PushBatchResult:
+    response = messaging.send_each_for_multicast(message)
+    results = [
+        PushResult(
+            token=token,
+            success=item.success,
+            message_id=item.message_id,
+            error=type(item.exception).__name__ if item.exception else None,
+        )
+        for token, item in zip(message.tokens, response.responses)
+    ]
+    return PushBatchResult(response.success_count, response.failure_count, results)
+
+
+async def send_push(
+    tokens: List[str],
+    title: str,
+    body: str,
+    data: Optional[Dict[str, Any]] = None,
+) -> List[PushBatchResult]:
+    """
+    Send one notification to many device tokens.
+
+    Tokens go out in multicast batches of FCM_BATCH_SIZE on the delivery
+    pool. A batch failing as a whole (network, auth, ...) is reported as
+    failed for each of its tokens instead of raising. Nothing is sent
+    when the SDK was not initialized by `start_push`.
+    """
+    if not _initialized:
+        logger.warning(f"Firebase is not initialized, dropped a push to {len(tokens)} tokens")
+        return []
+
+    payload = {k: str(v) for k, v in (data or {}).items()}
+    loop = asyncio.get_running_loop()
+
+    async def send(batch: List[str]) -> PushBatchResult:
+        message = messaging.MulticastMessage(
+            tokens=batch,
+            notification=messaging.Notification(title=title, body=body),
+            data=payload,
+        )
+        try:
+            return await loop.run_in_executor(get_push_executor(), _send_batch, message)
+        except Exception as e:
+            logger.exception("Failed to send push notification batch")
+            error = type(e).__name__
+            return PushBatchResult(0, len(batch), [PushResult(token, False, error=error) for token in batch])
+
+    batches = [tokens[i:i + FCM_BATCH_SIZE] for i in range(0, len(tokens), FCM_BATCH_SIZE)]
+    return await asyncio.gather(*[send(batch) for batch in batches])
+
+
 # ------------------------------------------------
 # Send Single Push Notification
 # ------------------------------------------------
@@ -44,30 +159,15 @@ async def send_notification(
 ) -> bool:
     """
     Send a single push notification using Firebase FCM.
-    """
-
-    try:
-        initialize_firebase()
 
-        message = messaging.Message(
-            token=token,
-            notification=messaging.Notification(
-                title=title,
-                body=body,
-            ),
-            data={k: str(v) for k, v in (data or {}).items()},
-        )
-
-        messaging.send(message)
-        return True
-
-    except messaging.UnregisteredError:
-        logger.warning(f"Invalid FCM token: {token}")
-        return False
+    Goes through notification push_service, so a dead token is pruned
+    from the stored devices like on every other send.
+    """
+    # push_service imports this module
+    from fast_app.modules.notification.services.push_service import deliver_push
 
-    except Exception as e:
-        logger.exception("Failed to send push notification")
-        return False
+    report: Dict[str, int] = await deliver_push([token], title, body, data)
+    return report["sent"] > 0
 
 
 # ---------------------------------------------
@@ -80,4 +180,7 @@ await send_notification(
     body="This is a test notification",
     data={"type": "TEST"},
 )
-'''
\ No newline at end of file
+
+results = await send_push(tokens, title="Sale", body="50% off today")
+sent = sum(batch.success_count for batch in results)
+'''
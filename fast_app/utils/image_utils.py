@@ -0,0 +1,90 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from config import IMAGE_PROCESS_WORKERS, IMAGE_WEBP_QUALITY
+from fast_app.defaults.common_enums import ImageSize
+
+# longest edge (px) of each generated variant
+IMAGE_VARIANT_SIZES = {
+    ImageSize.THUMB: 200,
+    ImageSize.MEDIUM: 800,
+}
+
+IMAGE_VARIANT_CONTENT_TYPE = "image/webp"
+IMAGE_VARIANT_EXT = ".webp"
+
+
+# ----------------------------------
+# PROCESS POOL
+# ----------------------------------
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=IMAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def close_image_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+# ----------------------------------
+# VARIANTS
+# ----------------------------------
+
+def build_variants(data: bytes) -> Dict[str, bytes]:
+    """Resize + webp encode an image, run inside the image pool"""
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        # phone photos carry their rotation in exif
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    variants = {}
+    for size, edge in IMAGE_VARIANT_SIZES.items():
+        variant = image.copy()
+        # never upscales, keeps the aspect ratio
+        variant.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+
+        out = io.BytesIO()
+        variant.save(out, format="WEBP", quality=IMAGE_WEBP_QUALITY, method=4)
+        variants[size.value] = out.getvalue()
+
+    return variants
+
+
+async def generate_variants(data: bytes) -> Dict[str, bytes]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_image_pool(), build_variants, data)
+
+
+# ----------------------------------
+# SERIALIZATION
+# ----------------------------------
+
+def pick_image(image: Optional[str], variants: Optional[Dict[str, str]], size: ImageSize) -> Optional[str]:
+    """Path of the requested size, the original when it has no such variant"""
+    if size == ImageSize.ORIGINAL or not variants:
+        return image
+    return variants.get(size.value) or image
+
+
+def apply_image_size(doc: Dict[str, Any], size: ImageSize, field: str = "image") -> Dict[str, Any]:
+    """Point `doc[field]` at the requested variant of a serialized document"""
+    if doc and field in doc:
+        doc[field] = pick_image(doc[field], doc.get(f"{field}_variants"), size)
+    return doc
@@ -0,0 +1,42 @@
+import base64
+from typing import Any, Dict, Tuple
+
+from bson import ObjectId, json_util
+from fastapi import HTTPException, status
+
+
+def get_field_value(doc: Dict[str, Any], path: str) -> Any:
+    """Resolve a dotted field path (e.g. "category.name") from a document"""
+    value: Any = doc
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def encode_cursor(value: Any, doc_id: Any) -> str:
+    """
+    Encode the sort key value and _id of a document into an opaque,
+    url-safe cursor token.
+    """
+    raw = json_util.dumps({"v": value, "id": str(doc_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Any, Any]:
+    """
+    Decode a cursor token created by `encode_cursor`.
+
+    Returns a (sort value, _id) tuple. Raises 400 for malformed tokens.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        doc_id = data["id"]
+        return data.get("v"), ObjectId(doc_id) if ObjectId.is_valid(doc_id) else doc_id
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )